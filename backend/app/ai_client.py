@@ -0,0 +1,263 @@
+"""
+AI Client
+Async OpenAI chat client with a shared concurrency limit, timeouts, retries and latency metrics
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+)
+
+from app.metrics import Histogram
+
+# Chat completions take seconds, not milliseconds
+AI_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Upstream statuses worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class AsyncAIClient:
+    """
+    Wrapper around ``AsyncOpenAI`` chat completions.
+
+    - A process-wide semaphore caps concurrent upstream calls at
+      ``max_concurrency``; extra callers wait their turn without blocking
+      the event loop.
+    - Every attempt has a timeout. Timeouts, connection errors, 429 and 5xx
+      responses are retried up to ``max_retries`` times with full-jitter
+      exponential backoff (honouring Retry-After when the API sends one).
+    - Latency of each logical call (including retries) is recorded per
+      method name, along with the time spent waiting for a slot (and time
+      to first token for streamed calls) and the prompt, completion and
+      cached prompt tokens the API reports.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 4,
+        timeout_seconds: float = 60.0,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20.0
+    ):
+        # Retries are handled here so they share the concurrency limit and metrics
+        self.client = AsyncOpenAI(api_key=api_key, timeout=timeout_seconds, max_retries=0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Histogram] = {}
+        self._ttft: Dict[str, Histogram] = {}
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self.queue_wait = Histogram(AI_LATENCY_BUCKETS)
+        self._in_flight = 0
+        self._waiting = 0
+        self._counters = {
+            "calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "streams": 0, "streams_cancelled": 0,
+        }
+
+    @classmethod
+    def from_env(cls, api_key: str) -> "AsyncAIClient":
+        return cls(
+            api_key,
+            max_concurrency=int(os.getenv("AI_MAX_CONCURRENCY", "4")),
+            timeout_seconds=float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", "60")),
+            max_retries=int(os.getenv("AI_MAX_RETRIES", "3")),
+            backoff_base_seconds=float(os.getenv("AI_RETRY_BASE_SECONDS", "0.5")),
+            backoff_max_seconds=float(os.getenv("AI_RETRY_MAX_SECONDS", "20"))
+        )
+
+    # ==================== Calls ====================
+
+    async def chat(self, method: str, **kwargs: Any):
+        """
+        Create a chat completion
+
+        Args:
+            method: Name the latency is recorded under (e.g. "parse_resume")
+            **kwargs: Arguments for ``chat.completions.create``
+
+        Returns:
+            The completion response
+        """
+        started = time.perf_counter()
+        self._count("calls")
+        try:
+            semaphore = self._loop_semaphore()
+            with self._track("_waiting"):
+                await semaphore.acquire()
+            self.queue_wait.observe(time.perf_counter() - started)
+            try:
+                with self._track("_in_flight"):
+                    response = await self._with_retries(kwargs)
+                self._record_usage(method, getattr(response, "usage", None))
+                return response
+            finally:
+                semaphore.release()
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            self._histogram(method).observe(time.perf_counter() - started)
+
+    async def stream_chat(self, method: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive
+
+        The concurrency slot is held until the stream ends. Retries only
+        happen before the response starts (nothing has been yielded yet).
+        Closing the generator (e.g. the HTTP client disconnected) closes the
+        upstream response, which stops generation. Time to first token is
+        recorded per method.
+        """
+        started = time.perf_counter()
+        self._count("calls")
+        self._count("streams")
+        first_token = False
+        try:
+            semaphore = self._loop_semaphore()
+            with self._track("_waiting"):
+                await semaphore.acquire()
+            self.queue_wait.observe(time.perf_counter() - started)
+            try:
+                with self._track("_in_flight"):
+                    # include_usage: the final chunk carries token usage (and no choices)
+                    stream = await self._with_retries({
+                        "stream_options": {"include_usage": True}, **kwargs, "stream": True
+                    })
+                    async with stream:
+                        async for chunk in stream:
+                            self._record_usage(method, getattr(chunk, "usage", None))
+                            delta = chunk.choices[0].delta.content if chunk.choices else None
+                            if not delta:
+                                continue
+                            if not first_token:
+                                first_token = True
+                                self._histogram(method, self._ttft).observe(time.perf_counter() - started)
+                            yield delta
+            finally:
+                semaphore.release()
+        except (asyncio.CancelledError, GeneratorExit):
+            self._count("streams_cancelled")
+            raise
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            self._histogram(method).observe(time.perf_counter() - started)
+
+    def _loop_semaphore(self) -> asyncio.Semaphore:
+        """The concurrency semaphore for the running event loop (asyncio primitives are loop-bound)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _with_retries(self, kwargs: Dict[str, Any]):
+        attempt = 0
+        while True:
+            try:
+                return await self.client.chat.completions.create(**kwargs)
+            except (APITimeoutError, APIConnectionError, APIStatusError) as e:
+                if isinstance(e, APITimeoutError):
+                    self._count("timeouts")
+                if not self._retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                self._count("retries")
+                print(f"[AI_CLIENT] {type(e).__name__}; retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUSES
+        return True  # Timeouts and connection errors
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After if it asks for longer"""
+        delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt)))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max_seconds))
+            except ValueError:
+                pass
+        return delay
+
+    # ==================== Metrics ====================
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _histogram(self, method: str, histograms: Optional[Dict[str, Histogram]] = None) -> Histogram:
+        histograms = self._latency if histograms is None else histograms
+        with self._lock:
+            histogram = histograms.get(method)
+            if histogram is None:
+                histogram = histograms[method] = Histogram(AI_LATENCY_BUCKETS)
+            return histogram
+
+    def _record_usage(self, method: str, usage: Any) -> None:
+        """Add a response's token usage to the per-method totals"""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            totals = self._usage.setdefault(
+                method, {"responses": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_prompt_tokens": 0}
+            )
+            totals["responses"] += 1
+            totals["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            totals["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+            totals["cached_prompt_tokens"] += getattr(details, "cached_tokens", 0) or 0
+
+    @contextmanager
+    def _track(self, gauge: str) -> Iterator[None]:
+        """Increment a gauge attribute for the duration of the block"""
+        with self._lock:
+            setattr(self, gauge, getattr(self, gauge) + 1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                setattr(self, gauge, getattr(self, gauge) - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            latency = dict(self._latency)
+            ttft = dict(self._ttft)
+            usage = {method: dict(totals) for method, totals in self._usage.items()}
+            counters["in_flight"] = self._in_flight
+            counters["waiting"] = self._waiting
+        counters["max_concurrency"] = self.max_concurrency
+        counters["queue_wait_seconds"] = self.queue_wait.snapshot()
+        counters["latency_seconds"] = {method: histogram.snapshot() for method, histogram in latency.items()}
+        counters["time_to_first_token_seconds"] = {method: histogram.snapshot() for method, histogram in ttft.items()}
+        counters["tokens"] = usage
+        return counters
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -3,14 +3,18 @@ AI Service for Resume Parsing
 Uses OpenAI and LangChain for intelligent resume parsing and data extraction
 """
 
+import asyncio
 import os
 import base64
-from typing import Dict, List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import json
-from openai import OpenAI
-import PyPDF2
-import docx
-import io
+
+from app.ai_client import AsyncAIClient
+from app.resume_cache import ResumeParseCache
+from app.resume_merge import merge_parsed_resumes
+from app.text_extraction import ExtractionLimitError, TextExtractor
+from app.token_budget import TokenBudget, compact_json, prune_empty
 
 # Optional LangChain imports - only import if available
 try:
@@ -25,203 +29,11 @@ except ImportError:
         LANGCHAIN_AVAILABLE = False
         RecursiveCharacterTextSplitter = None
 
-class AIService:
-    """AI-powered resume parsing service"""
-    
-    def __init__(self):
-        # Initialize OpenAI client - allow None API key (will fail gracefully on use)
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key:
-            try:
-                self.openai_client = OpenAI(api_key=openai_key)
-            except Exception as e:
-                print(f"Warning: Failed to initialize OpenAI client: {e}")
-                self.openai_client = None
-        else:
-            self.openai_client = None
-        self.model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
-        # Initialize text splitter only if langchain is available
-        if LANGCHAIN_AVAILABLE and RecursiveCharacterTextSplitter:
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=4000,
-                chunk_overlap=200
-            )
-        else:
-            self.text_splitter = None
-    
-    async def parse_resume(self, file_content: bytes, filename: str) -> Dict:
-        """
-        Parse resume file and extract structured data using AI
-        
-        Args:
-            file_content: Binary content of the resume file
-            filename: Original filename
-            
-        Returns:
-            Dictionary with parsed resume data
-        """
-        if not self.openai_client:
-            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
-        try:
-            print(f"[AI_SERVICE] Extracting text from {filename}...")
-            # Extract text from file
-            text = self._extract_text(file_content, filename)
-            
-            if not text:
-                raise ValueError("Could not extract text from resume file")
-            
-            print(f"[AI_SERVICE] Extracted {len(text)} characters of text")
-            print(f"[AI_SERVICE] First 300 chars: {text[:300]}")
-            
-            # Use AI to parse and structure the resume
-            print(f"[AI_SERVICE] Calling OpenAI API to parse resume...")
-            structured_data = await self._parse_with_ai(text, filename)
-            
-            print(f"[AI_SERVICE] OpenAI parsing completed. Experience count: {len(structured_data.get('experience', []))}")
-            
-            # Add file metadata
-            structured_data["original_filename"] = filename
-            structured_data["file_type"] = self._get_file_type(filename)
-            structured_data["file_size"] = len(file_content)
-            
-            return structured_data
-            
-        except Exception as e:
-            import traceback
-            print(f"[AI_SERVICE] Error parsing resume: {str(e)}")
-            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error parsing resume: {str(e)}")
-    
-    async def polish_text(self, text: str) -> str:
-        """
-        Polish and format text using AI to improve grammar, spelling, and style.
-        
-        Args:
-            text: The text to polish
-            
-        Returns:
-            Polished text with improved grammar, spelling, and formatting
-        """
-        if not text or not text.strip():
-            return text
-        
-        if not self.openai_client:
-            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
-        
-        try:
-            system_prompt = """You are a professional writing assistant. Your task is to polish and improve the provided text.
-
-Requirements:
-1. Fix all spelling and grammar mistakes
-2. Improve sentence structure and flow
-3. Make the text sound more professional and polished
-4. Maintain the original meaning and tone
-5. Keep the same level of formality
-6. Preserve paragraph breaks and structure
-7. Do not add new information not present in the original text
-8. If the text is already well-written, make only minor improvements
-
-Return only the polished text without any explanations or additional commentary."""
-            
-            user_prompt = f"""Please polish the following text, fixing grammar, spelling, and making it sound more professional:
+# Bump when the resume parsing prompt or post-processing changes so cached
+# parses from the old prompt are no longer served
+RESUME_PROMPT_VERSION = "3"
 
-{text}"""
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            polished_text = response.choices[0].message.content.strip()
-            return polished_text
-            
-        except Exception as e:
-            import traceback
-            print(f"[AI_SERVICE] Error polishing text: {str(e)}")
-            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error polishing text: {str(e)}")
-    
-    def _extract_text(self, file_content: bytes, filename: str) -> str:
-        """Extract text from various file formats"""
-        file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-        print(f"[AI_SERVICE] Extracting text from {filename} (extension: {file_ext})")
-        
-        if file_ext == 'pdf':
-            return self._extract_from_pdf(file_content)
-        elif file_ext in ['doc', 'docx']:
-            return self._extract_from_docx(file_content)
-        elif file_ext == 'txt':
-            text = file_content.decode('utf-8', errors='ignore')
-            print(f"[AI_SERVICE] Extracted {len(text)} characters from text file")
-            return text
-        else:
-            # Try to decode as text
-            try:
-                text = file_content.decode('utf-8', errors='ignore')
-                print(f"[AI_SERVICE] Extracted {len(text)} characters from text file (fallback)")
-                return text
-            except:
-                print(f"[AI_SERVICE] WARNING: Unknown file extension: {file_ext}")
-                raise ValueError(f"Unsupported file format: {file_ext}")
-    
-    def _extract_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from PDF file"""
-        try:
-            print(f"[AI_SERVICE] Extracting text from PDF ({len(file_content)} bytes)...")
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            page_count = len(pdf_reader.pages)
-            print(f"[AI_SERVICE] PDF has {page_count} pages")
-            for i, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                text += page_text + "\n"
-                print(f"[AI_SERVICE] Page {i+1}: extracted {len(page_text)} characters")
-            print(f"[AI_SERVICE] Total extracted text: {len(text)} characters")
-            if len(text.strip()) == 0:
-                print(f"[AI_SERVICE] WARNING: No text extracted from PDF!")
-            return text
-        except Exception as e:
-            import traceback
-            print(f"[AI_SERVICE] Error extracting PDF text: {str(e)}")
-            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error extracting PDF text: {str(e)}")
-    
-    def _extract_from_docx(self, file_content: bytes) -> str:
-        """Extract text from DOCX file"""
-        try:
-            print(f"[AI_SERVICE] Extracting text from DOCX ({len(file_content)} bytes)...")
-            doc_file = io.BytesIO(file_content)
-            doc = docx.Document(doc_file)
-            paragraphs = [paragraph.text for paragraph in doc.paragraphs]
-            text = "\n".join(paragraphs)
-            print(f"[AI_SERVICE] DOCX has {len(paragraphs)} paragraphs")
-            print(f"[AI_SERVICE] Total extracted text: {len(text)} characters")
-            if len(text.strip()) == 0:
-                print(f"[AI_SERVICE] WARNING: No text extracted from DOCX!")
-            return text
-        except Exception as e:
-            import traceback
-            print(f"[AI_SERVICE] Error extracting DOCX text: {str(e)}")
-            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error extracting DOCX text: {str(e)}")
-    
-    def _get_file_type(self, filename: str) -> str:
-        """Get file type from filename"""
-        ext = filename.lower().split('.')[-1] if '.' in filename else 'unknown'
-        return ext
-    
-    async def _parse_with_ai(self, text: str, filename: str) -> Dict:
-        """Use OpenAI to parse and structure resume text"""
-        if not self.openai_client:
-            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
-        
-        system_prompt = """You are an expert resume parser. Your primary task is to extract ALL work experience entries from the resume text.
+RESUME_PARSE_SYSTEM_PROMPT = """You are an expert resume parser. Your primary task is to extract ALL work experience entries from the resume text.
 
 CRITICAL: You MUST extract every work experience entry, even if the format is non-standard. Look for:
 - Job titles and company names
@@ -317,38 +129,373 @@ IMPORTANT RULES:
 
 Extract all available information. If a field is not present, use null or empty array/object as appropriate.
 Be thorough and accurate in extraction. The work experience section is the most critical part."""
-        
-        user_prompt = f"""Parse the following resume text and extract ALL work experience entries. Pay special attention to the "Work Experience" section and extract every job entry you find.
+
+# Prompts are module constants with the variable input last: the static
+# prefix is byte-identical across calls, so the API's prompt caching applies
+RESUME_USER_PROMPT = """Parse the following resume text and extract ALL work experience entries. Pay special attention to the "Work Experience" section and extract every job entry you find.
+IMPORTANT: Make sure you extract EVERY work experience entry. Look carefully through the entire text for any employment history, work experience, or job positions.
 
 Resume text:
-{text}
+{text}"""
+
+# User prompt for each part when a long resume is parsed in parts
+RESUME_CHUNK_PROMPT = """This is part {part} of {parts} of a long resume that has been split into overlapping parts, each parsed separately.
+Extract only the information that appears in this part, using the same JSON structure. Use null or empty arrays for anything not in this part; do not guess.
+If a job entry is cut off at the start or end of this part, still extract whatever is visible (company, title, dates, description).
+
+Resume text (part {part} of {parts}):
+{text}"""
+
+
+CONVERSATION_SUMMARY_SYSTEM_PROMPT = """You are an expert at summarizing professional conversations and video calls. 
+Your task is to analyze a conversation transcription and provide:
+1. A concise summary of the main discussion points
+2. Key points or highlights from the conversation
+3. Action items or next steps mentioned
+4. Overall sentiment of the conversation
+
+Return a JSON object with the following structure:
+{
+    "summary": "A 2-3 paragraph summary of the main discussion",
+    "key_points": ["Point 1", "Point 2", "Point 3"],
+    "action_items": ["Action item 1", "Action item 2"],
+    "sentiment": "positive" | "neutral" | "negative",
+    "topics": ["Topic 1", "Topic 2", "Topic 3"]
+}
+
+Be professional, accurate, and focus on actionable insights."""
+
+CONVERSATION_SUMMARY_USER_PROMPT = """Please summarize the following conversation transcription and provide a comprehensive summary in JSON format.{context}
+
+Transcription:
+{text}"""
+
+ENHANCE_SYSTEM_PROMPT = "You are a career advisor and resume expert."
+
+ENHANCE_USER_PROMPT = """Analyze this resume data and provide enhancements:
+- Suggest missing skills based on experience
+- Identify strengths and areas for improvement
+- Suggest keywords for ATS optimization
+- Provide career recommendations
+
+Return JSON with:
+{{
+    "suggested_skills": ["skill1", "skill2"],
+    "strengths": ["strength1", "strength2"],
+    "improvements": ["improvement1", "improvement2"],
+    "ats_keywords": ["keyword1", "keyword2"],
+    "career_recommendations": ["recommendation1", "recommendation2"]
+}}
+
+Resume Data: {data}"""
+
+# Resume fields that add tokens but nothing to the enhancement analysis
+ENHANCE_OMITTED_FIELDS = (
+    "id", "user_id", "raw_data", "original_text", "original_filename", "file_type", "file_size",
+    "created_at", "updated_at",
+)
+
+POLISH_SYSTEM_PROMPT = """You are a professional writing assistant. Your task is to polish and improve the provided text.
+
+Requirements:
+1. Fix all spelling and grammar mistakes
+2. Improve sentence structure and flow
+3. Make the text sound more professional and polished
+4. Maintain the original meaning and tone
+5. Keep the same level of formality
+6. Preserve paragraph breaks and structure
+7. Do not add new information not present in the original text
+8. If the text is already well-written, make only minor improvements
+
+Return only the polished text without any explanations or additional commentary."""
 
-IMPORTANT: Make sure you extract EVERY work experience entry. Look carefully through the entire text for any employment history, work experience, or job positions."""
+POLISH_USER_PROMPT = """Please polish the following text, fixing grammar, spelling, and making it sound more professional:
+
+{text}"""
+
+
+def _split_lines(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """Pack whole lines into chunks of about ``chunk_size`` characters, repeating ~``overlap`` at each boundary"""
+    lines = []
+    for line in text.splitlines(keepends=True):
+        # Hard-wrap lines that are longer than a chunk on their own
+        lines.extend(line[start:start + chunk_size] for start in range(0, max(len(line), 1), chunk_size))
+    chunks, current, size = [], [], 0
+    for line in lines:
+        if current and size + len(line) > chunk_size:
+            chunks.append("".join(current))
+            tail, tail_size = [], 0
+            for previous in reversed(current):
+                if tail_size + len(previous) > overlap:
+                    break
+                tail.insert(0, previous)
+                tail_size += len(previous)
+            current, size = tail, tail_size
+        current.append(line)
+        size += len(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class AIService:
+    """AI-powered resume parsing service"""
+    
+    def __init__(self):
+        # Initialize OpenAI client - allow None API key (will fail gracefully on use)
+        # Async client with a shared concurrency limit, timeouts and retries
+        openai_key = os.getenv("OPENAI_API_KEY")
+        if openai_key:
+            try:
+                self.openai_client = AsyncAIClient.from_env(openai_key)
+            except Exception as e:
+                print(f"Warning: Failed to initialize OpenAI client: {e}")
+                self.openai_client = None
+        else:
+            self.openai_client = None
+        self.model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+        # Long resumes are parsed in chunks (concurrently) and merged
+        self.chunk_size = int(os.getenv("RESUME_CHUNK_SIZE", "4000"))
+        self.chunk_overlap = int(os.getenv("RESUME_CHUNK_OVERLAP", "200"))
+        self.chunk_threshold = int(os.getenv("RESUME_CHUNK_THRESHOLD_CHARS", "12000"))
+        # Initialize text splitter only if langchain is available
+        if LANGCHAIN_AVAILABLE and RecursiveCharacterTextSplitter:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap
+            )
+        else:
+            self.text_splitter = None
+        # PDF/DOCX parsing runs in a process pool, off the event loop
+        self.text_extractor = TextExtractor.from_env()
+        # Parsed resumes keyed by file content (memory LRU + resume_parse_cache table)
+        from app.database import SessionLocal
+        self.parse_cache = ResumeParseCache(session_factory=SessionLocal)
+        # Local token counts; variable prompt input is trimmed to this many tokens overall
+        self.token_budget = TokenBudget(self.model, input_tokens=int(os.getenv("AI_INPUT_TOKEN_BUDGET", "12000")))
+    
+    async def parse_resume(
+        self,
+        file_content: bytes,
+        filename: str,
+        progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> Dict:
+        """
+        Parse resume file and extract structured data using AI
+        
+        Results are cached by file content, model and prompt version, so
+        re-uploading an identical file returns without calling OpenAI.
         
+        Args:
+            file_content: Binary content of the resume file
+            filename: Original filename
+            progress: Optional async callback receiving (stage, percent) updates
+            
+        Returns:
+            Dictionary with parsed resume data
+        """
+        async def report(stage: str, percent: int) -> None:
+            if progress:
+                await progress(stage, percent)
+        
+        file_hash = self.parse_cache.file_hash(file_content)
+        cache_key = self.parse_cache.cache_key(file_hash, self.model, RESUME_PROMPT_VERSION)
+        found, cached = self.parse_cache.lookup_memory(cache_key)
+        if not found:
+            found, cached = await asyncio.to_thread(self.parse_cache.lookup_database, cache_key)
+        if found:
+            print(f"[AI_SERVICE] Resume parse cache hit for {filename} ({file_hash[:12]})")
+            return self._with_file_metadata(cached, file_content, filename)
+        
+        if not self.openai_client:
+            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
         try:
-            print(f"[AI_SERVICE] Sending request to OpenAI model: {self.model}")
-            print(f"[AI_SERVICE] Text length: {len(text)} characters")
-            print(f"[AI_SERVICE] System prompt length: {len(system_prompt)} characters")
-            print(f"[AI_SERVICE] User prompt length: {len(user_prompt)} characters")
+            print(f"[AI_SERVICE] Extracting text from {filename}...")
+            await report("extracting", 10)
+            # Extract text from file
+            text = await self.text_extractor.extract(file_content, filename)
             
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
+            if not text:
+                raise ValueError("Could not extract text from resume file")
+            
+            print(f"[AI_SERVICE] Extracted {len(text)} characters of text")
+            print(f"[AI_SERVICE] First 300 chars: {text[:300]}")
+            
+            # Use AI to parse and structure the resume
+            print(f"[AI_SERVICE] Calling OpenAI API to parse resume...")
+            await report("parsing", 30)
+            structured_data = await self._parse_with_ai(text, filename, progress=progress)
+            
+            print(f"[AI_SERVICE] OpenAI parsing completed. Experience count: {len(structured_data.get('experience', []))}")
+            
+            await asyncio.to_thread(
+                self.parse_cache.store, cache_key, file_hash, self.model, RESUME_PROMPT_VERSION, structured_data
             )
             
-            print(f"[AI_SERVICE] OpenAI API response received")
+            return self._with_file_metadata(structured_data, file_content, filename)
             
-            # Parse JSON response
-            response_content = response.choices[0].message.content
-            print(f"[AI_SERVICE] Response content length: {len(response_content)} characters")
-            print(f"[AI_SERVICE] First 500 chars of response: {response_content[:500]}")
+        except ExtractionLimitError:
+            raise
+        except Exception as e:
+            import traceback
+            print(f"[AI_SERVICE] Error parsing resume: {str(e)}")
+            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
+            raise Exception(f"Error parsing resume: {str(e)}")
+    
+    async def polish_text(self, text: str) -> str:
+        """
+        Polish and format text using AI to improve grammar, spelling, and style.
+        
+        Args:
+            text: The text to polish
+            
+        Returns:
+            Polished text with improved grammar, spelling, and formatting
+        """
+        if not text or not text.strip():
+            return text
+        
+        if not self.openai_client:
+            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+        
+        try:
+            response = await self.openai_client.chat("polish_text", **self._polish_request(text))
+            
+            polished_text = response.choices[0].message.content.strip()
+            return polished_text
+            
+        except Exception as e:
+            import traceback
+            print(f"[AI_SERVICE] Error polishing text: {str(e)}")
+            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
+            raise Exception(f"Error polishing text: {str(e)}")
+    
+    async def polish_text_stream(self, text: str) -> AsyncIterator[str]:
+        """
+        Polish text like ``polish_text``, yielding the output as it is generated
+        
+        Closing the iterator cancels the upstream completion.
+        """
+        if not text or not text.strip():
+            yield text
+            return
+        
+        if not self.openai_client:
+            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+        
+        # aclosing: exiting the loop early must close the upstream stream too
+        async with aclosing(self.openai_client.stream_chat("polish_text_stream", **self._polish_request(text))) as deltas:
+            async for delta in deltas:
+                yield delta
+    
+    def _polish_request(self, text: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": POLISH_SYSTEM_PROMPT},
+                {"role": "user", "content": POLISH_USER_PROMPT.format(text=text)}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 2000,
+        }
+    
+    def _with_file_metadata(self, structured_data: Dict, file_content: bytes, filename: str) -> Dict:
+        """Add the per-upload file metadata (not part of the cached result)"""
+        structured_data["original_filename"] = filename
+        structured_data["file_type"] = self._get_file_type(filename)
+        structured_data["file_size"] = len(file_content)
+        if isinstance(structured_data.get("raw_data"), dict):
+            structured_data["raw_data"]["filename"] = filename
+        return structured_data
+    
+    def _get_file_type(self, filename: str) -> str:
+        """Get file type from filename"""
+        ext = filename.lower().split('.')[-1] if '.' in filename else 'unknown'
+        return ext
+    
+    def _split_resume(self, text: str) -> List[str]:
+        """The resume text as one piece, or overlapping chunks when it is long"""
+        if len(text) <= self.chunk_threshold:
+            return [text]
+        if self.text_splitter:
+            chunks = self.text_splitter.split_text(text)
+        else:
+            chunks = _split_lines(text, self.chunk_size, self.chunk_overlap)
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+        return chunks or [text]
+    
+    async def _request_resume_json(self, user_prompt: str) -> Dict:
+        """One resume parsing call; returns the decoded JSON object"""
+        response = await self.openai_client.chat(
+            "parse_resume",
+            model=self.model,
+            messages=[
+                {"role": "system", "content": RESUME_PARSE_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+        
+        print(f"[AI_SERVICE] OpenAI API response received")
+        
+        # Parse JSON response
+        response_content = response.choices[0].message.content
+        print(f"[AI_SERVICE] Response content length: {len(response_content)} characters")
+        print(f"[AI_SERVICE] First 500 chars of response: {response_content[:500]}")
+        try:
+            return json.loads(response_content)
+        except json.JSONDecodeError:
+            print(f"[AI_SERVICE] Response content: {response_content[:1000]}")
+            raise
+    
+    async def _parse_chunks(
+        self,
+        chunks: List[str],
+        progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> Dict:
+        """Map: parse every chunk concurrently. Reduce: merge the parts in document order."""
+        done = 0
+        
+        async def parse_chunk(index: int, chunk: str) -> Dict:
+            nonlocal done
+            chunk = self.token_budget.fit_input(chunk, RESUME_PARSE_SYSTEM_PROMPT, RESUME_CHUNK_PROMPT)
+            user_prompt = RESUME_CHUNK_PROMPT.format(part=index + 1, parts=len(chunks), text=chunk)
+            parsed = await self._request_resume_json(user_prompt)
+            done += 1
+            print(f"[AI_SERVICE] Parsed chunk {index + 1}/{len(chunks)} ({len(parsed.get('experience') or [])} experiences)")
+            if progress:
+                await progress("parsing", 30 + (55 * done) // len(chunks))
+            return parsed
+        
+        # gather keeps the results in chunk order, so the merge is deterministic
+        parts = await asyncio.gather(*(parse_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+        return merge_parsed_resumes(list(parts))
+    
+    async def _parse_with_ai(
+        self,
+        text: str,
+        filename: str,
+        progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> Dict:
+        """Use OpenAI to parse and structure resume text (in chunks when it is long)"""
+        if not self.openai_client:
+            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+        
+        chunks = self._split_resume(text)
+        
+        try:
+            print(f"[AI_SERVICE] Sending request to OpenAI model: {self.model}")
+            print(f"[AI_SERVICE] Text length: {len(text)} characters")
             
-            parsed_data = json.loads(response_content)
+            if len(chunks) > 1:
+                print(f"[AI_SERVICE] Long resume: parsing {len(chunks)} chunks concurrently")
+                parsed_data = await self._parse_chunks(chunks, progress)
+            else:
+                fitted = self.token_budget.fit_input(text, RESUME_PARSE_SYSTEM_PROMPT, RESUME_USER_PROMPT)
+                user_prompt = RESUME_USER_PROMPT.format(text=fitted)
+                print(f"[AI_SERVICE] User prompt length: {len(user_prompt)} characters (~{self.token_budget.count(user_prompt)} tokens)")
+                parsed_data = await self._request_resume_json(user_prompt)
             
             # Validate that we got experience data
             experiences = parsed_data.get("experience", [])
@@ -366,14 +513,14 @@ IMPORTANT: Make sure you extract EVERY work experience entry. Look carefully thr
             parsed_data["raw_data"] = {
                 "original_text": text[:1000],  # Store first 1000 chars for debugging
                 "filename": filename,
-                "parsing_model": self.model
+                "parsing_model": self.model,
+                "chunks": len(chunks)
             }
             
             return parsed_data
             
         except json.JSONDecodeError as e:
             print(f"[AI_SERVICE] JSON decode error: {str(e)}")
-            print(f"[AI_SERVICE] Response content: {response_content[:1000] if 'response_content' in locals() else 'N/A'}")
             raise Exception(f"Error parsing AI response as JSON: {str(e)}")
         except Exception as e:
             import traceback
@@ -400,25 +547,6 @@ IMPORTANT: Make sure you extract EVERY work experience entry. Look carefully thr
             
             print(f"[AI_SERVICE] Summarizing conversation ({len(transcription_text)} characters)...")
             
-            # Build system prompt for conversation summarization
-            system_prompt = """You are an expert at summarizing professional conversations and video calls. 
-Your task is to analyze a conversation transcription and provide:
-1. A concise summary of the main discussion points
-2. Key points or highlights from the conversation
-3. Action items or next steps mentioned
-4. Overall sentiment of the conversation
-
-Return a JSON object with the following structure:
-{
-    "summary": "A 2-3 paragraph summary of the main discussion",
-    "key_points": ["Point 1", "Point 2", "Point 3"],
-    "action_items": ["Action item 1", "Action item 2"],
-    "sentiment": "positive" | "neutral" | "negative",
-    "topics": ["Topic 1", "Topic 2", "Topic 3"]
-}
-
-Be professional, accurate, and focus on actionable insights."""
-            
             # Build user prompt with context
             context_info = ""
             if conversation_context:
@@ -429,18 +557,17 @@ Be professional, accurate, and focus on actionable insights."""
                 if conversation_context.get('topic'):
                     context_info += f"\nMeeting topic: {conversation_context['topic']}"
             
-            user_prompt = f"""Please summarize the following conversation transcription.{context_info}
-
-Transcription:
-{transcription_text}
-
-Provide a comprehensive summary in JSON format."""
+            transcription = self.token_budget.fit_input(
+                transcription_text, CONVERSATION_SUMMARY_SYSTEM_PROMPT, CONVERSATION_SUMMARY_USER_PROMPT, context_info
+            )
+            user_prompt = CONVERSATION_SUMMARY_USER_PROMPT.format(context=context_info, text=transcription)
             
             print(f"[AI_SERVICE] Calling OpenAI API for conversation summary...")
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat(
+                "summarize_conversation",
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": CONVERSATION_SUMMARY_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,  # Lower temperature for more consistent summaries
@@ -482,27 +609,16 @@ Provide a comprehensive summary in JSON format."""
         if not self.openai_client:
             raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
         try:
-            prompt = f"""Analyze this resume data and provide enhancements:
-            - Suggest missing skills based on experience
-            - Identify strengths and areas for improvement
-            - Suggest keywords for ATS optimization
-            - Provide career recommendations
-            
-            Resume Data: {json.dumps(resume_data, indent=2)}
-            
-            Return JSON with:
-            {{
-                "suggested_skills": ["skill1", "skill2"],
-                "strengths": ["strength1", "strength2"],
-                "improvements": ["improvement1", "improvement2"],
-                "ats_keywords": ["keyword1", "keyword2"],
-                "career_recommendations": ["recommendation1", "recommendation2"]
-            }}"""
+            # Compact JSON of the non-empty fields (indent=2 and nulls roughly double the tokens)
+            data = compact_json(prune_empty(resume_data, ENHANCE_OMITTED_FIELDS))
+            data = self.token_budget.fit_input(data, ENHANCE_SYSTEM_PROMPT, ENHANCE_USER_PROMPT)
+            prompt = ENHANCE_USER_PROMPT.format(data=data)
             
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat(
+                "enhance_resume_data",
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a career advisor and resume expert."},
+                    {"role": "system", "content": ENHANCE_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
@@ -0,0 +1,96 @@
+"""
+Async Geocoder
+Runs blocking geocoding calls off the event loop with rate limiting and request coalescing
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+
+
+class AsyncGeocoder:
+    """
+    Bounded thread-pool backend for blocking geocoder calls.
+
+    - Calls run in a small dedicated thread pool so the event loop keeps
+      serving other requests during each provider round trip.
+    - Call starts are spaced at least ``min_interval`` seconds apart
+      (Nominatim's usage policy allows one request per second). The limit
+      is per process.
+    - Identical lookups already in flight share a single upstream call.
+      The call is cancelled once every caller waiting on it has gone, and
+      a rate-limit slot is only taken when a call actually starts, so
+      abandoned lookups do not delay later ones.
+    """
+
+    def __init__(self, max_workers: int = 2, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="geocoder")
+        self._start_lock = asyncio.Lock()
+        self._next_slot = 0.0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._counters_lock = threading.Lock()
+        self._counters = {"calls": 0, "coalesced": 0, "abandoned": 0, "throttled_seconds": 0.0}
+
+    async def run(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` in the pool, sharing the result with concurrent callers using the same key
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            with self._counters_lock:
+                self._counters["coalesced"] += 1
+        else:
+            future = asyncio.ensure_future(self._call(func))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # Shield so one cancelled caller does not cancel the lookup for the others
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                if not future.done():
+                    # Nobody is waiting any more - drop the queued or running call
+                    future.cancel()
+                    self._forget(key, future)
+                    with self._counters_lock:
+                        self._counters["abandoned"] += 1
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def _call(self, func: Callable[[], Any]) -> Any:
+        await self._throttle()
+        with self._counters_lock:
+            self._counters["calls"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func)
+
+    async def _throttle(self) -> None:
+        """Wait for the next free slot and take it (calls start in arrival order)"""
+        loop = asyncio.get_running_loop()
+        async with self._start_lock:
+            wait = self._next_slot - loop.time()
+            if wait > 0:
+                with self._counters_lock:
+                    self._counters["throttled_seconds"] += wait
+                await asyncio.sleep(wait)
+            # Booked only now: a call cancelled while waiting leaves the schedule untouched
+            self._next_slot = loop.time() + self.min_interval
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        counters["throttled_seconds"] = round(counters["throttled_seconds"], 3)
+        counters["in_flight"] = len(self._inflight)
+        return counters
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,67 @@
+"""
+In-Memory Cache Helpers
+Thread-safe LRU cache with optional per-entry TTL
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache.
+
+    Entries may carry their own time-to-live; expired entries are treated as
+    missing and evicted lazily on access.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key
+
+        Returns:
+            (found, value). ``value`` may legitimately be None, so callers must
+            check ``found`` rather than the value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
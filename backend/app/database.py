@@ -5,12 +5,27 @@ Supports both PostgreSQL (including Supabase) and SQLite
 """
 
 import os
-from sqlalchemy import create_engine, text
+import threading
+import time
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from contextlib import contextmanager
+
 from fastapi import HTTPException
+from app.metrics import Histogram
 from app.models import Base
+from app.search import ensure_search_indexes
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    ASYNC_DB_AVAILABLE = True
+except ImportError:
+    # sqlalchemy[asyncio] (greenlet) not installed - async routes report 503
+    ASYNC_DB_AVAILABLE = False
 
 # Database URL from environment
 # For Supabase, use: postgresql://postgres:[PASSWORD]@[PROJECT_REF].supabase.co:5432/postgres
@@ -24,6 +39,65 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# Connection pool sizing (PostgreSQL only)
+# Keep DB_POOL_SIZE + DB_MAX_OVERFLOW per process below the Supabase pooler /
+# Postgres connection limit divided by the number of app processes
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+class PoolStats:
+    """Checkout counters and wait-time histogram for one connection pool"""
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self._lock = threading.Lock()
+        self._counters = {"checkouts": 0, "checkout_timeouts": 0, "connections_opened": 0}
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "checkout_wait_seconds": self.checkout_wait.snapshot()}
+
+
+class _CheckoutTimingMixin:
+    """Records how long callers wait to check a connection out of the pool"""
+    stats: PoolStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.count("checkout_timeouts")
+            raise
+        finally:
+            self.stats.checkout_wait.observe(time.perf_counter() - started)
+        self.stats.count("checkouts")
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool for the sync engine with checkout metrics"""
+    stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """Queue pool for the async engine with checkout metrics"""
+    stats = PoolStats()
+
+
+def _count_connections(sync_engine) -> None:
+    stats = getattr(sync_engine.pool, "stats", None)
+    if stats is not None:
+        event.listen(sync_engine, "connect", lambda *_: stats.count("connections_opened"))
+
+
 # Create engine with connection pool settings
 # For SQLite, use NullPool and enable check_same_thread=False
 # On Railway, we should use Supabase PostgreSQL, not SQLite
@@ -41,10 +115,15 @@ if DATABASE_URL:
             # PostgreSQL or other databases
             engine = create_engine(
                 DATABASE_URL,
-                pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,   # Recycle connections after 1 hour
+                poolclass=InstrumentedQueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=True,  # Verify connections on checkout
+                pool_recycle=DB_POOL_RECYCLE,
                 echo=os.getenv("DB_ECHO", "False").lower() == "true"
             )
+        _count_connections(engine)
         print(f"Database engine created successfully")
     except Exception as e:
         print(f"Warning: Failed to create database engine: {e}")
@@ -62,6 +141,73 @@ else:
     SessionLocal = None
 
 
+def _async_database_url(url: str):
+    """
+    Map DATABASE_URL onto an async driver
+
+    Returns:
+        (async_url, connect_args), or (None, {}) for unsupported databases
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    connect_args = {}
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite"), {"check_same_thread": False}
+    if backend in ("postgresql", "postgres"):
+        query = dict(parsed.query)
+        # asyncpg takes "ssl" instead of libpq's "sslmode"
+        sslmode = query.pop("sslmode", None)
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = "require" if sslmode in ("require", "prefer", "allow") else sslmode
+        # PgBouncer in transaction mode (Supabase pooler on 6543) cannot use prepared statements
+        if parsed.port == 6543 or "pooler" in (parsed.host or ""):
+            connect_args["statement_cache_size"] = 0
+        return parsed.set(drivername="postgresql+asyncpg", query=query), connect_args
+    return None, {}
+
+
+# Async engine for routes that must not block the event loop
+# (asyncpg for PostgreSQL, aiosqlite for SQLite; same pool settings as the sync engine)
+async_engine = None
+if DATABASE_URL and ASYNC_DB_AVAILABLE:
+    try:
+        async_url, async_connect_args = _async_database_url(DATABASE_URL)
+        if async_url is None:
+            print("Warning: No async driver mapping for DATABASE_URL, async sessions disabled")
+        elif async_url.get_backend_name() == "sqlite":
+            async_engine = create_async_engine(
+                async_url,
+                poolclass=NullPool,
+                connect_args=async_connect_args,
+                echo=os.getenv("DB_ECHO", "False").lower() == "true"
+            )
+        else:
+            async_engine = create_async_engine(
+                async_url,
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=True,
+                pool_recycle=DB_POOL_RECYCLE,
+                connect_args=async_connect_args,
+                echo=os.getenv("DB_ECHO", "False").lower() == "true"
+            )
+        if async_engine:
+            _count_connections(async_engine.sync_engine)
+            print("Async database engine created successfully")
+    except Exception as e:
+        # Missing asyncpg/aiosqlite should not stop the sync routes from working
+        print(f"Warning: Failed to create async database engine: {e}")
+        async_engine = None
+
+if async_engine:
+    # expire_on_commit=False so ORM objects stay readable after commit without implicit IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+else:
+    AsyncSessionLocal = None
+
+
 def init_db():
     """Initialize database tables"""
     if not engine:
@@ -69,6 +215,11 @@ def init_db():
         return
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all skips indexes on tables that already exist; add any new ones
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        ensure_search_indexes(engine)
     except Exception as e:
         print(f"Warning: Database initialization failed: {e}")
         # Don't raise - allow app to start even if DB init fails
@@ -78,24 +229,76 @@ def init_db():
 def get_db():
     """Dependency for getting database session"""
     if not SessionLocal:
-        from fastapi import HTTPException
         raise HTTPException(status_code=503, detail="Database not configured")
+    # No per-request "SELECT 1": pool_pre_ping already validates connections
+    # on checkout, and the session only checks one out on first use
+    db = SessionLocal()
     try:
-        db = SessionLocal()
+        yield db
+    except HTTPException:
+        # Errors raised deliberately by the route pass through unchanged
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        print(f"Database connection error: {e}")
+        raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    if not AsyncSessionLocal:
+        raise HTTPException(status_code=503, detail="Async database not configured")
+    async with AsyncSessionLocal() as db:
         try:
-            # Test connection (SQLAlchemy 2.0 syntax)
-            db.execute(text("SELECT 1"))
             yield db
+        except HTTPException:
+            await db.rollback()
+            raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             print(f"Database connection error: {e}")
-            from fastapi import HTTPException
             raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
-        finally:
-            db.close()
-    except Exception as e:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=503, detail=f"Database error: {str(e)}")
+
+
+async def dispose_async_engine():
+    """Close pooled async connections on shutdown"""
+    if async_engine:
+        await async_engine.dispose()
+
+
+def _describe_pool(sync_engine) -> dict:
+    pool = sync_engine.pool
+    metrics = {
+        "configured": True,
+        "dialect": sync_engine.dialect.name,
+        "driver": sync_engine.dialect.driver,
+        "pool_class": type(pool).__name__,
+    }
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is not None:
+        metrics.update(stats.snapshot())
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            "pool_size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # overflow() goes negative while the base pool is still filling
+            "overflow": max(0, pool.overflow()),
+        })
+    return metrics
+
+
+def get_pool_metrics() -> dict:
+    """Connection pool occupancy and checkout wait times for the sync and async engines"""
+    return {
+        "sync": _describe_pool(engine) if engine else {"configured": False},
+        "async": _describe_pool(async_engine.sync_engine) if async_engine else {"configured": False},
+    }
 
 
 @contextmanager
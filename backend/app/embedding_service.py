@@ -0,0 +1,434 @@
+"""
+Embedding Service
+Embeds jobs, talent profiles and resumes on write and serves similarity search
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, select
+
+from app.embeddings import (
+    content_hash,
+    from_blob,
+    get_embedder,
+    job_text,
+    resume_text,
+    summarize,
+    talent_text,
+    to_blob,
+)
+from app.models import EmbeddingRecord, Job, ResumeData, TalentProfile
+from app.vector_index import VectorIndex
+
+# Searches repeated after dropping deleted or hidden hits, before returning a short page
+SEARCH_ROUNDS = 3
+
+# Entity name -> (model, document text builder)
+EMBEDDED_MODELS: Dict[str, Tuple[Any, Callable]] = {
+    "job": (Job, job_text),
+    "talent": (TalentProfile, talent_text),
+    "resume": (ResumeData, resume_text),
+}
+
+
+def visibility_filter(entity: str) -> Tuple:
+    """Conditions a row must meet to appear in search (the same ones the list endpoints use)"""
+    if entity == "job":
+        return (Job.is_active == True, Job.status == "published")  # noqa: E712
+    if entity == "talent":
+        return (TalentProfile.is_active == True,)  # noqa: E712
+    return ()
+
+
+def is_visible(entity: str, row) -> bool:
+    """Python-side counterpart of ``visibility_filter``"""
+    if entity == "job":
+        return bool(row.is_active) and row.status == "published"
+    if entity == "talent":
+        return bool(row.is_active)
+    return True
+
+
+def describe(entity: str, row) -> Dict[str, Any]:
+    """Short summary of a search hit for API responses"""
+    if entity == "job":
+        return {"title": row.title, "location": row.location or row.city, "business_profile_id": row.business_profile_id}
+    if entity == "talent":
+        return {"name": row.name, "title": row.title, "location": row.location}
+    return {"name": row.name, "summary": summarize(row.summary)}
+
+
+class EmbeddingService:
+    """
+    Embed-on-write pipeline plus per-entity vector indexes.
+
+    Routes enqueue (entity, id) after committing a write. A background worker
+    embeds pending rows in batches (skipping rows whose text is unchanged),
+    stores float16 vectors in the ``embeddings`` table and updates the
+    in-memory index. Rows that are deleted or hidden (inactive, or jobs not
+    published) have their embedding removed instead. Failed batches are
+    retried with backoff up to ``max_attempts`` times. On startup the
+    indexes are loaded from the table, embeddings of deleted or hidden rows
+    are dropped and visible rows without an embedding for the current model
+    are queued; afterwards vectors written by other processes (standalone
+    resume workers) are picked up every ``sync_seconds``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        embedder=None,
+        batch_size: int = 32,
+        max_attempts: int = 3,
+        retry_delay: float = 5.0,
+        sync_seconds: float = 60.0
+    ):
+        self.session_factory = session_factory
+        self.embedder = embedder or get_embedder()
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.sync_seconds = sync_seconds
+        exact_limit = int(os.getenv("EMBEDDING_EXACT_SEARCH_LIMIT", "20000"))
+        probes = int(os.getenv("EMBEDDING_SEARCH_PROBES", "8"))
+        self.indexes = {
+            entity: VectorIndex(self.embedder.dimensions, exact_limit=exact_limit, probes=probes)
+            for entity in EMBEDDED_MODELS
+        }
+
+        self._pending: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._attempts: Dict[Tuple[str, int], int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._startup: Optional[asyncio.Task] = None
+        self.ready = False
+        self._counters = {
+            "enqueued": 0, "embedded": 0, "unchanged": 0, "removed": 0, "retried": 0, "failed": 0, "batches": 0
+        }
+
+    @classmethod
+    def from_env(cls, session_factory: Callable) -> "EmbeddingService":
+        return cls(
+            session_factory,
+            batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+            max_attempts=int(os.getenv("EMBEDDING_MAX_ATTEMPTS", "3")),
+            sync_seconds=float(os.getenv("EMBEDDING_SYNC_SECONDS", "60"))
+        )
+
+    # ==================== Producer ====================
+
+    def enqueue(self, entity: str, entity_id: Optional[int]) -> bool:
+        if entity not in EMBEDDED_MODELS or not entity_id:
+            return False
+        key = (entity, entity_id)
+        self._pending.pop(key, None)
+        self._pending[key] = time.monotonic()
+        self._counters["enqueued"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    # ==================== Worker ====================
+
+    async def start(self, serve_search: bool = True) -> None:
+        """
+        Start the embedding worker
+
+        Args:
+            serve_search: Load, backfill and keep syncing the search indexes.
+                Processes that only write embeddings (standalone resume
+                workers) pass False.
+        """
+        if self._worker is not None:
+            return
+        self._wakeup = asyncio.Event()
+        if serve_search:
+            self._startup = asyncio.create_task(self._load())
+        else:
+            self.ready = True
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._startup, self._worker):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._worker = None
+        self._startup = None
+
+    async def _load(self) -> None:
+        """Fill the indexes from stored embeddings, then queue rows that have none"""
+        try:
+            removed = await asyncio.to_thread(self._remove_stale)
+            if removed:
+                self._counters["removed"] += removed
+                print(f"[EMBEDDINGS] Removed {removed} embeddings of deleted or hidden rows")
+            loaded, synced_to = await asyncio.to_thread(self._load_indexes)
+            print(f"[EMBEDDINGS] Loaded {loaded} vectors ({self.embedder.model_id})")
+            missing = await asyncio.to_thread(self._missing_ids)
+            for entity, ids in missing.items():
+                for entity_id in ids:
+                    self.enqueue(entity, entity_id)
+            if any(missing.values()):
+                print(f"[EMBEDDINGS] Queued backfill: { {entity: len(ids) for entity, ids in missing.items()} }")
+        except Exception as e:
+            print(f"[EMBEDDINGS] Failed to load embeddings: {e}")
+            synced_to = None
+        finally:
+            self.ready = True
+            self._wakeup.set()
+
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                _, synced_to = await asyncio.to_thread(self._load_indexes, synced_to)
+            except Exception as e:
+                print(f"[EMBEDDINGS] Failed to sync embeddings: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending or not self.ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            batch: Dict[str, List[int]] = {}
+            for _ in range(min(self.batch_size, len(self._pending))):
+                (entity, entity_id), _ = self._pending.popitem(last=False)
+                batch.setdefault(entity, []).append(entity_id)
+
+            for entity, ids in batch.items():
+                try:
+                    embedded, unchanged, removed = await asyncio.to_thread(self._embed_rows, entity, ids)
+                    self._counters["embedded"] += embedded
+                    self._counters["unchanged"] += unchanged
+                    self._counters["removed"] += removed
+                    self._counters["batches"] += 1
+                    for entity_id in ids:
+                        self._attempts.pop((entity, entity_id), None)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[EMBEDDINGS] Failed to embed {len(ids)} {entity} rows: {e}")
+                    self._retry(entity, ids)
+
+    def _retry(self, entity: str, ids: List[int]) -> None:
+        """Queue a failed batch again after an exponential backoff, giving up after max_attempts"""
+        loop = asyncio.get_running_loop()
+        for entity_id in ids:
+            key = (entity, entity_id)
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(key, None)
+                self._counters["failed"] += 1
+                continue
+            self._attempts[key] = attempts
+            self._counters["retried"] += 1
+            loop.call_later(self.retry_delay * 2 ** (attempts - 1), self.enqueue, entity, entity_id)
+
+    # ==================== Database (worker threads) ====================
+
+    def _load_indexes(self, since: Optional[datetime] = None) -> Tuple[int, Optional[datetime]]:
+        """
+        Load stored vectors (all, or those updated at or after ``since``) into the indexes
+
+        Returns:
+            (vectors loaded, newest updated_at seen) - pass the latter as ``since`` next time
+        """
+        db = self.session_factory()
+        try:
+            query = db.query(
+                EmbeddingRecord.entity_type, EmbeddingRecord.entity_id, EmbeddingRecord.vector, EmbeddingRecord.updated_at
+            ).filter(EmbeddingRecord.model == self.embedder.model_id)
+            if since is not None:
+                # >= so records sharing the watermark timestamp are never missed
+                query = query.filter(EmbeddingRecord.updated_at >= since)
+            loaded = 0
+            newest = since
+            for entity, entity_id, blob, updated_at in query.yield_per(5000):
+                index = self.indexes.get(entity)
+                if index is not None:
+                    index.upsert(entity_id, from_blob(blob))
+                    loaded += 1
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+            return loaded, newest
+        finally:
+            db.close()
+
+    def _remove_stale(self) -> int:
+        """Delete stored embeddings whose row was deleted or is hidden"""
+        db = self.session_factory()
+        try:
+            removed = 0
+            for entity, (model, _) in EMBEDDED_MODELS.items():
+                stale = select(EmbeddingRecord.id).outerjoin(
+                    model, and_(model.id == EmbeddingRecord.entity_id, *visibility_filter(entity))
+                ).where(EmbeddingRecord.entity_type == entity, model.id.is_(None))
+                removed += db.execute(
+                    delete(EmbeddingRecord).where(EmbeddingRecord.id.in_(stale)).execution_options(synchronize_session=False)
+                ).rowcount or 0
+            db.commit()
+            return removed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _missing_ids(self) -> Dict[str, List[int]]:
+        db = self.session_factory()
+        try:
+            missing = {}
+            for entity, (model, _) in EMBEDDED_MODELS.items():
+                rows = db.query(model.id).outerjoin(
+                    EmbeddingRecord,
+                    and_(
+                        EmbeddingRecord.entity_type == entity,
+                        EmbeddingRecord.entity_id == model.id,
+                        EmbeddingRecord.model == self.embedder.model_id
+                    )
+                ).filter(EmbeddingRecord.id.is_(None), *visibility_filter(entity)).all()
+                missing[entity] = [row.id for row in rows]
+            return missing
+        finally:
+            db.close()
+
+    def _embed_rows(self, entity: str, ids: List[int]) -> Tuple[int, int, int]:
+        """
+        Embed a batch of rows of one entity and persist the vectors
+
+        Returns:
+            (embedded, unchanged, removed) counts
+        """
+        model, build_text = EMBEDDED_MODELS[entity]
+        index = self.indexes[entity]
+        db = self.session_factory()
+        try:
+            rows = [row for row in db.query(model).filter(model.id.in_(ids)).all() if is_visible(entity, row)]
+            found = {row.id for row in rows}
+            # Deleted or hidden since it was queued
+            gone = list(set(ids) - found)
+            removed = 0
+            if gone:
+                removed = db.execute(
+                    delete(EmbeddingRecord).where(
+                        EmbeddingRecord.entity_type == entity,
+                        EmbeddingRecord.entity_id.in_(gone)
+                    ).execution_options(synchronize_session=False)
+                ).rowcount or 0
+                db.commit()
+                for entity_id in gone:
+                    index.remove(entity_id)
+
+            records = {
+                record.entity_id: record
+                for record in db.query(EmbeddingRecord).filter(
+                    EmbeddingRecord.entity_type == entity,
+                    EmbeddingRecord.entity_id.in_(list(found))
+                )
+            }
+            todo = []
+            unchanged = 0
+            for row in rows:
+                text = build_text(row)
+                digest = content_hash(text)
+                record = records.get(row.id)
+                if record and record.content_hash == digest and record.model == self.embedder.model_id:
+                    unchanged += 1
+                    continue
+                todo.append((row.id, text, digest))
+            if not todo:
+                return 0, unchanged, removed
+
+            vectors = self.embedder.embed([text for _, text, _ in todo])
+            for (entity_id, _, digest), vector in zip(todo, vectors):
+                record = records.get(entity_id)
+                if record is None:
+                    record = EmbeddingRecord(entity_type=entity, entity_id=entity_id)
+                    db.add(record)
+                record.model = self.embedder.model_id
+                record.dimensions = self.embedder.dimensions
+                record.vector = to_blob(vector)
+                record.content_hash = digest
+            db.commit()
+
+            for (entity_id, _, _), vector in zip(todo, vectors):
+                index.upsert(entity_id, vector.astype(np.float16))
+            return len(todo), unchanged, removed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ==================== Search ====================
+
+    async def vector_for(self, entity: str, entity_id: int, row=None) -> Optional[np.ndarray]:
+        """Stored vector of a row, embedding it on the fly if it has not been processed yet"""
+        vector = self.indexes[entity].get(entity_id)
+        if vector is None and row is not None:
+            text = EMBEDDED_MODELS[entity][1](row)
+            vector = (await asyncio.to_thread(self.embedder.embed, [text]))[0]
+            self.enqueue(entity, entity_id)
+        return vector
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return (await asyncio.to_thread(self.embedder.embed, [text]))[0]
+
+    async def search(
+        self,
+        db,
+        entity: str,
+        vector: np.ndarray,
+        limit: int = 20,
+        exclude: Tuple[int, ...] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest visible rows of an entity to a vector, with row summaries (AsyncSession)
+
+        Hits that were deleted or hidden since they were indexed are dropped
+        from the index (and queued so their stored embedding is removed),
+        then the search is repeated so a full page can still be returned.
+        """
+        model = EMBEDDED_MODELS[entity][0]
+        index = self.indexes[entity]
+        for _ in range(SEARCH_ROUNDS):
+            hits = await asyncio.to_thread(index.search, vector, limit, exclude)
+            if not hits:
+                return []
+            rows = {
+                row.id: row
+                for row in (await db.execute(
+                    select(model).where(model.id.in_([key for key, _ in hits]), *visibility_filter(entity))
+                )).scalars()
+            }
+            results = []
+            for key, score in hits:
+                row = rows.get(key)
+                if row is None:
+                    index.remove(key)
+                    self.enqueue(entity, key)
+                    continue
+                results.append({"id": key, "entity": entity, "similarity": round(score, 4), **describe(entity, row)})
+            if len(results) == len(hits):
+                break
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "model": self.embedder.model_id,
+            "ready": self.ready,
+            "depth": len(self._pending),
+            "indexes": {entity: index.stats() for entity, index in self.indexes.items()},
+        }
@@ -0,0 +1,161 @@
+"""
+Embeddings
+Text embedding providers and the document text used for jobs, talent and resumes
+"""
+
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+    OpenAI = None
+
+DEFAULT_DIMENSIONS = 384
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder (no network, no model files).
+
+    Word unigrams and bigrams are hashed into a fixed number of signed
+    buckets with sublinear term-frequency weighting, then L2-normalized, so
+    cosine similarity approximates weighted term overlap. Good enough for
+    "more like this" and offline development; use a neural provider for
+    real semantic matching.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+        self.model_id = f"hashing-v1-{dimensions}"
+
+    def _features(self, text: str) -> Counter:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = Counter(tokens)
+        features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text or "").items():
+                # Stable across processes (Python's hash() is salted per run)
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dimensions] += sign * (1.0 + math.log(count))
+        return _normalize_rows(vectors)
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings API (text-embedding-3-* models support reduced dimensions)"""
+
+    def __init__(self, api_key: str, model: str = "text-embedding-3-small", dimensions: int = DEFAULT_DIMENSIONS):
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.dimensions = dimensions
+        self.model_id = f"openai-{model}-{dimensions}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        # The API rejects empty strings
+        inputs = [text if text and text.strip() else " " for text in texts]
+        response = self.client.embeddings.create(model=self.model, input=inputs, dimensions=self.dimensions)
+        vectors = np.array([item.embedding for item in sorted(response.data, key=lambda item: item.index)], dtype=np.float32)
+        return _normalize_rows(vectors)
+
+
+def get_embedder():
+    """
+    Embedder selected by EMBEDDING_PROVIDER ("hashing" or "openai")
+
+    Falls back to the hashing embedder when OpenAI is requested but not configured.
+    """
+    provider = os.getenv("EMBEDDING_PROVIDER", "hashing").lower()
+    dimensions = int(os.getenv("EMBEDDING_DIMENSIONS", str(DEFAULT_DIMENSIONS)))
+    if provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
+        if OPENAI_AVAILABLE and api_key:
+            return OpenAIEmbedder(
+                api_key,
+                model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+                dimensions=dimensions
+            )
+        print("[EMBEDDINGS] OpenAI embeddings not configured, using local hashing embedder")
+    return HashingEmbedder(dimensions)
+
+
+# ==================== Document Text ====================
+
+# Characters of document text sent to the embedder
+MAX_DOCUMENT_CHARS = 8000
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """All non-empty strings inside a JSON value"""
+    if isinstance(value, str):
+        if value.strip():
+            yield value.strip()
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def _document(*parts: Any) -> str:
+    text = "\n".join(string for part in parts for string in _strings(part))
+    return text[:MAX_DOCUMENT_CHARS]
+
+
+def job_text(job) -> str:
+    return _document(
+        job.title, job.required_skills, job.preferred_skills, job.experience_level,
+        job.description, job.requirements, job.responsibilities
+    )
+
+
+def talent_text(talent) -> str:
+    return _document(talent.title, talent.skills, talent.bio, talent.certifications)
+
+
+def resume_text(resume) -> str:
+    experience = [
+        [entry.get("title"), entry.get("company"), entry.get("description"), entry.get("achievements")]
+        for entry in (resume.experience or []) if isinstance(entry, dict)
+    ]
+    return _document(resume.summary, resume.objective, resume.skills, experience, resume.certifications, resume.projects)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    """Compact storage form: little-endian float16"""
+    return np.asarray(vector, dtype="<f2").tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<f2")
+
+
+def summarize(value: Optional[str], limit: int = 200) -> Optional[str]:
+    if not value:
+        return value
+    return value if len(value) <= limit else value[:limit].rstrip() + "…"
@@ -0,0 +1,100 @@
+"""
+Geo Distance Engine
+Vectorized great-circle distances on the WGS-84 ellipsoid using NumPy
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+# WGS-84 ellipsoid (same model geopy.geodesic uses by default)
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def distances_km(
+    origin_lat: float,
+    origin_lng: float,
+    latitudes: ArrayLike,
+    longitudes: ArrayLike
+) -> np.ndarray:
+    """
+    Distances from one origin to many destinations in a single pass
+
+    Uses Lambert's formula: a haversine central angle on reduced latitudes
+    with a first-order flattening correction. Relative error against
+    geopy.geodesic is below 2e-6 up to 10,000 km (meters over thousands of
+    kilometers) and below 1e-4 up to 19,900 km. Within about a degree of
+    the antipode, where the true geodesic bends towards a pole, it
+    overestimates by up to 0.17% (~34 km for (0, 0) -> (0, 180)); see
+    tests/test_geo_distance.py.
+
+    Args:
+        origin_lat, origin_lng: Origin coordinates in degrees
+        latitudes, longitudes: Destination coordinates in degrees
+
+    Returns:
+        Array of distances in kilometers, same length as the inputs
+    """
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lng2 = np.radians(np.asarray(longitudes, dtype=np.float64))
+    lat1 = np.radians(origin_lat)
+    lng1 = np.radians(origin_lng)
+
+    # Reduced (parametric) latitudes
+    beta1 = np.arctan((1 - WGS84_F) * np.tan(lat1))
+    beta2 = np.arctan((1 - WGS84_F) * np.tan(lat2))
+
+    # Central angle between the reduced points (haversine form)
+    sin_dbeta = np.sin((beta2 - beta1) / 2)
+    sin_dlng = np.sin((lng2 - lng1) / 2)
+    h = sin_dbeta ** 2 + np.cos(beta1) * np.cos(beta2) * sin_dlng ** 2
+    sigma = 2 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+    p = (beta1 + beta2) / 2
+    q = (beta2 - beta1) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (sigma - np.sin(sigma)) * (np.sin(p) ** 2 * np.cos(q) ** 2) / np.cos(sigma / 2) ** 2
+        y = (sigma + np.sin(sigma)) * (np.cos(p) ** 2 * np.sin(q) ** 2) / np.sin(sigma / 2) ** 2
+        correction = np.nan_to_num(x) + np.nan_to_num(y)
+
+    distances = WGS84_A_KM * (sigma - WGS84_F / 2 * correction)
+    return np.where(sigma == 0, 0.0, distances)
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance between two points in kilometers"""
+    return float(distances_km(lat1, lon1, [lat2], [lon2])[0])
+
+
+# Mean Earth radius (IUGG) for the spherical approximation below
+MEAN_EARTH_RADIUS_KM = 6371.0088
+
+
+def unit_vectors(latitudes: ArrayLike, longitudes: ArrayLike) -> np.ndarray:
+    """
+    Points as unit vectors on a sphere (n x 3), for repeated distance queries
+
+    Precompute once per point set; distances from any origin then cost one
+    dot product per point (see sphere_distances_km).
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lng = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def sphere_distances_km(origin_lat: float, origin_lng: float, vectors: np.ndarray) -> np.ndarray:
+    """
+    Spherical great-circle distances from one origin to precomputed unit vectors
+
+    Within ~0.5% of the ellipsoidal distance - meant for scoring and ranking,
+    not for distances shown to users.
+    """
+    origin = unit_vectors([origin_lat], [origin_lng])[0]
+    # Squared chord from the dot product, then chord -> central angle
+    # (arcsin of the half chord is better conditioned than arccos for short distances)
+    chord_squared = np.maximum(0.0, 2.0 - 2.0 * (vectors @ origin))
+    return MEAN_EARTH_RADIUS_KM * 2 * np.arcsin(np.clip(np.sqrt(chord_squared) / 2, 0.0, 1.0))
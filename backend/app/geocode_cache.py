@@ -0,0 +1,172 @@
+"""
+Geocode Cache
+Two-tier cache (in-memory LRU + database table) in front of the geocoding provider
+"""
+
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.cache import LRUCache
+from app.models import GeocodeCacheEntry
+
+
+class GeocodeCache:
+    """
+    Cache for forward and reverse geocoding results.
+
+    Lookups check the in-memory LRU first, then the ``geocode_cache`` table.
+    Database hits are promoted into memory. Negative results (address not
+    found) are cached with a shorter TTL and returned as ``None`` values.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory
+        self.ttl_seconds = float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+        self.negative_ttl_seconds = float(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", str(24 * 3600)))
+        self.reverse_precision = int(os.getenv("GEOCODE_REVERSE_PRECISION", "4"))
+        self.memory = LRUCache(max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000")))
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "database_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    # ==================== Keys ====================
+
+    @staticmethod
+    def address_key(address: str) -> str:
+        """Normalize an address so trivial variations share a cache entry"""
+        normalized = address.strip().lower()
+        normalized = re.sub(r"\s*,\s*", ", ", normalized)
+        normalized = re.sub(r"\s+", " ", normalized)
+        return f"forward:{normalized}"
+
+    @staticmethod
+    def storage_key(key: str) -> str:
+        """Fixed-length database key (SHA-256 hex), so long addresses always fit the column"""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def coordinates_key(self, latitude: float, longitude: float) -> str:
+        """Round coordinates so nearby reverse lookups share a cache entry"""
+        precision = self.reverse_precision
+        return f"reverse:{round(latitude, precision):.{precision}f},{round(longitude, precision):.{precision}f}"
+
+    # ==================== Lookups ====================
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        Look up a cached geocoding result in both tiers
+
+        Returns:
+            (found, result). ``result`` is None for a cached negative entry.
+        """
+        found, value = self.lookup_memory(key)
+        if found:
+            return True, value
+        return self.lookup_database(key)
+
+    def lookup_memory(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """Check only the in-memory tier (never blocks on I/O)"""
+        found, value = self.memory.lookup(key)
+        if found:
+            self._count("memory_hits")
+            if value is None:
+                self._count("negative_hits")
+        return found, value
+
+    def lookup_database(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """Check the persistent tier, promoting hits into memory (blocking)"""
+        entry = self._load(key)
+        if entry is not None:
+            result, expires_at = entry
+            remaining = (expires_at - datetime.utcnow()).total_seconds()
+            self.memory.set(key, result, ttl_seconds=remaining)
+            self._count("database_hits")
+            if result is None:
+                self._count("negative_hits")
+            return True, result
+
+        self._count("misses")
+        return False, None
+
+    def store(self, key: str, lookup_type: str, result: Optional[Dict]) -> None:
+        """Cache a result in both tiers; pass ``None`` to record a negative lookup"""
+        ttl = self.ttl_seconds if result is not None else self.negative_ttl_seconds
+        self.memory.set(key, result, ttl_seconds=ttl)
+        self._persist(key, lookup_type, result, datetime.utcnow() + timedelta(seconds=ttl))
+        self._count("stores")
+
+    # ==================== Database Tier ====================
+
+    def _load(self, key: str) -> Optional[Tuple[Optional[Dict], datetime]]:
+        if not self.session_factory:
+            return None
+        try:
+            db = self.session_factory()
+            try:
+                entry = db.query(GeocodeCacheEntry).filter(
+                    GeocodeCacheEntry.cache_key == self.storage_key(key),
+                    GeocodeCacheEntry.expires_at > datetime.utcnow()
+                ).first()
+                if not entry:
+                    return None
+                return (None if entry.is_negative else entry.result), entry.expires_at
+            finally:
+                db.close()
+        except Exception as e:
+            # The cache must never break geocoding - fall through to the provider
+            print(f"[GEOCODE_CACHE] Database lookup failed: {e}")
+            self._count("errors")
+            return None
+
+    def _persist(self, key: str, lookup_type: str, result: Optional[Dict], expires_at: datetime) -> None:
+        if not self.session_factory:
+            return
+        try:
+            db = self.session_factory()
+            try:
+                storage_key = self.storage_key(key)
+                entry = db.query(GeocodeCacheEntry).filter(GeocodeCacheEntry.cache_key == storage_key).first()
+                if not entry:
+                    entry = GeocodeCacheEntry(cache_key=storage_key, lookup_type=lookup_type)
+                    db.add(entry)
+                entry.result = result
+                entry.is_negative = result is None
+                entry.created_at = datetime.utcnow()
+                entry.expires_at = expires_at
+                db.commit()
+            except IntegrityError:
+                # Another worker stored the same key concurrently
+                db.rollback()
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"[GEOCODE_CACHE] Database store failed: {e}")
+            self._count("errors")
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters["memory_hits"] + counters["database_hits"]
+        total = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / total, 4) if total else None
+        counters["memory_entries"] = len(self.memory)
+        counters["persistent"] = self.session_factory is not None
+        return counters
@@ -0,0 +1,265 @@
+"""
+Geocode Queue
+Background pipeline that fills in coordinates for profiles and jobs after their address changes
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from app.models import BusinessProfile, Job, TalentProfile
+
+# Entity name -> model with address/city/state/country/latitude/longitude columns
+GEOCODED_MODELS = {
+    "business": BusinessProfile,
+    "talent": TalentProfile,
+    "job": Job,
+}
+
+# Fields that feed the geocoded address; a change to any of them triggers a lookup
+ADDRESS_FIELDS = ("address", "city", "state", "postal_code", "country", "location")
+
+
+def compose_address(row) -> Optional[str]:
+    """Build a geocodable address string from a row's location fields"""
+    parts = [getattr(row, field, None) for field in ("address", "city", "state", "postal_code", "country")]
+    parts = [str(part).strip() for part in parts if part and str(part).strip()]
+    if parts:
+        return ", ".join(parts)
+    location = getattr(row, "location", None)
+    return location.strip() if location and location.strip() else None
+
+
+def address_snapshot(row) -> Tuple:
+    """Address fields of a row, for detecting changes across an update"""
+    return tuple(getattr(row, field, None) for field in ADDRESS_FIELDS)
+
+
+class GeocodeQueue:
+    """
+    Asynchronous geocode-on-write queue.
+
+    Routes enqueue (entity, id, address) after committing a write. A single
+    background worker resolves addresses through MappingService (cached and
+    rate limited) and writes coordinates back in batches. Re-enqueueing a
+    row that is still pending replaces its address, so only the latest
+    address is geocoded. Rows whose address was cleared or cannot be found
+    get their coordinates cleared, so stale positions do not linger. The
+    queue lives in memory; on startup, rows that have an address but no
+    coordinates are queued again.
+    """
+
+    def __init__(
+        self,
+        mapping_service,
+        session_factory: Callable,
+        batch_size: int = 50,
+        flush_interval: float = 2.0
+    ):
+        self.mapping_service = mapping_service
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self._pending: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = OrderedDict()
+        self._buffer: List[Tuple[str, int, Optional[Dict], float]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._backfill_task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+        self._counters = {
+            "enqueued": 0,
+            "resolved": 0,
+            "not_found": 0,
+            "cleared": 0,
+            "failed": 0,
+            "written": 0,
+            "batches": 0,
+        }
+        self._last_lag_seconds: Optional[float] = None
+        self._max_lag_seconds = 0.0
+
+    # ==================== Producer ====================
+
+    def enqueue(self, entity: str, row_id: int, address: Optional[str]) -> bool:
+        """
+        Schedule a row for geocoding
+
+        An empty ``address`` schedules clearing the row's coordinates.
+        Returns False for unknown entities or rows without an id.
+        """
+        if entity not in GEOCODED_MODELS or not row_id:
+            return False
+        key = (entity, row_id)
+        self._pending.pop(key, None)
+        self._pending[key] = (address, time.monotonic())
+        self._counters["enqueued"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def enqueue_row(self, entity: str, row) -> bool:
+        """Schedule a row whose coordinates should follow its address fields"""
+        return self.enqueue(entity, row.id, compose_address(row))
+
+    # ==================== Worker ====================
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._wakeup = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        self._worker = asyncio.create_task(self._run())
+        self._backfill_task = asyncio.create_task(self._backfill())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        if self._backfill_task is not None:
+            self._backfill_task.cancel()
+            try:
+                await self._backfill_task
+            except asyncio.CancelledError:
+                pass
+            self._backfill_task = None
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await self._flush()
+
+    async def _backfill(self) -> None:
+        try:
+            rows = await asyncio.to_thread(self._unlocated_rows)
+            queued = 0
+            for entity, row_id, address in rows:
+                # A write since startup may already have queued a newer address
+                if (entity, row_id) not in self._pending:
+                    queued += self.enqueue(entity, row_id, address)
+            if queued:
+                print(f"[GEOCODE_QUEUE] Queued {queued} rows with an address but no coordinates")
+        except Exception as e:
+            print(f"[GEOCODE_QUEUE] Failed to scan for rows without coordinates: {e}")
+
+    def _unlocated_rows(self) -> List[Tuple[str, int, str]]:
+        """(entity, id, address) of rows with address fields but no coordinates (runs in a worker thread)"""
+        db = self.session_factory()
+        try:
+            rows = []
+            for entity, model in GEOCODED_MODELS.items():
+                columns = [getattr(model, field) for field in ADDRESS_FIELDS if hasattr(model, field)]
+                query = db.query(model).filter(
+                    or_(model.latitude.is_(None), model.longitude.is_(None)),
+                    or_(*[column.isnot(None) for column in columns])
+                ).order_by(model.id)
+                for row in query.yield_per(1000):
+                    address = compose_address(row)
+                    if address:
+                        rows.append((entity, row.id, address))
+            return rows
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                await self._flush()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            (entity, row_id), (address, enqueued_at) = self._pending.popitem(last=False)
+            try:
+                if not address:
+                    self._buffer.append((entity, row_id, None, enqueued_at))
+                    self._counters["cleared"] += 1
+                else:
+                    result = await self.mapping_service.geocode_address(address)
+                    self._buffer.append((entity, row_id, result, enqueued_at))
+                    self._counters["resolved"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if "Could not geocode" in str(e):
+                    # The old coordinates belong to a previous address
+                    self._buffer.append((entity, row_id, None, enqueued_at))
+                    self._counters["not_found"] += 1
+                else:
+                    self._counters["failed"] += 1
+                    print(f"[GEOCODE_QUEUE] Failed to geocode {entity} {row_id}: {e}")
+
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                await self._flush()
+
+    async def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            self._counters["failed"] += len(batch)
+            print(f"[GEOCODE_QUEUE] Failed to write {len(batch)} coordinates: {e}")
+            return
+
+        now = time.monotonic()
+        for _, _, _, enqueued_at in batch:
+            lag = now - enqueued_at
+            self._max_lag_seconds = max(self._max_lag_seconds, lag)
+        self._last_lag_seconds = now - batch[-1][3]
+        self._counters["written"] += len(batch)
+        self._counters["batches"] += 1
+
+    def _write(self, batch: List[Tuple[str, int, Optional[Dict], float]]) -> None:
+        """Write a batch of coordinates (None clears them) in one transaction (runs in a worker thread)"""
+        by_entity: Dict[str, List[Dict[str, Any]]] = {}
+        for entity, row_id, result, _ in batch:
+            by_entity.setdefault(entity, []).append({
+                "id": row_id,
+                "latitude": result["latitude"] if result else None,
+                "longitude": result["longitude"] if result else None,
+            })
+
+        db = self.session_factory()
+        try:
+            for entity, mappings in by_entity.items():
+                db.bulk_update_mappings(GEOCODED_MODELS[entity], mappings)
+            db.commit()
+
+            # Keep the nearby-search indexes in step with the new coordinates
+            for entity, index_row in (("business", self.mapping_service.index_business_profile),
+                                      ("talent", self.mapping_service.index_talent_profile)):
+                ids = [mapping["id"] for mapping in by_entity.get(entity, [])]
+                if ids:
+                    model = GEOCODED_MODELS[entity]
+                    for row in db.query(model).filter(model.id.in_(ids)).all():
+                        index_row(row)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> Dict[str, Any]:
+        oldest = next(iter(self._pending.values()), None)
+        return {
+            **self._counters,
+            "depth": len(self._pending),
+            "buffered": len(self._buffer),
+            "oldest_pending_seconds": round(time.monotonic() - oldest[1], 3) if oldest else 0.0,
+            "last_lag_seconds": round(self._last_lag_seconds, 3) if self._last_lag_seconds is not None else None,
+            "max_lag_seconds": round(self._max_lag_seconds, 3),
+            "running": self._worker is not None and not self._worker.done(),
+        }
@@ -3,12 +3,19 @@ Mapping Service
 Handles geocoding, route calculation, and location-based queries
 """
 
+import asyncio
 import os
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import numpy as np
 from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
 from sqlalchemy.orm import Session
 
+from app.async_geocoder import AsyncGeocoder
+from app.geocode_cache import GeocodeCache
+from app.geo_distance import distance_km as point_distance_km, distances_km
+from app.spatial_index import SpatialIndex
+
 class MappingService:
     """Service for mapping, geocoding, and route calculation"""
     
@@ -19,6 +26,30 @@ class MappingService:
         # Use Nominatim for geocoding (free, no API key required)
         # Mapbox is used on the frontend for map display
         self.geocoder = Nominatim(user_agent="creerlio-platform")
+        self.geocode_timeout = float(os.getenv("GEOCODE_TIMEOUT_SECONDS", "10"))
+        
+        # Blocking geopy calls run in a bounded thread pool, rate limited to
+        # Nominatim's 1 request/second policy, with identical lookups coalesced
+        self.async_geocoder = AsyncGeocoder(
+            max_workers=int(os.getenv("GEOCODE_MAX_WORKERS", "2")),
+            min_interval=float(os.getenv("GEOCODE_MIN_INTERVAL_SECONDS", "1.0"))
+        )
+        
+        # Two-tier geocode cache (memory LRU + geocode_cache table when a database is configured)
+        from app.database import SessionLocal
+        self.geocode_cache = GeocodeCache(session_factory=SessionLocal)
+        
+        # In-process spatial indexes for nearby searches
+        # Writes through the API update the indexes directly; the periodic sync
+        # picks up changes made elsewhere and the full rebuild drops deleted rows
+        cell_size = float(os.getenv("MAPPING_INDEX_CELL_DEGREES", "0.25"))
+        self.index_sync_seconds = float(os.getenv("MAPPING_INDEX_SYNC_SECONDS", "30"))
+        self.index_rebuild_seconds = float(os.getenv("MAPPING_INDEX_REBUILD_SECONDS", "600"))
+        self.index_cell_size = cell_size
+        self.business_index = SpatialIndex(cell_size)
+        self.talent_index = SpatialIndex(cell_size)
+        # One rebuild per index at a time; other requests keep using the live index
+        self._rebuild_locks = {"business_index": asyncio.Lock(), "talent_index": asyncio.Lock()}
     
     async def geocode_address(self, address: str) -> Dict:
         """
@@ -31,17 +62,12 @@ class MappingService:
             Dictionary with location data including lat, lng, formatted_address
         """
         try:
-            location = self.geocoder.geocode(address)
+            result = await self._resolve(self.geocode_cache.address_key(address), "forward", self._forward_fetch(address))
             
-            if not location:
+            if not result:
                 raise ValueError(f"Could not geocode address: {address}")
             
-            return {
-                "latitude": location.latitude,
-                "longitude": location.longitude,
-                "formatted_address": location.address,
-                "raw": location.raw if hasattr(location, 'raw') else {}
-            }
+            return dict(result)
         except Exception as e:
             raise Exception(f"Geocoding error: {str(e)}")
     
@@ -57,19 +83,116 @@ class MappingService:
             Dictionary with address information
         """
         try:
-            location = self.geocoder.reverse(f"{latitude}, {longitude}")
+            def fetch() -> Optional[Dict]:
+                location = self.geocoder.reverse(f"{latitude}, {longitude}", timeout=self.geocode_timeout)
+                if not location:
+                    return None
+                return {
+                    "formatted_address": location.address,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "raw": location.raw if hasattr(location, 'raw') else {}
+                }
             
-            if not location:
+            result = await self._resolve(self.geocode_cache.coordinates_key(latitude, longitude), "reverse", fetch)
+            
+            if not result:
                 raise ValueError(f"Could not reverse geocode coordinates: {latitude}, {longitude}")
             
+            # Cached entries are keyed on rounded coordinates - echo the caller's exact values
+            return {**result, "latitude": latitude, "longitude": longitude}
+        except Exception as e:
+            raise Exception(f"Reverse geocoding error: {str(e)}")
+    
+    def _forward_fetch(self, address: str):
+        """Build the blocking provider call for a forward lookup"""
+        def fetch() -> Optional[Dict]:
+            location = self.geocoder.geocode(address, timeout=self.geocode_timeout)
+            if not location:
+                return None
             return {
+                "latitude": location.latitude,
+                "longitude": location.longitude,
                 "formatted_address": location.address,
-                "latitude": latitude,
-                "longitude": longitude,
                 "raw": location.raw if hasattr(location, 'raw') else {}
             }
-        except Exception as e:
-            raise Exception(f"Reverse geocoding error: {str(e)}")
+        return fetch
+    
+    async def geocode_many(self, addresses: List[str]) -> AsyncIterator[Dict]:
+        """
+        Geocode many addresses, yielding results as they resolve
+        
+        Addresses are deduplicated on their cache key, so each distinct
+        address costs at most one provider call. Cached addresses are yielded
+        first; the rest are scheduled together and throttled by the geocoder
+        backend. One item is yielded per input position.
+        
+        Yields:
+            Dictionaries with index, address, status ("ok", "not_found" or
+            "error") and either data or error
+        """
+        positions: Dict[str, List[int]] = {}
+        for index, address in enumerate(addresses):
+            positions.setdefault(self.geocode_cache.address_key(address), []).append(index)
+        
+        def items_for(key: str, status: str, data: Optional[Dict] = None, error: Optional[str] = None):
+            for index in positions[key]:
+                item = {"index": index, "address": addresses[index], "status": status}
+                if data is not None:
+                    item["data"] = dict(data)
+                if error is not None:
+                    item["error"] = error
+                yield item
+        
+        pending = {}
+        try:
+            for key, indexes in positions.items():
+                found, cached = self.geocode_cache.lookup_memory(key)
+                if found:
+                    for item in items_for(key, "ok" if cached else "not_found", cached):
+                        yield item
+                    continue
+                address = addresses[indexes[0]]
+                task = asyncio.ensure_future(self._resolve(key, "forward", self._forward_fetch(address)))
+                pending[task] = key
+            
+            while pending:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        items = items_for(key, "error", error=f"Geocoding error: {str(e)}")
+                    else:
+                        items = items_for(key, "ok" if result else "not_found", result)
+                    for item in items:
+                        yield item
+        finally:
+            # Client went away or the batch failed - stop waiting on outstanding lookups
+            for task in pending:
+                task.cancel()
+    
+    async def _resolve(self, cache_key: str, lookup_type: str, fetch) -> Optional[Dict]:
+        """
+        Cache-first geocoding lookup that never blocks the event loop
+        
+        The memory tier is checked inline, the database tier in a worker
+        thread, and cache misses go through the rate-limited geocoder pool.
+        Results (including "not found" as None) are written back to the cache.
+        """
+        found, cached = self.geocode_cache.lookup_memory(cache_key)
+        if not found:
+            found, cached = await asyncio.to_thread(self.geocode_cache.lookup_database, cache_key)
+        if found:
+            return cached
+        
+        def fetch_and_store() -> Optional[Dict]:
+            result = fetch()
+            self.geocode_cache.store(cache_key, lookup_type, result)
+            return result
+        
+        return await self.async_geocoder.run(cache_key, fetch_and_store)
     
     async def calculate_route(
         self,
@@ -89,15 +212,15 @@ class MappingService:
             Dictionary with route information including distance, duration, steps
         """
         try:
-            # Calculate straight-line distance using geopy
+            # Calculate straight-line distance
             # For detailed routing, use Mapbox on the frontend
             origin_coords = await self.geocode_address(origin)
             dest_coords = await self.geocode_address(destination)
             
-            origin_point = (origin_coords['latitude'], origin_coords['longitude'])
-            dest_point = (dest_coords['latitude'], dest_coords['longitude'])
-            
-            distance_km = geodesic(origin_point, dest_point).kilometers
+            distance_km = point_distance_km(
+                origin_coords['latitude'], origin_coords['longitude'],
+                dest_coords['latitude'], dest_coords['longitude']
+            )
             
             return {
                 "distance": {
@@ -142,33 +265,10 @@ class MappingService:
         try:
             from app.models import BusinessProfile
             
-            # Get all businesses with coordinates
-            businesses = db.query(BusinessProfile).filter(
-                BusinessProfile.latitude.isnot(None),
-                BusinessProfile.longitude.isnot(None),
-                BusinessProfile.is_active == True
-            ).all()
+            await self._sync_index(db, BusinessProfile, "business_index", self._business_payload)
             
-            center_point = (latitude, longitude)
-            nearby_businesses = []
-            
-            for business in businesses:
-                if business.latitude and business.longitude:
-                    business_point = (business.latitude, business.longitude)
-                    distance_km = geodesic(center_point, business_point).kilometers
-                    
-                    if distance_km <= radius_km:
-                        business_dict = {
-                            "id": business.id,
-                            "name": business.name,
-                            "description": business.description,
-                            "address": business.address,
-                            "location": business.location,
-                            "latitude": business.latitude,
-                            "longitude": business.longitude,
-                            "distance_km": round(distance_km, 2)
-                        }
-                        nearby_businesses.append(business_dict)
+            candidates = self.business_index.query_radius(latitude, longitude, radius_km)
+            nearby_businesses = self._within_radius(latitude, longitude, radius_km, candidates)
             
             # Sort by distance
             nearby_businesses.sort(key=lambda x: x['distance_km'])
@@ -203,33 +303,10 @@ class MappingService:
         try:
             from app.models import TalentProfile
             
-            # Get all talent with coordinates
-            talents = db.query(TalentProfile).filter(
-                TalentProfile.latitude.isnot(None),
-                TalentProfile.longitude.isnot(None),
-                TalentProfile.is_active == True
-            ).all()
-            
-            center_point = (latitude, longitude)
-            nearby_talents = []
+            await self._sync_index(db, TalentProfile, "talent_index", self._talent_payload)
             
-            for talent in talents:
-                if talent.latitude and talent.longitude:
-                    talent_point = (talent.latitude, talent.longitude)
-                    distance_km = geodesic(center_point, talent_point).kilometers
-                    
-                    if distance_km <= radius_km:
-                        talent_dict = {
-                            "id": talent.id,
-                            "name": talent.name,
-                            "title": talent.title,
-                            "skills": talent.skills,
-                            "location": talent.location,
-                            "latitude": talent.latitude,
-                            "longitude": talent.longitude,
-                            "distance_km": round(distance_km, 2)
-                        }
-                        nearby_talents.append(talent_dict)
+            candidates = self.talent_index.query_radius(latitude, longitude, radius_km)
+            nearby_talents = self._within_radius(latitude, longitude, radius_km, candidates)
             
             # Sort by distance
             nearby_talents.sort(key=lambda x: x['distance_km'])
@@ -256,9 +333,130 @@ class MappingService:
         Returns:
             Distance in kilometers
         """
-        point1 = (lat1, lon1)
-        point2 = (lat2, lon2)
-        return geodesic(point1, point2).kilometers
-
-
-
+        return point_distance_km(lat1, lon1, lat2, lon2)
+    
+    @staticmethod
+    def _within_radius(latitude: float, longitude: float, radius_km: float, candidates: List) -> List[Dict]:
+        """Compute exact distances for index candidates in one batch and keep those inside the radius"""
+        if not candidates:
+            return []
+        
+        latitudes = np.fromiter((c[1] for c in candidates), dtype=np.float64, count=len(candidates))
+        longitudes = np.fromiter((c[2] for c in candidates), dtype=np.float64, count=len(candidates))
+        distances = distances_km(latitude, longitude, latitudes, longitudes)
+        
+        results = []
+        for i in np.flatnonzero(distances <= radius_km):
+            item = dict(candidates[i][3])
+            item["distance_km"] = round(float(distances[i]), 2)
+            results.append(item)
+        return results
+    
+    # ==================== Spatial Index Maintenance ====================
+    
+    @staticmethod
+    def _business_payload(business) -> Dict:
+        return {
+            "id": business.id,
+            "name": business.name,
+            "description": business.description,
+            "address": business.address,
+            "location": business.location,
+            "latitude": business.latitude,
+            "longitude": business.longitude
+        }
+    
+    @staticmethod
+    def _talent_payload(talent) -> Dict:
+        return {
+            "id": talent.id,
+            "name": talent.name,
+            "title": talent.title,
+            "skills": talent.skills,
+            "location": talent.location,
+            "latitude": talent.latitude,
+            "longitude": talent.longitude
+        }
+    
+    @staticmethod
+    def _apply_to_index(index: SpatialIndex, row, payload_builder) -> None:
+        """Upsert an active row with coordinates, otherwise drop it from the index"""
+        if row.is_active and row.latitude is not None and row.longitude is not None:
+            index.upsert(row.id, row.latitude, row.longitude, payload_builder(row))
+        else:
+            index.remove(row.id)
+    
+    def index_business_profile(self, business) -> None:
+        """Refresh a single business in the spatial index after a write"""
+        self._apply_to_index(self.business_index, business, self._business_payload)
+    
+    def index_talent_profile(self, talent) -> None:
+        """Refresh a single talent profile in the spatial index after a write"""
+        self._apply_to_index(self.talent_index, talent, self._talent_payload)
+    
+    async def _sync_index(self, db: Session, model, index_name: str, payload_builder) -> None:
+        """
+        Bring a spatial index up to date with the database
+        
+        The first call (and every MAPPING_INDEX_REBUILD_SECONDS) loads all
+        active rows with coordinates into a new index in a worker thread and
+        then swaps it in, so queries keep seeing the previous index while it
+        is built. In between, at most once every MAPPING_INDEX_SYNC_SECONDS,
+        only rows updated since the last sync are read.
+        """
+        index = getattr(self, index_name)
+        now = time.monotonic()
+        needs_rebuild = (
+            index.last_rebuilt_at is None
+            or now - index.last_rebuilt_at >= self.index_rebuild_seconds
+        )
+        
+        if needs_rebuild:
+            lock = self._rebuild_locks[index_name]
+            if lock.locked() and index.last_rebuilt_at is not None:
+                # Another request is rebuilding - answer from the current index
+                return
+            async with lock:
+                if getattr(self, index_name).last_rebuilt_at != index.last_rebuilt_at:
+                    return
+                rebuilt = await asyncio.to_thread(self._build_index, db, model, payload_builder)
+                setattr(self, index_name, rebuilt)
+            return
+        
+        if index.last_checked_at is not None and now - index.last_checked_at < self.index_sync_seconds:
+            return
+        
+        def changed_rows():
+            query = db.query(model)
+            if index.last_synced_at is not None:
+                # >= so rows sharing the watermark timestamp are never missed
+                query = query.filter(model.updated_at >= index.last_synced_at)
+            return query.all()
+        
+        rows = await asyncio.to_thread(changed_rows)
+        for row in rows:
+            self._apply_to_index(index, row, payload_builder)
+        self._advance_watermark(index, rows)
+        index.last_checked_at = now
+    
+    def _build_index(self, db: Session, model, payload_builder) -> SpatialIndex:
+        """A fully loaded index of the active rows with coordinates (runs in a worker thread)"""
+        started = time.monotonic()
+        rows = db.query(model).filter(
+            model.latitude.isnot(None),
+            model.longitude.isnot(None),
+            model.is_active == True
+        ).all()
+        index = SpatialIndex(self.index_cell_size)
+        for row in rows:
+            self._apply_to_index(index, row, payload_builder)
+        self._advance_watermark(index, rows)
+        index.last_rebuilt_at = started
+        index.last_checked_at = started
+        return index
+    
+    @staticmethod
+    def _advance_watermark(index: SpatialIndex, rows) -> None:
+        for row in rows:
+            if row.updated_at and (index.last_synced_at is None or row.updated_at > index.last_synced_at):
+                index.last_synced_at = row.updated_at
@@ -0,0 +1,348 @@
+"""
+Matching Engine
+Vectorized job <-> talent scoring over precomputed NumPy feature tables
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from app.geo_distance import sphere_distances_km, unit_vectors
+from app.models import Job, TalentProfile
+from app.skill_index import skill_names
+
+# Minimum years of experience implied by Job.experience_level
+EXPERIENCE_LEVEL_YEARS = {
+    "entry": 0.0,
+    "junior": 1.0,
+    "mid": 3.0,
+    "senior": 6.0,
+    "lead": 8.0,
+    "executive": 10.0,
+}
+
+# Component score used when one side lacks the data (e.g. no coordinates)
+NEUTRAL_SCORE = 0.5
+
+
+class _SkillColumn:
+    """
+    Skill sets of every row, stored by skill (CSC-style).
+
+    ``rows[offsets[t]:offsets[t + 1]]`` are the rows holding skill token ``t``,
+    so counting how many of a query's skills each row has only touches the
+    postings of those skills, not every (row, skill) pair.
+    """
+
+    def __init__(self, tokens: np.ndarray, rows: np.ndarray, size: int):
+        order = np.argsort(tokens, kind="stable")
+        vocabulary_size = int(tokens.max()) + 1 if len(tokens) else 0
+        self.rows = rows[order]
+        self.offsets = np.searchsorted(tokens[order], np.arange(vocabulary_size + 1))
+        self.counts = np.bincount(rows, minlength=size).astype(np.float64)
+        self.size = size
+
+    def hits(self, token_ids: List[int]) -> np.ndarray:
+        """Per-row number of skills from ``token_ids`` the row has"""
+        parts = [
+            self.rows[self.offsets[token]:self.offsets[token + 1]]
+            for token in token_ids if token + 1 < len(self.offsets)
+        ]
+        if not parts:
+            return np.zeros(self.size)
+        return np.bincount(np.concatenate(parts), minlength=self.size).astype(np.float64)
+
+
+class _FeatureTable:
+    """Immutable columnar feature snapshot for one side (talent or jobs)"""
+
+    def __init__(self, ids, latitudes, longitudes, years, skills, preferred=None, remote=None, payloads=None):
+        self.ids = ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        # Rows with coordinates and their unit vectors, for one-dot-product distances
+        self.located = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        self.vectors = unit_vectors(latitudes[self.located], longitudes[self.located])
+        self.years = years
+        self.skills: _SkillColumn = skills
+        self.preferred: Optional[_SkillColumn] = preferred
+        self.remote = remote
+        self.payloads = payloads or []
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class MatchingEngine:
+    """
+    Scores jobs against talent (and back) on skill overlap, experience and distance.
+
+    Both sides are loaded into columnar NumPy tables which are rebuilt after
+    writes (at most every MATCHING_MIN_REBUILD_SECONDS) and at least every
+    MATCHING_MAX_AGE_SECONDS. Scoring one job against every talent profile
+    is a handful of vectorized passes; the top K come from argpartition.
+    """
+
+    def __init__(self):
+        self.weight_skills = float(os.getenv("MATCH_WEIGHT_SKILLS", "0.6"))
+        self.weight_experience = float(os.getenv("MATCH_WEIGHT_EXPERIENCE", "0.2"))
+        self.weight_distance = float(os.getenv("MATCH_WEIGHT_DISTANCE", "0.2"))
+        # Distance at which the distance score halves
+        self.distance_half_km = float(os.getenv("MATCH_DISTANCE_HALF_KM", "25"))
+        # Share of the skill score from required (vs preferred) skills
+        self.required_share = 0.75
+        self.min_rebuild_seconds = float(os.getenv("MATCHING_MIN_REBUILD_SECONDS", "30"))
+        self.max_age_seconds = float(os.getenv("MATCHING_MAX_AGE_SECONDS", "600"))
+
+        self._vocabulary: Dict[str, int] = {}
+        self._vocabulary_lock = threading.Lock()
+        self._tables: Dict[str, Optional[_FeatureTable]] = {"talent": None, "job": None}
+        self._stale = {"talent": True, "job": True}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    # ==================== Features ====================
+
+    def _token_ids(self, skills: Any, grow: bool = True) -> List[int]:
+        """Vocabulary IDs of a skills list; unknown skills are added only when ``grow``"""
+        ids = []
+        for name in dict.fromkeys(skill_names(skills)):
+            token = self._vocabulary.get(name)
+            if token is None and grow:
+                # Tables for both sides may be built concurrently in worker threads
+                with self._vocabulary_lock:
+                    token = self._vocabulary.setdefault(name, len(self._vocabulary))
+            if token is not None:
+                ids.append(token)
+        return ids
+
+    @staticmethod
+    def _skill_column(skill_lists: Sequence[List[int]]) -> _SkillColumn:
+        lengths = np.fromiter((len(tokens) for tokens in skill_lists), dtype=np.int64, count=len(skill_lists))
+        rows = np.repeat(np.arange(len(skill_lists), dtype=np.int64), lengths)
+        tokens = np.fromiter((token for tokens in skill_lists for token in tokens), dtype=np.int64, count=int(lengths.sum()))
+        return _SkillColumn(tokens, rows, len(skill_lists))
+
+    @staticmethod
+    def _float_column(values: Sequence[Optional[float]]) -> np.ndarray:
+        return np.array([np.nan if value is None else float(value) for value in values], dtype=np.float64)
+
+    @staticmethod
+    def required_years(experience_level: Optional[str]) -> Optional[float]:
+        if not experience_level:
+            return None
+        return EXPERIENCE_LEVEL_YEARS.get(experience_level.strip().lower())
+
+    def _build_talent(self, rows) -> _FeatureTable:
+        return _FeatureTable(
+            ids=np.array([row.id for row in rows], dtype=np.int64),
+            latitudes=self._float_column([row.latitude for row in rows]),
+            longitudes=self._float_column([row.longitude for row in rows]),
+            years=self._float_column([row.experience_years for row in rows]),
+            skills=self._skill_column([self._token_ids(row.skills) for row in rows]),
+            payloads=[{"name": row.name, "title": row.title, "location": row.location} for row in rows],
+        )
+
+    def _build_jobs(self, rows) -> _FeatureTable:
+        return _FeatureTable(
+            ids=np.array([row.id for row in rows], dtype=np.int64),
+            latitudes=self._float_column([row.latitude for row in rows]),
+            longitudes=self._float_column([row.longitude for row in rows]),
+            years=self._float_column([self.required_years(row.experience_level) for row in rows]),
+            skills=self._skill_column([self._token_ids(row.required_skills) for row in rows]),
+            preferred=self._skill_column([self._token_ids(row.preferred_skills) for row in rows]),
+            remote=np.array([bool(row.remote_allowed) for row in rows], dtype=bool),
+            payloads=[
+                {"title": row.title, "location": row.location or row.city, "business_profile_id": row.business_profile_id}
+                for row in rows
+            ],
+        )
+
+    # ==================== Refresh ====================
+
+    def invalidate(self, side: str) -> None:
+        """Mark a side's table as out of date after a write"""
+        self._stale[side] = True
+
+    def _needs_refresh(self, side: str) -> bool:
+        table = self._tables[side]
+        if table is None:
+            return True
+        age = time.monotonic() - table.built_at
+        return age >= self.max_age_seconds or (self._stale[side] and age >= self.min_rebuild_seconds)
+
+    async def _table(self, db, side: str) -> _FeatureTable:
+        """Feature table for a side, rebuilding it from the database when due (AsyncSession)"""
+        if not self._needs_refresh(side):
+            return self._tables[side]
+        lock = self._locks.setdefault(side, asyncio.Lock())
+        async with lock:
+            if not self._needs_refresh(side):
+                return self._tables[side]
+            self._stale[side] = False
+            if side == "talent":
+                query = select(
+                    TalentProfile.id, TalentProfile.name, TalentProfile.title, TalentProfile.location,
+                    TalentProfile.skills, TalentProfile.experience_years,
+                    TalentProfile.latitude, TalentProfile.longitude
+                ).where(TalentProfile.is_active == True).order_by(TalentProfile.id)
+                rows = (await db.execute(query)).all()
+                table = await asyncio.to_thread(self._build_talent, rows)
+            else:
+                query = select(
+                    Job.id, Job.title, Job.location, Job.city, Job.business_profile_id,
+                    Job.required_skills, Job.preferred_skills, Job.experience_level,
+                    Job.remote_allowed, Job.latitude, Job.longitude
+                ).where(Job.is_active == True, Job.status == "published").order_by(Job.id)
+                rows = (await db.execute(query)).all()
+                table = await asyncio.to_thread(self._build_jobs, rows)
+            self._tables[side] = table
+            return table
+
+    # ==================== Scoring ====================
+
+    def _distance_scores(self, latitude, longitude, table: _FeatureTable) -> np.ndarray:
+        scores = np.full(len(table), NEUTRAL_SCORE, dtype=np.float64)
+        if latitude is None or longitude is None or not len(table.vectors):
+            return scores
+        # Spherical distances are plenty for a score (within ~0.5% of ellipsoidal)
+        distances = sphere_distances_km(latitude, longitude, table.vectors)
+        scores[table.located] = np.exp2(-distances / self.distance_half_km)
+        return scores
+
+    def _combine(self, skills, experience, distance) -> np.ndarray:
+        total_weight = self.weight_skills + self.weight_experience + self.weight_distance
+        return (
+            self.weight_skills * skills
+            + self.weight_experience * experience
+            + self.weight_distance * distance
+        ) / total_weight
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, limit: int, min_score: float) -> np.ndarray:
+        if not len(scores):
+            return np.array([], dtype=np.int64)
+        limit = min(max(1, limit), len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top[scores[top] >= min_score]
+
+    def score_talent_for_job(self, job, talent: _FeatureTable) -> Dict[str, np.ndarray]:
+        """Component and total scores of every talent row for one job"""
+        size = len(talent)
+        required = self._token_ids(job.required_skills, grow=False)
+        preferred = self._token_ids(job.preferred_skills, grow=False)
+        # Skills unknown to the vocabulary can still never match, but count towards the denominator;
+        # repeated names count once, as they do in _token_ids
+        required_total = len(set(skill_names(job.required_skills)))
+        preferred_total = len(set(skill_names(job.preferred_skills)))
+
+        required_score = talent.skills.hits(required) / required_total if required_total else None
+        preferred_score = talent.skills.hits(preferred) / preferred_total if preferred_total else None
+        skills = self._blend_skills(required_score, preferred_score, size)
+
+        required_years = self.required_years(job.experience_level)
+        if required_years:
+            experience = np.where(np.isnan(talent.years), NEUTRAL_SCORE, np.clip(talent.years / required_years, 0.0, 1.0))
+        else:
+            experience = np.ones(size)
+
+        if job.remote_allowed:
+            distance = np.ones(size)
+        else:
+            distance = self._distance_scores(job.latitude, job.longitude, talent)
+        return {"skills": skills, "experience": experience, "distance": distance,
+                "total": self._combine(skills, experience, distance)}
+
+    def score_jobs_for_talent(self, talent, jobs: _FeatureTable) -> Dict[str, np.ndarray]:
+        """Component and total scores of every job row for one talent profile"""
+        size = len(jobs)
+        token_ids = self._token_ids(talent.skills, grow=False)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            required_score = np.where(jobs.skills.counts > 0, jobs.skills.hits(token_ids) / jobs.skills.counts, np.nan)
+            preferred_score = np.where(
+                jobs.preferred.counts > 0, jobs.preferred.hits(token_ids) / jobs.preferred.counts, np.nan
+            )
+        skills = self._blend_skills(required_score, preferred_score, size)
+
+        if talent.experience_years is None:
+            experience = np.where(np.isnan(jobs.years) | (jobs.years == 0), 1.0, NEUTRAL_SCORE)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                experience = np.where(
+                    np.isnan(jobs.years) | (jobs.years == 0), 1.0,
+                    np.clip(float(talent.experience_years) / jobs.years, 0.0, 1.0)
+                )
+
+        distance = self._distance_scores(talent.latitude, talent.longitude, jobs)
+        distance = np.where(jobs.remote, 1.0, distance)
+        return {"skills": skills, "experience": experience, "distance": distance,
+                "total": self._combine(skills, experience, distance)}
+
+    def _blend_skills(self, required, preferred, size: int) -> np.ndarray:
+        """
+        Mix required and preferred coverage; either may be None (no such skills on the job)
+        or contain NaN per row, in which case the other one carries the full weight
+        """
+        if required is None and preferred is None:
+            return np.full(size, NEUTRAL_SCORE)
+        if required is None:
+            required = np.full(size, np.nan)
+        if preferred is None:
+            preferred = np.full(size, np.nan)
+        blended = self.required_share * required + (1 - self.required_share) * preferred
+        blended = np.where(np.isnan(preferred), required, blended)
+        blended = np.where(np.isnan(required), preferred, blended)
+        return np.where(np.isnan(blended), NEUTRAL_SCORE, blended)
+
+    # ==================== Queries ====================
+
+    @staticmethod
+    def _results(table: _FeatureTable, scores: Dict[str, np.ndarray], top: np.ndarray, id_field: str) -> List[Dict]:
+        results = []
+        for row in top:
+            results.append({
+                id_field: int(table.ids[row]),
+                **table.payloads[row],
+                "score": round(float(scores["total"][row]), 4),
+                "components": {name: round(float(scores[name][row]), 4) for name in ("skills", "experience", "distance")},
+            })
+        return results
+
+    async def match_talent(self, db, job, limit: int = 20, min_score: float = 0.0) -> Dict[str, Any]:
+        """Top talent profiles for a job row"""
+        talent = await self._table(db, "talent")
+        started = time.perf_counter()
+        scores = self.score_talent_for_job(job, talent)
+        top = self._top_k(scores["total"], limit, min_score)
+        return {
+            "matches": self._results(talent, scores, top, "talent_profile_id"),
+            "candidates": len(talent),
+            "scoring_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    async def recommend_jobs(self, db, talent, limit: int = 20, min_score: float = 0.0) -> Dict[str, Any]:
+        """Top published jobs for a talent profile row"""
+        jobs = await self._table(db, "job")
+        started = time.perf_counter()
+        scores = self.score_jobs_for_talent(talent, jobs)
+        top = self._top_k(scores["total"], limit, min_score)
+        return {
+            "jobs": self._results(jobs, scores, top, "job_id"),
+            "candidates": len(jobs),
+            "scoring_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "vocabulary": len(self._vocabulary),
+            **{
+                f"{side}_rows": len(table) if table is not None else None
+                for side, table in self._tables.items()
+            },
+        }
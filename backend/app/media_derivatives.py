@@ -0,0 +1,403 @@
+"""
+Media Derivatives
+Background generation of thumbnails, resized variants and video poster frames for Talent Bank media
+"""
+
+import asyncio
+import io
+import os
+import posixpath
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import or_
+
+from app.models import TalentBankItem
+
+# Optional Pillow for image processing
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    ImageOps = None
+    PIL_AVAILABLE = False
+
+# Variant name -> longest side in pixels (variants never upscale)
+DERIVATIVE_SIZES: Dict[str, int] = {"thumbnail": 320, "medium": 1280}
+# Videos store the medium-size variant as "poster"
+VARIANT_NAMES = tuple(DERIVATIVE_SIZES) + ("poster",)
+MEDIA_TYPES = ("image", "video")
+# ffmpeg reads videos through a signed URL valid this long (two attempts of up to 60 s each)
+POSTER_URL_SECONDS = 300
+
+
+def media_kind(item_type: Optional[str], file_type: Optional[str]) -> Optional[str]:
+    """
+    "image" or "video" for media items, else None
+
+    Backend uploads set item_type to the media type; dashboard uploads set it
+    to the category (document, education, ...) and only the MIME type says
+    whether the file is media.
+    """
+    if item_type in MEDIA_TYPES:
+        return item_type
+    major = (file_type or "").split("/", 1)[0].lower()
+    return major if major in MEDIA_TYPES else None
+
+
+def derivative_directory(item_id: int, file_path: str) -> str:
+    """<user_id>/derivatives/<item_id>, next to the original"""
+    return posixpath.join(posixpath.dirname(file_path), "derivatives", str(item_id))
+
+
+def derivative_paths(
+    item_id: int,
+    item_type: Optional[str],
+    file_type: Optional[str],
+    file_path: Optional[str],
+    metadata: Optional[Dict]
+) -> List[str]:
+    """
+    Storage paths of every derivative an item may have
+
+    Includes the paths recorded in its metadata and, for media items, every
+    variant the pipeline could have written (a job may have been uploading
+    when the item was deleted). Remove these together with the original.
+    """
+    paths = {
+        entry["path"] for entry in ((metadata or {}).get("derivatives") or {}).values()
+        if isinstance(entry, dict) and entry.get("path")
+    }
+    if file_path and media_kind(item_type, file_type):
+        directory = derivative_directory(item_id, file_path)
+        paths.update(f"{directory}/{name}.webp" for name in VARIANT_NAMES)
+    return sorted(paths)
+
+
+def render_variants(source: Any, sizes: Dict[str, int], quality: int = 80) -> Dict[str, Tuple[bytes, int, int]]:
+    """
+    WebP variants of an image file or bytes, largest first
+
+    Returns:
+        variant name -> (data, width, height)
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        # JPEG can decode at a reduced scale, which is much faster for large photos
+        image.draft("RGB", (max(sizes.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+        variants: Dict[str, Tuple[bytes, int, int]] = {}
+        current = image
+        for name, size in sorted(sizes.items(), key=lambda entry: -entry[1]):
+            # Each smaller variant is resized from the previous one, not the original
+            current = current.copy()
+            current.thumbnail((size, size), Image.LANCZOS)
+            output = io.BytesIO()
+            current.save(output, format="WEBP", quality=quality, method=4)
+            variants[name] = (output.getvalue(), current.width, current.height)
+        return variants
+
+
+class MediaDerivativeService:
+    """
+    Generates preview images for uploaded Talent Bank media.
+
+    Routes enqueue item ids after the upload is committed, and a scan every
+    ``scan_seconds`` queues media rows inserted elsewhere (the dashboard
+    uploads to storage and inserts talent_bank_items directly). Worker tasks
+    then, per item:
+    - images: download the original from storage and render WebP variants
+      (``DERIVATIVE_SIZES``) with Pillow in a thread;
+    - videos: have ffmpeg grab a poster frame straight from a short-lived
+      signed URL (HTTP range requests, so the video is not downloaded, and
+      the API key never appears in ffmpeg's command line) and render the
+      variants from that frame.
+    Variants are uploaded next to the original under ``derivatives/`` and
+    recorded in ``extra_metadata["derivatives"]`` with their URL, size and
+    dimensions; ``derivatives_status`` is pending, ready or failed. Deleting
+    an item must also delete ``derivative_paths``; variants finished after
+    their item was deleted are removed here. The first scan covers every
+    item, so media still pending (or predating the pipeline) is queued
+    again on startup; later scans only read rows with a higher id than
+    any seen before.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        uploader,
+        bucket: str = "talent-bank",
+        workers: int = 2,
+        max_source_bytes: int = 50 * 1024 * 1024,
+        poster_second: float = 1.0,
+        ffmpeg_path: Optional[str] = None,
+        scan_seconds: float = 60.0
+    ):
+        self.session_factory = session_factory
+        self.uploader = uploader
+        self.bucket = bucket
+        self.workers = max(1, workers)
+        self.max_source_bytes = max_source_bytes
+        self.poster_second = poster_second
+        self.ffmpeg_path = ffmpeg_path or shutil.which("ffmpeg")
+        self.scan_seconds = scan_seconds
+
+        self._pending: "OrderedDict[int, float]" = OrderedDict()
+        self._active: Set[int] = set()
+        self._scanned_through = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._counters = {"enqueued": 0, "processed": 0, "variants": 0, "failed": 0, "skipped": 0, "orphans_removed": 0, "scans": 0}
+
+    @classmethod
+    def from_env(cls, session_factory: Callable, uploader) -> "MediaDerivativeService":
+        return cls(
+            session_factory,
+            uploader,
+            workers=int(os.getenv("MEDIA_DERIVATIVE_WORKERS", "2")),
+            max_source_bytes=int(os.getenv("MEDIA_DERIVATIVE_MAX_SOURCE_BYTES", str(50 * 1024 * 1024))),
+            poster_second=float(os.getenv("MEDIA_POSTER_SECOND", "1")),
+            ffmpeg_path=os.getenv("FFMPEG_PATH") or None,
+            scan_seconds=float(os.getenv("MEDIA_DERIVATIVE_SCAN_SECONDS", "60"))
+        )
+
+    def supports(self, item_type: Optional[str], file_type: Optional[str] = None) -> bool:
+        """Whether derivatives can be made for this item (videos need ffmpeg)"""
+        kind = media_kind(item_type, file_type)
+        return kind == "image" or (kind == "video" and bool(self.ffmpeg_path))
+
+    # ==================== Producer ====================
+
+    def enqueue(self, item_id: Optional[int]) -> bool:
+        if not item_id:
+            return False
+        self._pending.pop(item_id, None)
+        self._pending[item_id] = time.monotonic()
+        self._counters["enqueued"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    # ==================== Worker ====================
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._backfill())]
+        self._tasks += [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _backfill(self) -> None:
+        """Queue media items without derivatives: all of them once, then newly inserted rows"""
+        while True:
+            try:
+                ids, self._scanned_through = await asyncio.to_thread(self._unprocessed_ids, self._scanned_through)
+                self._counters["scans"] += 1
+                queued = [item_id for item_id in ids if item_id not in self._pending and item_id not in self._active]
+                for item_id in queued:
+                    self.enqueue(item_id)
+                if queued:
+                    print(f"[MEDIA] Queued {len(queued)} media items without derivatives")
+            except Exception as e:
+                print(f"[MEDIA] Failed to scan for media without derivatives: {e}")
+            await asyncio.sleep(self.scan_seconds)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            item_id, _ = self._pending.popitem(last=False)
+            self._active.add(item_id)
+            try:
+                await self._process(item_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._counters["failed"] += 1
+                print(f"[MEDIA] Failed to create derivatives for item {item_id}: {e}")
+                try:
+                    await asyncio.to_thread(self._record, item_id, None, str(e))
+                except Exception as record_error:
+                    print(f"[MEDIA] Failed to record derivative failure for item {item_id}: {record_error}")
+            finally:
+                self._active.discard(item_id)
+
+    async def _process(self, item_id: int) -> None:
+        item = await asyncio.to_thread(self._load, item_id)
+        if item is None or not item["file_path"] or not self.supports(item["kind"]):
+            self._counters["skipped"] += 1
+            return
+
+        if item["kind"] == "image":
+            variants = await self._image_variants(item["file_path"])
+        else:
+            variants = await self._video_variants(item["file_path"])
+
+        # <user_id>/derivatives/<item_id>/<variant>.webp - overwritten if regenerated
+        directory = derivative_directory(item_id, item["file_path"])
+        derivatives: Dict[str, Dict[str, Any]] = {}
+        for name, (data, width, height) in variants.items():
+            path = f"{directory}/{name}.webp"
+            await self.uploader.upload_bytes(self.bucket, path, data, "image/webp", upsert=True)
+            derivatives[name] = {
+                "path": path,
+                "url": self.uploader.public_url(self.bucket, path),
+                "width": width,
+                "height": height,
+                "size": len(data),
+                "content_type": "image/webp",
+            }
+        if not await asyncio.to_thread(self._record, item_id, derivatives, None):
+            # The item was deleted while its variants were being made
+            paths = [entry["path"] for entry in derivatives.values()]
+            self._counters["orphans_removed"] += await self.uploader.remove(self.bucket, paths)
+            return
+        self._counters["processed"] += 1
+        self._counters["variants"] += len(derivatives)
+
+    async def _image_variants(self, file_path: str) -> Dict[str, Tuple[bytes, int, int]]:
+        # Small originals stay in memory; larger ones spill to a temp file
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as original:
+            await self.uploader.download(self.bucket, file_path, original, self.max_source_bytes)
+            return await asyncio.to_thread(render_variants, original, DERIVATIVE_SIZES)
+
+    async def _video_variants(self, file_path: str) -> Dict[str, Tuple[bytes, int, int]]:
+        sizes = dict(DERIVATIVE_SIZES)
+        sizes["poster"] = sizes.pop("medium")
+        source_url = await self.uploader.signed_url(self.bucket, file_path, POSTER_URL_SECONDS)
+        frame = await self._poster_frame(source_url, self.poster_second)
+        if not frame and self.poster_second:
+            # Clips shorter than the seek point produce no frame
+            frame = await self._poster_frame(source_url, 0)
+        if not frame:
+            raise RuntimeError("ffmpeg could not extract a poster frame")
+        return await asyncio.to_thread(render_variants, frame, sizes)
+
+    async def _poster_frame(self, source_url: str, second: float) -> bytes:
+        """One PNG frame at ``second``, read by ffmpeg directly from a signed storage URL"""
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path, "-nostdin", "-v", "error",
+            "-ss", f"{second:.3f}",
+            "-i", source_url,
+            "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='ignore').strip()[:300]}")
+        return stdout
+
+    # ==================== Database (worker threads) ====================
+
+    def _load(self, item_id: int) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            item = db.get(TalentBankItem, item_id)
+            if item is None or not item.is_active:
+                return None
+            return {"kind": media_kind(item.item_type, item.file_type), "file_path": item.file_path}
+        finally:
+            db.close()
+
+    def _record(self, item_id: int, derivatives: Optional[Dict[str, Any]], error: Optional[str]) -> bool:
+        """Store the outcome on the item; False if the item no longer exists"""
+        db = self.session_factory()
+        try:
+            item = db.get(TalentBankItem, item_id)
+            if item is None or not item.is_active:
+                return False
+            # Assign a new dict: in-place changes to a JSON column are not detected
+            metadata = dict(item.extra_metadata or {})
+            if derivatives is not None:
+                metadata["derivatives"] = derivatives
+                metadata["derivatives_status"] = "ready"
+                metadata.pop("derivatives_error", None)
+            else:
+                metadata["derivatives_status"] = "failed"
+                metadata["derivatives_error"] = error
+            metadata["derivatives_updated_at"] = datetime.utcnow().isoformat()
+            item.extra_metadata = metadata
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _unprocessed_ids(self, after_id: int = 0) -> Tuple[List[int], int]:
+        """
+        Active media items with an id above ``after_id`` whose derivatives are
+        pending or were never generated
+
+        Returns:
+            (item ids, highest id scanned - the next scan's ``after_id``)
+        """
+        db = self.session_factory()
+        try:
+            rows = db.query(
+                TalentBankItem.id, TalentBankItem.item_type, TalentBankItem.file_type, TalentBankItem.extra_metadata
+            ).filter(
+                TalentBankItem.id > after_id,
+                TalentBankItem.is_active == True,  # noqa: E712
+                TalentBankItem.file_path.isnot(None),
+                or_(
+                    TalentBankItem.item_type.in_(MEDIA_TYPES),
+                    TalentBankItem.file_type.like("image/%"),
+                    TalentBankItem.file_type.like("video/%")
+                )
+            ).order_by(TalentBankItem.id)
+            ids = []
+            last_id = after_id
+            for item_id, item_type, file_type, metadata in rows.yield_per(1000):
+                last_id = item_id
+                if self.supports(item_type, file_type) and (metadata or {}).get("derivatives_status") not in ("ready", "failed"):
+                    ids.append(item_id)
+            return ids, last_id
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "depth": len(self._pending),
+            "workers": len(self._tasks) - 1 if self._tasks else 0,
+            "video_posters": bool(self.ffmpeg_path),
+        }
+
+
+def preview_urls(metadata: Optional[Dict]) -> Dict[str, Optional[str]]:
+    """Thumbnail and preview (medium image or video poster) URLs recorded for an item"""
+    derivatives = (metadata or {}).get("derivatives") or {}
+    preview = derivatives.get("medium") or derivatives.get("poster") or {}
+    return {
+        "thumbnail_url": (derivatives.get("thumbnail") or {}).get("url"),
+        "preview_url": preview.get("url"),
+    }
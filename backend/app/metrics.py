@@ -0,0 +1,72 @@
+"""
+Metrics Helpers
+Lightweight in-process latency histograms for operational endpoints
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, Optional
+
+# Upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed durations (seconds).
+
+    Percentiles are estimated as the upper bound of the bucket containing
+    the requested rank, which is precise enough for sizing decisions.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def _percentile(self, counts, total: int, quantile: float) -> Optional[float]:
+        if not total:
+            return None
+        rank = max(1, math.ceil(quantile * total))
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self._max
+        return self._max
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum, maximum = self._count, self._sum, self._max
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            buckets[f"le_{bound:g}"] = cumulative
+        buckets["le_inf"] = total
+        return {
+            "count": total,
+            "sum": round(total_sum, 6),
+            "mean": round(total_sum / total, 6) if total else None,
+            "max": round(maximum, 6),
+            "p50": self._percentile(counts, total, 0.50),
+            "p95": self._percentile(counts, total, 0.95),
+            "p99": self._percentile(counts, total, 0.99),
+            "buckets": buckets,
+        }
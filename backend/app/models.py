@@ -3,7 +3,7 @@ Data Models for Creerlio Platform
 SQLAlchemy models for business profiles, talent profiles, and resume data
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey, Index, LargeBinary, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -72,6 +72,11 @@ class BusinessProfile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    
+    # Keyset pagination order (newest first)
+    __table_args__ = (
+        Index("ix_business_profiles_created_at_id", "created_at", "id"),
+    )
 
 
 class Business(Base):
@@ -169,6 +174,11 @@ class TalentProfile(Base):
     
     # Relationships
     resume = relationship("ResumeData", back_populates="talent_profiles")
+    
+    # Keyset pagination order (newest first)
+    __table_args__ = (
+        Index("ix_talent_profiles_created_at_id", "created_at", "id"),
+    )
 
 
 class ResumeData(Base):
@@ -228,6 +238,11 @@ class ResumeData(Base):
     
     # Relationships
     talent_profiles = relationship("TalentProfile", back_populates="resume")
+    
+    # Keyset pagination order (newest first)
+    __table_args__ = (
+        Index("ix_resume_data_created_at_id", "created_at", "id"),
+    )
 
 
 class Job(Base):
@@ -288,6 +303,11 @@ class Job(Base):
     
     # Relationships
     business_profile = relationship("BusinessProfile", backref="jobs")
+    
+    # Keyset pagination order (newest first)
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
 
 
 class Application(Base):
@@ -370,6 +390,149 @@ class TalentBankItem(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 
+class GeocodeCacheEntry(Base):
+    """
+    Persistent geocoding cache (second tier behind the in-memory LRU).
+
+    Forward lookups are keyed on the normalized address, reverse lookups on
+    rounded coordinates; ``cache_key`` stores the SHA-256 hex of that key so
+    it has a fixed length. Negative entries record addresses that could not be
+    resolved so they are not retried until they expire.
+    """
+    __tablename__ = "geocode_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)  # SHA-256 hex of the lookup key
+    lookup_type = Column(String(20), nullable=False)  # "forward" or "reverse"
+    result = Column(JSON)  # Geocoding result; NULL for negative entries
+    is_negative = Column(Boolean, default=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class ResumeParseCacheEntry(Base):
+    """
+    Persistent cache of AI resume parsing results (second tier behind the in-memory LRU).
+
+    Keyed on the SHA-256 of the uploaded file bytes plus the parsing model
+    and prompt version, so changing either invalidates old entries.
+    """
+    __tablename__ = "resume_parse_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)
+    file_hash = Column(String(64), nullable=False, index=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    result = Column(JSON, nullable=False)  # Structured resume data (without per-upload file metadata)
+    hit_count = Column(Integer, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ResumeParseJob(Base):
+    """
+    Background resume parsing job (also the work queue).
+
+    Workers in any process claim queued jobs with a conditional UPDATE, so
+    each job runs once even with several worker processes sharing the
+    database. ``locked_until`` is the claim lease: a job whose worker died
+    is picked up again once it expires. The uploaded file is kept only
+    until the job finishes.
+    """
+    __tablename__ = "resume_parse_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    stage = Column(String(50), default="queued")  # queued, extracting, parsing, saving, done
+    progress = Column(Integer, default=0)  # Percent complete
+
+    # Input
+    filename = Column(String(255))
+    file_size = Column(Integer)
+    file_hash = Column(String(64), index=True)
+    file_content = Column(LargeBinary)  # Cleared when the job finishes
+    store_resume = Column(Boolean, default=True)  # Save a resume_data row from the result
+    user_id = Column(String(255), index=True)
+
+    # Execution
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=2)
+    worker_id = Column(String(100))
+    locked_until = Column(DateTime)
+
+    # Output
+    result = Column(JSON)
+    resume_id = Column(Integer, ForeignKey("resume_data.id"))
+    error = Column(Text)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Claim order: oldest runnable job first
+    __table_args__ = (
+        Index("ix_resume_parse_jobs_status_created_at", "status", "created_at"),
+    )
+
+
+class ResumeImportBatch(Base):
+    """
+    Bulk resume import (a zip archive or multi-file upload).
+
+    Each accepted file becomes a ``ResumeParseJob``; ``files`` records the
+    outcome per file (queued with its job id, duplicate, or skipped with a
+    reason), and progress is read from the jobs.
+    """
+    __tablename__ = "resume_import_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String(255), index=True)
+    source = Column(String(500))  # Uploaded file names
+    store_resume = Column(Boolean, default=True)
+
+    total_files = Column(Integer, default=0)
+    queued = Column(Integer, default=0)
+    duplicates = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    files = Column(JSON)  # [{"filename", "status", "job_id" | "resume_id" | "reason"}]
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmbeddingRecord(Base):
+    """
+    Stored text embedding for a job, talent profile or resume.
+
+    Vectors are little-endian float16 bytes (half the size of float32).
+    ``content_hash`` is the SHA-256 of the embedded text so unchanged rows
+    are not re-embedded; ``model`` identifies the provider, model and
+    dimensions, and rows from another model are re-embedded.
+    """
+    __tablename__ = "embeddings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(20), nullable=False)  # "job", "talent", "resume"
+    entity_id = Column(Integer, nullable=False)
+    model = Column(String(100), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uniq_embedding_entity"),
+    )
+
+
 # ==================== Pydantic Models (for API) ====================
 
 class BusinessProfileCreate(BaseModel):
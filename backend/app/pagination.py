@@ -0,0 +1,124 @@
+"""
+Pagination Helpers
+Keyset (cursor) pagination with opaque cursors for list and search endpoints
+"""
+
+import base64
+import binascii
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+
+# Upper bound for total_estimate; counting stops here so deep result sets stay cheap
+COUNT_CAP = int(os.getenv("PAGINATION_COUNT_CAP", "10000"))
+
+
+# ==================== Cursors ====================
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    payload = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor; raises HTTP 400 if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("wrong number of sort keys")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+# ==================== Keyset Queries ====================
+
+def _after(sort_keys: Sequence, values: Sequence[Any]):
+    """
+    Rows strictly after ``values`` in (key1 DESC NULLS FIRST, key2 DESC NULLS FIRST, ...)
+    order, expanded so it also works where row-value comparison is unavailable
+    """
+    branches = []
+    equal_so_far = []
+    for key, value in zip(sort_keys, values):
+        if value is None:
+            # NULLs sort first, so every non-NULL value comes after
+            branches.append(and_(*equal_so_far, key.is_not(None)))
+            equal_so_far.append(key.is_(None))
+        else:
+            branches.append(and_(*equal_so_far, key < value))
+            equal_so_far.append(key == value)
+    return or_(*branches)
+
+
+def keyset_page(stmt, sort_keys: Sequence, cursor: Optional[str], limit: int, skip: int = 0):
+    """
+    Apply newest-first keyset pagination to a select() statement
+
+    Args:
+        stmt: Filtered select() statement
+        sort_keys: Sort expressions, most significant first; the last one must be unique (usually id)
+        cursor: Cursor from a previous page's ``next_cursor``
+        limit: Page size
+        skip: Legacy offset, only honoured when no cursor is given
+
+    Returns:
+        Statement fetching one row more than ``limit`` (used to detect a next page)
+    """
+    if cursor:
+        stmt = stmt.where(_after(sort_keys, decode_cursor(cursor, len(sort_keys))))
+    elif skip:
+        stmt = stmt.offset(skip)
+    # DESC NULLS FIRST is the backward scan of a default (ASC NULLS LAST) b-tree index in PostgreSQL
+    return stmt.order_by(*[key.desc().nulls_first() for key in sort_keys]).limit(max(1, limit) + 1)
+
+
+def split_page(rows: Sequence, limit: int, sort_values: Callable[[Any], Sequence[Any]]) -> Tuple[List, Optional[str]]:
+    """
+    Trim the look-ahead row from a keyset_page result
+
+    Returns:
+        (page rows, next_cursor or None on the last page)
+    """
+    limit = max(1, limit)
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    return page, encode_cursor(sort_values(page[-1]))
+
+
+def created_at_keys(model) -> Tuple:
+    """Default (created_at, id) sort key for a model"""
+    return model.created_at, model.id
+
+
+def created_at_values(row) -> Tuple:
+    """Cursor values matching created_at_keys"""
+    return row.created_at, row.id
+
+
+# ==================== Totals ====================
+
+def count_estimate_statement(stmt, cap: int = COUNT_CAP):
+    """
+    Count of rows matching ``stmt`` (without paging), stopping at cap + 1
+
+    Pass the filtered statement before keyset_page is applied.
+    """
+    bounded = stmt.order_by(None).limit(cap + 1).subquery()
+    return select(func.count()).select_from(bounded)
+
+
+def total_fields(counted: int, cap: int = COUNT_CAP) -> Dict[str, Any]:
+    """Response fields for a count_estimate_statement result"""
+    return {"total_estimate": min(counted, cap), "total_is_exact": counted <= cap}
@@ -0,0 +1,311 @@
+"""
+Resume Bulk Import
+Queues zip archives and multi-file uploads of resumes as background parse jobs
+"""
+
+import os
+import posixpath
+import threading
+import zipfile
+import zlib
+from collections import Counter
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+from app.models import ResumeImportBatch, ResumeParseJob
+
+ARCHIVE_EXTENSIONS = (".zip",)
+
+# Rows per query when reading job states for a batch (keeps IN lists small)
+_PROGRESS_QUERY_SIZE = 500
+
+
+def iter_upload_entries(
+    filename: str,
+    fileobj: BinaryIO,
+    max_bytes: int
+) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Files in one upload as (name, content, skip reason)
+
+    Zip archives are read one entry at a time from the (spooled) upload, so
+    only the current entry is in memory. Entries over ``max_bytes`` are
+    skipped without decompressing them in full; declared sizes are not
+    trusted.
+    """
+    if os.path.splitext(filename)[1].lower() not in ARCHIVE_EXTENSIONS:
+        content = fileobj.read(max_bytes + 1)
+        if len(content) > max_bytes:
+            yield filename, None, f"File is larger than {max_bytes} bytes"
+        else:
+            yield filename, content, None
+        return
+
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        yield filename, None, "Not a valid zip archive"
+        return
+    with archive:
+        for info in archive.infolist():
+            name = posixpath.basename(info.filename)
+            # Folders and macOS metadata (__MACOSX/, ._ resource forks, .DS_Store)
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or not name or name.startswith("."):
+                continue
+            if info.file_size > max_bytes:
+                yield name, None, f"File is larger than {max_bytes} bytes"
+                continue
+            try:
+                with archive.open(info) as entry:
+                    content = entry.read(max_bytes + 1)
+            except (RuntimeError, zipfile.BadZipFile, zlib.error, NotImplementedError) as e:
+                # Encrypted entries, corrupt data, unsupported compression
+                yield name, None, f"Could not read archive entry: {e}"
+                continue
+            if len(content) > max_bytes:
+                yield name, None, f"File is larger than {max_bytes} bytes"
+            else:
+                yield name, content, None
+
+
+class ResumeBulkImporter:
+    """
+    Turns bulk uploads into ``ResumeParseJob`` rows for the resume job queue.
+
+    Files are streamed from the upload, hashed and deduplicated (within the
+    upload, and against jobs that already produced or are producing a
+    resume for the same content). Jobs are inserted in batches of
+    ``insert_batch_size`` rows (or ``insert_batch_bytes`` of file content)
+    per transaction, so workers start parsing while the rest of a large
+    archive is still being read. Parsing then fans out over the queue
+    workers, bounded by RESUME_JOB_WORKERS and the AI concurrency limit.
+    Runs in a worker thread (blocking I/O and zip decompression).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        file_hash: Callable[[bytes], str],
+        max_bytes: int,
+        max_files: int = 500,
+        insert_batch_size: int = 50,
+        insert_batch_bytes: int = 32 * 1024 * 1024,
+        max_attempts: int = 2
+    ):
+        self.session_factory = session_factory
+        self.file_hash = file_hash
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.insert_batch_size = max(1, insert_batch_size)
+        self.insert_batch_bytes = insert_batch_bytes
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._counters = {"batches": 0, "files": 0, "queued": 0, "duplicates": 0, "skipped": 0}
+
+    def ingest(
+        self,
+        uploads: Sequence[Tuple[str, BinaryIO]],
+        extensions: Sequence[str],
+        user_id: Optional[str] = None,
+        store_resume: bool = True,
+        on_queued: Optional[Callable[[], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue every resume in ``uploads`` ((filename, file) pairs)
+
+        Args:
+            extensions: Accepted resume extensions; other files are skipped
+            on_queued: Called after each committed insert batch (wake workers)
+
+        Returns:
+            The batch summary (see ``batch_progress``)
+        """
+        db = self.session_factory()
+        try:
+            batch = ResumeImportBatch(
+                user_id=user_id,
+                store_resume=store_resume,
+                source=", ".join(name for name, _ in uploads)[:500]
+            )
+            db.add(batch)
+            db.commit()
+
+            files: List[Dict[str, Any]] = []
+            seen: Dict[str, Dict[str, Any]] = {}
+            repeats: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+            pending: List[Tuple[Dict[str, Any], str, bytes]] = []
+            pending_bytes = 0
+
+            def flush() -> None:
+                nonlocal pending_bytes
+                if not pending:
+                    return
+                existing = self._existing_jobs(db, {file_hash for _, file_hash, _ in pending}, user_id, store_resume)
+                jobs = []
+                for entry, file_hash, content in pending:
+                    match = existing.get(file_hash)
+                    if match is not None:
+                        entry.update(status="duplicate", job_id=match[0], resume_id=match[1])
+                        continue
+                    job = ResumeParseJob(
+                        filename=entry["filename"],
+                        file_size=len(content),
+                        file_hash=file_hash,
+                        file_content=content,
+                        store_resume=store_resume,
+                        user_id=user_id,
+                        max_attempts=self.max_attempts
+                    )
+                    jobs.append((entry, job))
+                db.add_all([job for _, job in jobs])
+                db.flush()
+                for entry, job in jobs:
+                    entry["job_id"] = job.id
+                db.commit()
+                # Committed rows are expired, so the file contents can be freed
+                pending.clear()
+                pending_bytes = 0
+                if jobs and on_queued:
+                    on_queued()
+
+            for upload_name, fileobj in uploads:
+                upload_name = upload_name or "file"
+                for name, content, reason in iter_upload_entries(upload_name, fileobj, self.max_bytes):
+                    if len(files) >= self.max_files:
+                        # Stop reading; the rest of the upload is reported as one skipped entry
+                        files.append({
+                            "filename": upload_name,
+                            "status": "skipped",
+                            "reason": f"Only {self.max_files} files are accepted per import; the rest were not read"
+                        })
+                        break
+                    if reason is None and os.path.splitext(name)[1].lower() not in extensions:
+                        reason = "Unsupported file format"
+                    elif reason is None and not content:
+                        reason = "File is empty"
+                    entry: Dict[str, Any] = {"filename": name}
+                    files.append(entry)
+                    if reason is not None:
+                        entry.update(status="skipped", reason=reason)
+                        continue
+
+                    file_hash = self.file_hash(content)
+                    if file_hash in seen:
+                        entry.update(status="duplicate", duplicate_of=seen[file_hash]["filename"])
+                        repeats.append((entry, seen[file_hash]))
+                        continue
+                    seen[file_hash] = entry
+                    entry["status"] = "queued"
+                    pending.append((entry, file_hash, content))
+                    pending_bytes += len(content)
+                    if len(pending) >= self.insert_batch_size or pending_bytes >= self.insert_batch_bytes:
+                        flush()
+                if len(files) > self.max_files:
+                    break
+            flush()
+
+            # Repeats of a file in this upload share the first copy's job
+            for entry, original in repeats:
+                entry["job_id"] = original.get("job_id")
+                entry["resume_id"] = original.get("resume_id")
+
+            statuses = Counter(entry["status"] for entry in files)
+            batch.files = files
+            batch.total_files = len(files)
+            batch.queued = statuses["queued"]
+            batch.duplicates = statuses["duplicate"]
+            batch.skipped = statuses["skipped"]
+            db.commit()
+
+            with self._lock:
+                self._counters["batches"] += 1
+                self._counters["files"] += len(files)
+                self._counters["queued"] += batch.queued
+                self._counters["duplicates"] += batch.duplicates
+                self._counters["skipped"] += batch.skipped
+            print(
+                f"[RESUME_BULK] Batch {batch.id}: {len(files)} files, {batch.queued} queued, "
+                f"{batch.duplicates} duplicates, {batch.skipped} skipped"
+            )
+            return batch_progress(db, batch.id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _existing_jobs(db, hashes, user_id: Optional[str], store_resume: bool) -> Dict[str, Tuple[int, Optional[int]]]:
+        """
+        Earlier jobs of the same user for the same content that produced (or will produce)
+        what this import asks for
+
+        Another user's job never counts: its results are only visible to that user.
+        """
+        owner = ResumeParseJob.user_id == user_id if user_id is not None else ResumeParseJob.user_id.is_(None)
+        rows = db.query(ResumeParseJob.file_hash, ResumeParseJob.id, ResumeParseJob.resume_id).filter(
+            ResumeParseJob.file_hash.in_(hashes),
+            owner,
+            or_(
+                ResumeParseJob.resume_id.isnot(None),
+                and_(
+                    ResumeParseJob.status.in_(("queued", "running")),
+                    ResumeParseJob.store_resume == store_resume
+                ),
+                and_(ResumeParseJob.status == "succeeded", not store_resume)
+            )
+        ).order_by(ResumeParseJob.id).all()
+        existing: Dict[str, Tuple[int, Optional[int]]] = {}
+        for file_hash, job_id, resume_id in rows:
+            existing.setdefault(file_hash, (job_id, resume_id))
+        return existing
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters)
+
+
+def batch_progress(db, batch_id: int, include_files: bool = False) -> Optional[Dict[str, Any]]:
+    """Summary of an import batch with the state of its parse jobs, or None if it does not exist"""
+    batch = db.get(ResumeImportBatch, batch_id)
+    if batch is None:
+        return None
+    files = batch.files or []
+    job_ids = sorted({entry["job_id"] for entry in files if entry.get("status") == "queued" and entry.get("job_id")})
+    # Repeats within the upload point at the first copy's job, which is in job_ids
+
+    jobs: Dict[int, Any] = {}
+    for start in range(0, len(job_ids), _PROGRESS_QUERY_SIZE):
+        rows = db.query(
+            ResumeParseJob.id, ResumeParseJob.status, ResumeParseJob.progress,
+            ResumeParseJob.resume_id, ResumeParseJob.error
+        ).filter(ResumeParseJob.id.in_(job_ids[start:start + _PROGRESS_QUERY_SIZE])).all()
+        jobs.update((row.id, row) for row in rows)
+
+    statuses = Counter(job.status for job in jobs.values())
+    finished = statuses["succeeded"] + statuses["failed"]
+    summary: Dict[str, Any] = {
+        "id": batch.id,
+        "status": "completed" if finished == len(jobs) else ("running" if statuses["running"] or finished else "queued"),
+        "progress": round(sum(job.progress or 0 for job in jobs.values()) / len(jobs)) if jobs else 100,
+        "source": batch.source,
+        "user_id": batch.user_id,
+        "total_files": batch.total_files,
+        "queued": batch.queued,
+        "duplicates": batch.duplicates,
+        "skipped": batch.skipped,
+        "jobs": {status: statuses[status] for status in ("queued", "running", "succeeded", "failed")},
+        "created_at": batch.created_at.isoformat() if batch.created_at else None,
+    }
+    if include_files:
+        summary["files"] = []
+        for entry in files:
+            entry = dict(entry)
+            job = jobs.get(entry.get("job_id"))
+            if job is not None and entry["status"] == "queued":
+                entry.update(status=job.status, progress=job.progress, resume_id=job.resume_id, error=job.error)
+            elif job is not None and job.resume_id:
+                entry["resume_id"] = job.resume_id
+            summary["files"].append(entry)
+    return summary
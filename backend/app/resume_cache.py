@@ -0,0 +1,143 @@
+"""
+Resume Parse Cache
+Two-tier cache (in-memory LRU + database table) in front of AI resume parsing
+"""
+
+import copy
+import hashlib
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.cache import LRUCache
+from app.models import ResumeParseCacheEntry
+
+
+class ResumeParseCache:
+    """
+    Cache for parsed resumes keyed by file content.
+
+    The key is the SHA-256 of the file bytes combined with the parsing model
+    and prompt version, so re-uploads of an identical file skip the OpenAI
+    call while a model or prompt change naturally misses. Lookups check the
+    in-memory LRU first, then the ``resume_parse_cache`` table; database hits
+    are promoted into memory. Callers always get a private copy of the result.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self.session_factory = session_factory
+        self.memory = LRUCache(max_entries=int(os.getenv("RESUME_PARSE_CACHE_MAX_ENTRIES", "256")))
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "database_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    # ==================== Keys ====================
+
+    @staticmethod
+    def file_hash(file_content: bytes) -> str:
+        return hashlib.sha256(file_content).hexdigest()
+
+    @staticmethod
+    def cache_key(file_hash: str, model: str, prompt_version: str) -> str:
+        return hashlib.sha256(f"{file_hash}:{model}:{prompt_version}".encode("utf-8")).hexdigest()
+
+    # ==================== Lookups ====================
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def lookup_memory(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """Check only the in-memory tier (never blocks on I/O)"""
+        found, value = self.memory.lookup(key)
+        if found:
+            self._count("memory_hits")
+            return True, copy.deepcopy(value)
+        return False, None
+
+    def lookup_database(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """Check the persistent tier, promoting hits into memory (blocking)"""
+        result = self._load(key)
+        if result is not None:
+            self.memory.set(key, result)
+            self._count("database_hits")
+            return True, copy.deepcopy(result)
+
+        self._count("misses")
+        return False, None
+
+    def store(self, key: str, file_hash: str, model: str, prompt_version: str, result: Dict) -> None:
+        """Cache a parsing result in both tiers (blocking)"""
+        result = copy.deepcopy(result)
+        self.memory.set(key, result)
+        self._persist(key, file_hash, model, prompt_version, result)
+        self._count("stores")
+
+    # ==================== Database Tier ====================
+
+    def _load(self, key: str) -> Optional[Dict]:
+        if not self.session_factory:
+            return None
+        try:
+            db = self.session_factory()
+            try:
+                entry = db.query(ResumeParseCacheEntry).filter(ResumeParseCacheEntry.cache_key == key).first()
+                if not entry:
+                    return None
+                entry.hit_count = (entry.hit_count or 0) + 1
+                entry.last_used_at = datetime.utcnow()
+                result = entry.result
+                db.commit()
+                return result
+            finally:
+                db.close()
+        except Exception as e:
+            # The cache must never break parsing - fall through to the API
+            print(f"[RESUME_CACHE] Database lookup failed: {e}")
+            self._count("errors")
+            return None
+
+    def _persist(self, key: str, file_hash: str, model: str, prompt_version: str, result: Dict) -> None:
+        if not self.session_factory:
+            return
+        try:
+            db = self.session_factory()
+            try:
+                entry = db.query(ResumeParseCacheEntry).filter(ResumeParseCacheEntry.cache_key == key).first()
+                if not entry:
+                    entry = ResumeParseCacheEntry(
+                        cache_key=key, file_hash=file_hash, model=model, prompt_version=prompt_version
+                    )
+                    db.add(entry)
+                entry.result = result
+                entry.last_used_at = datetime.utcnow()
+                db.commit()
+            except IntegrityError:
+                # Another worker stored the same file concurrently
+                db.rollback()
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"[RESUME_CACHE] Database store failed: {e}")
+            self._count("errors")
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters["memory_hits"] + counters["database_hits"]
+        total = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / total, 4) if total else None
+        counters["memory_entries"] = len(self.memory)
+        counters["persistent"] = self.session_factory is not None
+        return counters
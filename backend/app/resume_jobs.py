@@ -0,0 +1,375 @@
+"""
+Resume Jobs
+Database-backed queue that parses uploaded resumes in background workers
+
+Workers normally run inside the API process (RESUME_JOB_WORKERS). They can
+also run as separate processes sharing the same database:
+
+    python -m app.resume_jobs
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+from app.models import ResumeData, ResumeParseJob
+
+# Fields of a job reported by the status endpoint
+JOB_FIELDS = (
+    "id", "status", "stage", "progress", "filename", "file_size", "attempts",
+    "max_attempts", "error", "resume_id", "created_at", "started_at", "finished_at",
+)
+
+
+def describe_job(job: ResumeParseJob, include_result: bool = True) -> Dict[str, Any]:
+    """Status summary of a job for API responses"""
+    summary = {field: getattr(job, field) for field in JOB_FIELDS}
+    for field in ("created_at", "started_at", "finished_at"):
+        if summary[field]:
+            summary[field] = summary[field].isoformat()
+    if include_result and job.status == "succeeded":
+        summary["result"] = job.result
+    return summary
+
+
+class _ClaimedJob:
+    """Detached copy of the fields a worker needs (no session attached)"""
+
+    def __init__(self, job: ResumeParseJob):
+        self.id = job.id
+        self.filename = job.filename
+        self.file_content = job.file_content
+        self.store_resume = job.store_resume
+        self.attempts = job.attempts
+        self.max_attempts = job.max_attempts
+
+
+class ResumeJobQueue:
+    """
+    Resume parsing queue stored in the ``resume_parse_jobs`` table.
+
+    Producers insert a queued row and call ``notify``. Each worker claims
+    the oldest runnable job with a conditional UPDATE (only one worker's
+    update matches), so any number of worker tasks and processes can share
+    the table. A claim is a lease that progress updates extend; jobs whose
+    lease expires (worker crashed) become claimable again. Failed attempts
+    are retried after ``retry_delay`` seconds until ``max_attempts`` is
+    reached. Idle workers poll every ``poll_interval`` seconds, or wake at
+    once for jobs submitted in this process.
+    """
+
+    def __init__(
+        self,
+        ai_service,
+        session_factory: Callable,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 600.0,
+        retry_delay: float = 30.0,
+        on_resume_saved: Optional[Callable[[int], None]] = None
+    ):
+        self.ai_service = ai_service
+        self.session_factory = session_factory
+        self.workers = max(0, workers)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.on_resume_saved = on_resume_saved
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._counters = {"claimed": 0, "succeeded": 0, "failed": 0, "retried": 0, "released": 0, "lost": 0, "unrecorded": 0}
+
+    # ==================== Producer ====================
+
+    def notify(self) -> None:
+        """Wake local idle workers after a job was submitted"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ==================== Worker ====================
+
+    async def start(self) -> None:
+        if self._tasks or not self.workers:
+            return
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._tasks = [
+            asyncio.create_task(self._run(f"{self.worker_prefix}:{number}"))
+            for number in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _run(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(self._claim, worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[RESUME_JOBS] Failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._running += 1
+            try:
+                await self._process(job, worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Never let one job take the worker down; an unrecorded job is retried when its lease expires
+                print(f"[RESUME_JOBS] Worker {worker_id} failed while handling job {job.id}: {e}")
+            finally:
+                self._running -= 1
+
+    async def _process(self, job: _ClaimedJob, worker_id: str) -> None:
+        async def progress(stage: str, percent: int) -> None:
+            try:
+                await asyncio.to_thread(self._update, job.id, worker_id, stage=stage, progress=percent)
+            except Exception as e:
+                # Progress is informational; a missed update must not fail the parse
+                print(f"[RESUME_JOBS] Failed to record progress for job {job.id}: {e}")
+
+        try:
+            parsed = await self.ai_service.parse_resume(job.file_content, job.filename or "resume", progress=progress)
+            await progress("saving", 90)
+            completed, resume_id = await asyncio.to_thread(self._complete, job, worker_id, parsed)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back instead of waiting for the lease to expire
+            await asyncio.shield(asyncio.to_thread(self._release, job.id, worker_id))
+            self._counters["released"] += 1
+            raise
+        except Exception as e:
+            print(f"[RESUME_JOBS] Job {job.id} attempt {job.attempts} failed: {e}")
+            try:
+                retrying = await asyncio.to_thread(self._fail, job, worker_id, str(e))
+            except Exception as record_error:
+                # The job stays running until its lease expires, then it is claimed again
+                print(f"[RESUME_JOBS] Failed to record failure of job {job.id}: {record_error}")
+                self._counters["unrecorded"] += 1
+                return
+            self._counters["retried" if retrying else "failed"] += 1
+            return
+
+        if not completed:
+            # Lease expired and another worker took the job over
+            self._counters["lost"] += 1
+            return
+        self._counters["succeeded"] += 1
+        if resume_id and self.on_resume_saved:
+            try:
+                self.on_resume_saved(resume_id)
+            except Exception as e:
+                print(f"[RESUME_JOBS] on_resume_saved failed for resume {resume_id}: {e}")
+
+    # ==================== Database (worker threads) ====================
+
+    @staticmethod
+    def _runnable(now: datetime):
+        return or_(
+            and_(
+                ResumeParseJob.status == "queued",
+                or_(ResumeParseJob.locked_until.is_(None), ResumeParseJob.locked_until <= now)
+            ),
+            and_(ResumeParseJob.status == "running", ResumeParseJob.locked_until < now)
+        )
+
+    def _claim(self, worker_id: str) -> Optional[_ClaimedJob]:
+        """Claim the oldest runnable job, or return None if there is none"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            candidates = db.query(ResumeParseJob.id).filter(self._runnable(now)).order_by(
+                ResumeParseJob.created_at, ResumeParseJob.id
+            ).limit(5).all()
+            for (job_id,) in candidates:
+                claimed = db.query(ResumeParseJob).filter(
+                    ResumeParseJob.id == job_id, self._runnable(now)
+                ).update({
+                    ResumeParseJob.status: "running",
+                    ResumeParseJob.stage: "starting",
+                    ResumeParseJob.worker_id: worker_id,
+                    ResumeParseJob.locked_until: now + timedelta(seconds=self.lease_seconds),
+                    ResumeParseJob.attempts: ResumeParseJob.attempts + 1,
+                    ResumeParseJob.started_at: now,
+                }, synchronize_session=False)
+                db.commit()
+                if not claimed:
+                    continue  # Another worker won this one
+
+                job = db.get(ResumeParseJob, job_id)
+                if job.attempts > job.max_attempts:
+                    # Only reachable through expired leases (the worker kept dying)
+                    self._finish(db, job, status="failed", error=job.error or "Worker lease expired")
+                    db.commit()
+                    continue
+                self._counters["claimed"] += 1
+                return _ClaimedJob(job)
+            return None
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _owned(self, db, job_id: int, worker_id: str):
+        return db.query(ResumeParseJob).filter(
+            ResumeParseJob.id == job_id,
+            ResumeParseJob.worker_id == worker_id,
+            ResumeParseJob.status == "running"
+        )
+
+    def _update(self, job_id: int, worker_id: str, **values: Any) -> None:
+        """Record progress and extend the lease"""
+        db = self.session_factory()
+        try:
+            values["locked_until"] = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            self._owned(db, job_id, worker_id).update(
+                {getattr(ResumeParseJob, name): value for name, value in values.items()},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _finish(db, job: ResumeParseJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.stage = "done" if status == "succeeded" else status
+        job.error = error
+        job.locked_until = None
+        job.finished_at = datetime.utcnow()
+        job.file_content = None
+        if status == "succeeded":
+            job.progress = 100
+
+    def _complete(self, job: _ClaimedJob, worker_id: str, parsed: Dict) -> tuple:
+        """Store the result (and resume row) if this worker still owns the job"""
+        db = self.session_factory()
+        try:
+            row = self._owned(db, job.id, worker_id).with_for_update().first()
+            if row is None:
+                return False, None
+            if row.store_resume:
+                resume = ResumeData(**parsed)
+                db.add(resume)
+                db.flush()
+                row.resume_id = resume.id
+            row.result = parsed
+            self._finish(db, row, status="succeeded")
+            db.commit()
+            return True, row.resume_id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _fail(self, job: _ClaimedJob, worker_id: str, error: str) -> bool:
+        """Requeue the job with a delay, or mark it failed; returns True if it will be retried"""
+        db = self.session_factory()
+        try:
+            row = self._owned(db, job.id, worker_id).first()
+            if row is None:
+                return False
+            retrying = row.attempts < row.max_attempts
+            if retrying:
+                row.status = "queued"
+                row.stage = "queued"
+                row.error = error
+                row.worker_id = None
+                row.locked_until = datetime.utcnow() + timedelta(seconds=self.retry_delay)
+            else:
+                self._finish(db, row, status="failed", error=error)
+            db.commit()
+            return retrying
+        finally:
+            db.close()
+
+    def _release(self, job_id: int, worker_id: str) -> None:
+        db = self.session_factory()
+        try:
+            self._owned(db, job_id, worker_id).update({
+                ResumeParseJob.status: "queued",
+                ResumeParseJob.stage: "queued",
+                ResumeParseJob.worker_id: None,
+                ResumeParseJob.locked_until: None,
+                ResumeParseJob.attempts: ResumeParseJob.attempts - 1,
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "workers": len(self._tasks),
+            "running": self._running,
+        }
+
+
+async def _run_standalone() -> None:
+    """Run queue workers without the API (python -m app.resume_jobs)"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from app.ai_service import AIService
+    from app.database import SessionLocal, init_db
+    from app.embedding_service import EmbeddingService
+
+    init_db()
+    ai_service = AIService()
+    ai_service.text_extractor.start()
+    # Same post-save hook as the API's in-process workers; the API picks the vectors up from the table
+    embedding_service = EmbeddingService.from_env(SessionLocal)
+    await embedding_service.start(serve_search=False)
+    queue = ResumeJobQueue(
+        ai_service,
+        SessionLocal,
+        workers=int(os.getenv("RESUME_JOB_WORKERS", "2")) or 1,
+        poll_interval=float(os.getenv("RESUME_JOB_POLL_SECONDS", "2")),
+        lease_seconds=float(os.getenv("RESUME_JOB_LEASE_SECONDS", "600")),
+        retry_delay=float(os.getenv("RESUME_JOB_RETRY_SECONDS", "30")),
+        on_resume_saved=lambda resume_id: embedding_service.enqueue("resume", resume_id)
+    )
+    await queue.start()
+    print(f"[RESUME_JOBS] {queue.workers} workers running ({queue.worker_prefix})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await queue.stop()
+        await embedding_service.stop()
+        ai_service.text_extractor.shutdown()
+        if ai_service.openai_client:
+            await ai_service.openai_client.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_run_standalone())
+    except KeyboardInterrupt:
+        pass
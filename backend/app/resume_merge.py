@@ -0,0 +1,200 @@
+"""
+Resume Merge
+Deterministic merge of resume data parsed from separate chunks of one document
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Single-value fields: the first non-empty value in document order wins
+SCALAR_FIELDS = ("name", "email", "phone", "address", "linkedin", "github", "website", "summary", "objective")
+
+_MONTH_NAMES = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+# Full names, three-letter abbreviations and "sept"
+_MONTHS = {name: number for number, name in enumerate(_MONTH_NAMES, 1)}
+_MONTHS.update({name[:3]: number for number, name in enumerate(_MONTH_NAMES, 1)})
+_MONTHS["sept"] = 9
+_ONGOING = {"present", "current", "now", "ongoing", "today"}
+_COMPANY_SUFFIXES = re.compile(r"\b(pty|ltd|limited|inc|incorporated|llc|llp|plc|corp|corporation|co|gmbh)\b")
+
+
+def normalize_text(value: Any) -> str:
+    """Lowercase, punctuation-free, single-spaced form used for comparisons"""
+    if value is None:
+        return ""
+    text = re.sub(r"[^\w\s]", " ", str(value).lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_company(value: Any) -> str:
+    return re.sub(r"\s+", " ", _COMPANY_SUFFIXES.sub(" ", normalize_text(value))).strip()
+
+
+def normalize_date(value: Any) -> str:
+    """
+    Comparable form of a resume date ("Feb 2020", "2020-02", "02/2020" -> "2020-02")
+
+    Ongoing markers become "present"; unrecognized values are returned normalized.
+    """
+    text = normalize_text(value)
+    if not text:
+        return ""
+    if text in _ONGOING:
+        return "present"
+    year = re.search(r"\b(19|20)\d{2}\b", text)
+    if not year:
+        return text
+    month = None
+    for word in text.split():
+        if word in _MONTHS:
+            month = _MONTHS[word]
+            break
+    if month is None:
+        numeric = re.search(r"\b(19|20)\d{2} (\d{1,2})\b|\b(\d{1,2}) (19|20)\d{2}\b", text)
+        if numeric:
+            candidate = int(numeric.group(2) or numeric.group(3))
+            month = candidate if 1 <= candidate <= 12 else None
+    return f"{year.group(0)}-{month:02d}" if month else year.group(0)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _merge_strings(first: List[Any], second: List[Any]) -> List[Any]:
+    """Union of two lists keeping first-seen order, comparing strings case-insensitively"""
+    merged = list(first)
+    seen = {normalize_text(item) if isinstance(item, str) else repr(item) for item in merged}
+    for item in second:
+        key = normalize_text(item) if isinstance(item, str) else repr(item)
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+def _as_list(value: Any) -> List[Any]:
+    if _is_empty(value):
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# ==================== Entries ====================
+
+def _experience_key(entry: Dict) -> Tuple[str, str]:
+    return normalize_company(entry.get("company")), normalize_text(entry.get("title"))
+
+
+def _dates_compatible(first: Dict, second: Dict) -> bool:
+    """Same role unless both entries give different start dates"""
+    start_a, start_b = normalize_date(first.get("start_date")), normalize_date(second.get("start_date"))
+    return not start_a or not start_b or start_a == start_b
+
+
+def _merge_entry(target: Dict, other: Dict) -> None:
+    """Fill gaps in ``target`` from a duplicate entry (longer text wins, lists are unioned)"""
+    for field, value in other.items():
+        if _is_empty(value):
+            continue
+        current = target.get(field)
+        if _is_empty(current):
+            target[field] = value
+        elif isinstance(current, list) and isinstance(value, list):
+            target[field] = _merge_strings(current, value)
+        elif isinstance(current, str) and isinstance(value, str) and len(value) > len(current):
+            # A chunk boundary can truncate a description; keep the fuller one
+            target[field] = value
+
+
+def _merge_entries(
+    lists: List[List[Dict]],
+    key: Callable[[Dict], Tuple],
+    compatible: Optional[Callable[[Dict, Dict], bool]] = None
+) -> List[Dict]:
+    """Deduplicate entries across chunks, in order of first appearance"""
+    merged: List[Dict] = []
+    by_key: Dict[Tuple, List[Dict]] = {}
+    for entries in lists:
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            entry_key = key(entry)
+            if not any(entry_key):
+                continue
+            match = next(
+                (existing for existing in by_key.get(entry_key, ()) if compatible is None or compatible(existing, entry)),
+                None
+            )
+            if match is None:
+                copy = dict(entry)
+                merged.append(copy)
+                by_key.setdefault(entry_key, []).append(copy)
+            else:
+                _merge_entry(match, entry)
+    return merged
+
+
+# Entry list field -> identity of an entry
+ENTRY_KEYS: Dict[str, Callable[[Dict], Tuple]] = {
+    "education": lambda entry: (normalize_text(entry.get("institution")), normalize_text(entry.get("degree"))),
+    "certifications": lambda entry: (normalize_text(entry.get("name")), normalize_text(entry.get("issuer"))),
+    "projects": lambda entry: (normalize_text(entry.get("name")),),
+    "languages": lambda entry: (normalize_text(entry.get("language")),),
+    "awards": lambda entry: (normalize_text(entry.get("title")), normalize_text(entry.get("issuer"))),
+}
+
+
+def _merge_skills(values: List[Any]) -> Any:
+    """Union skills whether the model returned categories ({"technical": [...]}) or a flat list"""
+    if all(isinstance(value, dict) for value in values):
+        merged: Dict[str, List[Any]] = {}
+        for value in values:
+            for category, skills in value.items():
+                merged[category] = _merge_strings(merged.get(category, []), _as_list(skills))
+        return merged
+    flat: List[Any] = []
+    for value in values:
+        items = [skill for skills in value.values() for skill in _as_list(skills)] if isinstance(value, dict) else _as_list(value)
+        flat = _merge_strings(flat, items)
+    return flat
+
+
+# ==================== Merge ====================
+
+def merge_parsed_resumes(parts: List[Dict]) -> Dict:
+    """
+    Combine per-chunk parse results (in document order) into one resume
+
+    - Scalar fields take the first non-empty value.
+    - Experience entries with the same company and title are one role
+      unless their start dates differ; duplicates from chunk overlap are
+      merged, keeping the longer description and the union of achievements.
+    - Other entry lists are deduplicated on their identifying fields.
+    - Skills are unioned per category.
+
+    The result depends only on the input order, never on timing.
+    """
+    parts = [part for part in parts if isinstance(part, dict)]
+    merged: Dict[str, Any] = {}
+
+    for field in SCALAR_FIELDS:
+        merged[field] = next((part[field] for part in parts if not _is_empty(part.get(field))), None)
+
+    merged["experience"] = _merge_entries(
+        [_as_list(part.get("experience")) for part in parts], _experience_key, _dates_compatible
+    )
+    for field, key in ENTRY_KEYS.items():
+        merged[field] = _merge_entries([_as_list(part.get(field)) for part in parts], key)
+
+    skills = [part["skills"] for part in parts if not _is_empty(part.get("skills"))]
+    merged["skills"] = _merge_skills(skills) if skills else {}
+
+    # Keep any extra keys the model returned (first chunk that has them)
+    for part in parts:
+        for field, value in part.items():
+            if field not in merged and not _is_empty(value):
+                merged[field] = value
+    return merged
@@ -0,0 +1,169 @@
+"""
+Full-Text Search
+Ranked keyword search over jobs, talent and businesses.
+
+PostgreSQL: weighted ``search_vector`` tsvector columns (generated, stored) with GIN
+indexes, matched with websearch_to_tsquery and ranked with ts_rank_cd.
+SQLite: FTS5 external-content tables kept in sync by triggers, ranked with bm25.
+Anything else (or a failed setup) falls back to the original ILIKE filters.
+"""
+
+import re
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+
+from app.models import BusinessProfile, Job, TalentProfile
+from app.pagination import created_at_keys, created_at_values
+
+SEARCH_CONFIG = "english"
+
+# Entity -> (model, heavily weighted fields, body fields)
+SEARCH_FIELDS: Dict[str, Tuple] = {
+    "job": (Job, ("title",), ("description", "requirements", "responsibilities")),
+    "talent": (TalentProfile, ("name", "title"), ("bio",)),
+    "business": (BusinessProfile, ("name",), ("description", "industry")),
+}
+
+# Fields searched by the ILIKE fallback (matches the pre-search behaviour)
+FALLBACK_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "job": ("title", "description"),
+    "talent": ("name", "bio"),
+    "business": ("name", "description"),
+}
+
+# bm25 column weights for the SQLite FTS tables (title-like fields count more)
+_BM25_TITLE_WEIGHT = 10.0
+_BM25_BODY_WEIGHT = 1.0
+
+# Backend chosen by ensure_search_indexes: "postgresql", "sqlite" or None (ILIKE fallback)
+search_backend: Optional[str] = None
+
+
+# ==================== Setup ====================
+
+def _pg_vector_expression(title_fields: Sequence[str], body_fields: Sequence[str]) -> str:
+    def weighted(fields, weight):
+        document = " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+        return f"setweight(to_tsvector('{SEARCH_CONFIG}', {document}), '{weight}')"
+    return f"{weighted(title_fields, 'A')} || {weighted(body_fields, 'B')}"
+
+
+def _setup_postgresql(connection) -> None:
+    for model, title_fields, body_fields in SEARCH_FIELDS.values():
+        table_name = model.__tablename__
+        connection.execute(text(
+            f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_pg_vector_expression(title_fields, body_fields)}) STORED"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search_vector ON {table_name} USING GIN (search_vector)"
+        ))
+
+
+def _setup_sqlite(connection) -> None:
+    for model, title_fields, body_fields in SEARCH_FIELDS.values():
+        table_name = model.__tablename__
+        fts = f"{table_name}_fts"
+        fields = list(title_fields) + list(body_fields)
+        columns = ", ".join(fields)
+        new_values = ", ".join(f"new.{field}" for field in fields)
+        old_values = ", ".join(f"old.{field}" for field in fields)
+
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+        ).first()
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{columns}, content='{table_name}', content_rowid='id', tokenize='porter unicode61')"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        if not exists:
+            # Index rows written before the FTS table existed
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def ensure_search_indexes(engine) -> Optional[str]:
+    """
+    Create the search columns/tables for the engine's dialect (idempotent)
+
+    Returns:
+        The active search backend, or None when falling back to ILIKE
+    """
+    global search_backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as connection:
+            if dialect == "postgresql":
+                _setup_postgresql(connection)
+            elif dialect == "sqlite":
+                _setup_sqlite(connection)
+            else:
+                search_backend = None
+                return None
+        search_backend = dialect
+    except Exception as e:
+        # e.g. PostgreSQL < 12 or SQLite built without FTS5
+        print(f"[SEARCH] Full-text search unavailable, using ILIKE fallback: {e}")
+        search_backend = None
+    return search_backend
+
+
+# ==================== Queries ====================
+
+def _fts5_query(query: str) -> str:
+    """Turn free text into a safe FTS5 query: every term must match, as a prefix"""
+    terms = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _ilike_filter(model, entity: str, query: str):
+    return or_(*[getattr(model, field).ilike(f"%{query}%") for field in FALLBACK_FIELDS[entity]])
+
+
+def text_search(stmt, entity: str, query: Optional[str]) -> Tuple:
+    """
+    Apply a keyword search to a select() of the entity's model
+
+    Returns:
+        (statement, sort_keys, sort_values) for keyset_page/split_page. Result rows are
+        Row objects whose first element is the model instance. Ranked searches add a
+        ``search_rank`` column and sort by (rank, id); otherwise rows sort by (created_at, id).
+    """
+    model = SEARCH_FIELDS[entity][0]
+    by_created: Tuple[Sequence, Callable] = (created_at_keys(model), lambda row: created_at_values(row[0]))
+    query = (query or "").strip()
+    if not query:
+        return (stmt, *by_created)
+
+    if search_backend == "postgresql":
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(vector, tsquery)
+        stmt = stmt.where(vector.op("@@")(tsquery))
+    elif search_backend == "sqlite" and _fts5_query(query):
+        fts_name = f"{model.__tablename__}_fts"
+        fts = table(fts_name, column("rowid"))
+        _, title_fields, body_fields = SEARCH_FIELDS[entity]
+        weights = [_BM25_TITLE_WEIGHT] * len(title_fields) + [_BM25_BODY_WEIGHT] * len(body_fields)
+        # bm25() is lower-is-better; negate so every backend ranks descending
+        rank = -func.bm25(literal_column(fts_name), *weights)
+        stmt = stmt.join(fts, fts.c.rowid == model.id)
+        stmt = stmt.where(literal_column(fts_name).op("MATCH")(_fts5_query(query)))
+    else:
+        return (stmt.where(_ilike_filter(model, entity, query)), *by_created)
+
+    stmt = stmt.add_columns(rank.label("search_rank"))
+    return stmt, (rank, model.id), lambda row: (row.search_rank, row[0].id)
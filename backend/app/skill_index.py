@@ -0,0 +1,269 @@
+"""
+Skill Index
+In-process inverted index from normalized skill names to talent profile IDs
+"""
+
+import asyncio
+import difflib
+import heapq
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Integer, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models import TalentProfile
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form of a skill name ("  Node.JS " -> "node.js")"""
+    normalized = unicodedata.normalize("NFKC", skill).lower().strip()
+    normalized = re.sub(r"\s+", " ", normalized)
+    return normalized.strip(" ,;:")
+
+
+def skill_names(skills: Any) -> List[str]:
+    """Normalized skill names from a profile's skills JSON (strings or {"name": ...} entries)"""
+    if not skills:
+        return []
+    if isinstance(skills, (str, dict)):
+        skills = [skills]
+    names = []
+    for skill in skills:
+        if isinstance(skill, dict):
+            skill = skill.get("name") or skill.get("skill")
+        if isinstance(skill, str):
+            normalized = normalize_skill(skill)
+            if normalized:
+                names.append(normalized)
+    return names
+
+
+def intersect_sorted(postings: List[List[int]]) -> List[int]:
+    """Intersect sorted ID lists, driving from the shortest and galloping through the rest"""
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        matched = []
+        position = 0
+        for talent_id in result:
+            position = bisect_left(other, talent_id, position)
+            if position == len(other):
+                break
+            if other[position] == talent_id:
+                matched.append(talent_id)
+        result = matched
+    return list(result)
+
+
+def union_sorted(postings: List[List[int]]) -> List[int]:
+    """Merge sorted ID lists into one sorted list without duplicates"""
+    result: List[int] = []
+    for talent_id in heapq.merge(*postings):
+        if not result or result[-1] != talent_id:
+            result.append(talent_id)
+    return result
+
+
+def ids_filter(column, ids: List[int], dialect: str):
+    """
+    ``column IN ids`` without one bound parameter per id
+
+    Posting lists for common skills can exceed the driver's parameter limit
+    (32767 for asyncpg). PostgreSQL binds the ids as a single integer array
+    (``= ANY``); other databases get them rendered inline, which is safe for
+    the integer ids the index produces.
+    """
+    if dialect == "postgresql":
+        return column == any_(bindparam("ids", list(ids), type_=ARRAY(Integer), unique=True))
+    return column.in_(bindparam("ids", list(ids), unique=True, expanding=True, literal_execute=True))
+
+
+class SkillIndex:
+    """
+    Inverted index: skill token -> sorted posting list of talent profile IDs.
+
+    Profiles are indexed on write (``index_talent``) and the index is kept in
+    step with writes made elsewhere by a periodic watermark sync, like the
+    nearby-search spatial indexes. Multi-skill queries are posting-list
+    intersections (all) or unions (any); fuzzy matching expands each
+    requested skill to close names in the vocabulary.
+    """
+
+    def __init__(self, fuzzy_cutoff: float = 0.8, fuzzy_max_matches: int = 5):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.fuzzy_max_matches = fuzzy_max_matches
+        self.sync_seconds = float(os.getenv("SKILL_INDEX_SYNC_SECONDS", "30"))
+        self.rebuild_seconds = float(os.getenv("SKILL_INDEX_REBUILD_SECONDS", "600"))
+
+        self._postings: Dict[str, List[int]] = {}
+        self._skills_by_talent: Dict[int, Set[str]] = {}
+        self._lock = threading.RLock()
+        self._rebuild_lock = asyncio.Lock()
+
+        self.last_synced_at: Optional[datetime] = None
+        self.last_checked_at: Optional[float] = None
+        self.last_rebuilt_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._skills_by_talent)
+
+    # ==================== Writes ====================
+
+    def upsert(self, talent_id: int, skills: Iterable[str]) -> None:
+        """Replace the indexed skills of a profile (already normalized)"""
+        new_skills = set(skills)
+        with self._lock:
+            old_skills = self._skills_by_talent.get(talent_id, set())
+            for skill in old_skills - new_skills:
+                self._remove_posting(skill, talent_id)
+            for skill in new_skills - old_skills:
+                insort(self._postings.setdefault(skill, []), talent_id)
+            if new_skills:
+                self._skills_by_talent[talent_id] = new_skills
+            else:
+                self._skills_by_talent.pop(talent_id, None)
+
+    def remove(self, talent_id: int) -> None:
+        self.upsert(talent_id, ())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._skills_by_talent.clear()
+
+    def _remove_posting(self, skill: str, talent_id: int) -> None:
+        posting = self._postings.get(skill)
+        if not posting:
+            return
+        position = bisect_left(posting, talent_id)
+        if position < len(posting) and posting[position] == talent_id:
+            del posting[position]
+        if not posting:
+            del self._postings[skill]
+
+    def index_talent(self, talent) -> None:
+        """Refresh a single talent profile after a write"""
+        self.upsert(talent.id, skill_names(talent.skills))
+
+    # ==================== Queries ====================
+
+    def resolve(self, skill: str, fuzzy: bool = False) -> List[str]:
+        """Indexed skill tokens a requested skill matches"""
+        token = normalize_skill(skill)
+        with self._lock:
+            if not fuzzy:
+                return [token] if token in self._postings else []
+            vocabulary = list(self._postings)
+        matches = difflib.get_close_matches(token, vocabulary, n=self.fuzzy_max_matches, cutoff=self.fuzzy_cutoff)
+        if token in self._postings and token not in matches:
+            matches.insert(0, token)
+        return matches
+
+    def _posting_for(self, tokens: List[str]) -> List[int]:
+        with self._lock:
+            postings = [list(self._postings.get(token, ())) for token in tokens]
+        return postings[0] if len(postings) == 1 else union_sorted(postings)
+
+    def match(self, skills: List[str], mode: str = "all", fuzzy: bool = False) -> List[int]:
+        """
+        Talent IDs having all (or any) of the requested skills
+
+        Args:
+            skills: Requested skill names (free text)
+            mode: "all" for AND, "any" for OR
+            fuzzy: Also match close spellings of each skill
+
+        Returns:
+            Sorted list of talent profile IDs
+        """
+        postings = [self._posting_for(self.resolve(skill, fuzzy)) for skill in skills if normalize_skill(skill)]
+        if not postings:
+            return []
+        return union_sorted(postings) if mode == "any" else intersect_sorted(postings)
+
+    # ==================== Sync ====================
+
+    async def sync(self, db) -> None:
+        """
+        Bring the index up to date with the database (AsyncSession)
+
+        The first call (and every SKILL_INDEX_REBUILD_SECONDS) loads every
+        profile's skills into new posting lists, built in a worker thread and
+        then swapped in; one request rebuilds while the others keep querying
+        the current index. In between, at most once every
+        SKILL_INDEX_SYNC_SECONDS, only profiles updated since the last sync
+        are read.
+        """
+        now = time.monotonic()
+        needs_rebuild = self.last_rebuilt_at is None or now - self.last_rebuilt_at >= self.rebuild_seconds
+
+        if needs_rebuild:
+            rebuilt_at = self.last_rebuilt_at
+            if self._rebuild_lock.locked() and rebuilt_at is not None:
+                # Another request is rebuilding - answer from the current index
+                return
+            async with self._rebuild_lock:
+                if self.last_rebuilt_at != rebuilt_at:
+                    return
+                query = select(TalentProfile.id, TalentProfile.skills, TalentProfile.updated_at)
+                rows = (await db.execute(query.order_by(TalentProfile.id))).all()
+                postings, skills_by_talent, watermark = await asyncio.to_thread(self._build, rows)
+                with self._lock:
+                    # Writes indexed while this was built are newer than the
+                    # watermark, so the next incremental sync reapplies them
+                    self._postings, self._skills_by_talent = postings, skills_by_talent
+                    self.last_synced_at = watermark
+                    self.last_rebuilt_at = self.last_checked_at = now
+            return
+
+        if self.last_checked_at is not None and now - self.last_checked_at < self.sync_seconds:
+            return
+        # Claimed before the query so concurrent requests do not repeat it
+        self.last_checked_at = now
+        query = select(TalentProfile.id, TalentProfile.skills, TalentProfile.updated_at)
+        if self.last_synced_at is not None:
+            # >= so rows sharing the watermark timestamp are never missed
+            query = query.where(TalentProfile.updated_at >= self.last_synced_at)
+        rows = (await db.execute(query)).all()
+
+        with self._lock:
+            for talent_id, skills, updated_at in rows:
+                self.upsert(talent_id, skill_names(skills))
+                if updated_at and (self.last_synced_at is None or updated_at > self.last_synced_at):
+                    self.last_synced_at = updated_at
+
+    @staticmethod
+    def _build(rows) -> Tuple[Dict[str, List[int]], Dict[int, Set[str]], Optional[datetime]]:
+        """Posting lists for (id, skills, updated_at) rows sorted by id, plus the newest updated_at"""
+        postings: Dict[str, List[int]] = {}
+        skills_by_talent: Dict[int, Set[str]] = {}
+        watermark: Optional[datetime] = None
+        for talent_id, skills, updated_at in rows:
+            names = set(skill_names(skills))
+            if names:
+                skills_by_talent[talent_id] = names
+                for skill in names:
+                    # Rows arrive in id order, so appending keeps each list sorted
+                    postings.setdefault(skill, []).append(talent_id)
+            if updated_at and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+        return postings, skills_by_talent, watermark
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "profiles": len(self._skills_by_talent),
+                "skills": len(self._postings),
+                "postings": sum(len(posting) for posting in self._postings.values()),
+            }
@@ -0,0 +1,153 @@
+"""
+Spatial Index
+In-process grid index over latitude/longitude used to narrow nearby-search candidates
+"""
+
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Approximate kilometers per degree of latitude (used for bounding boxes only)
+KM_PER_DEGREE = 111.32
+
+
+class SpatialIndex:
+    """
+    Geohash-style grid index.
+
+    Points are bucketed into fixed-size lat/lng cells. A radius query first
+    computes the bounding box of the search circle, visits only the cells
+    that overlap it and returns the points inside the box. Exact distances
+    are computed by the caller on this (much smaller) candidate set.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.25):
+        # Snap the cell size so that 360 degrees divides evenly into columns
+        self.columns = max(1, int(round(360.0 / cell_size_deg)))
+        self.cell_size_deg = 360.0 / self.columns
+        self.rows = int(math.ceil(180.0 / self.cell_size_deg))
+
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self._points: Dict[int, Tuple[float, float, Dict]] = {}
+        self._lock = threading.RLock()
+
+        # Sync bookkeeping, managed by MappingService
+        self.last_synced_at: Optional[datetime] = None
+        self.last_checked_at: Optional[float] = None
+        self.last_rebuilt_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _row(self, latitude: float) -> int:
+        return min(self.rows - 1, max(0, int(math.floor((latitude + 90.0) / self.cell_size_deg))))
+
+    def _column(self, longitude: float) -> int:
+        return int(math.floor((longitude + 180.0) / self.cell_size_deg)) % self.columns
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (self._row(latitude), self._column(longitude))
+
+    def upsert(self, key: int, latitude: float, longitude: float, payload: Dict) -> None:
+        """Insert or move a point"""
+        with self._lock:
+            self._discard(key)
+            cell = self._cell(latitude, longitude)
+            self._cells.setdefault(cell, {})[key] = (latitude, longitude)
+            self._points[key] = (latitude, longitude, payload)
+
+    def remove(self, key: int) -> None:
+        """Remove a point if present"""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+            self.last_synced_at = None
+
+    def _discard(self, key: int) -> None:
+        existing = self._points.pop(key, None)
+        if existing is None:
+            return
+        cell = self._cell(existing[0], existing[1])
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._cells[cell]
+
+    @staticmethod
+    def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+        """
+        Bounding box of a search circle
+
+        Returns:
+            (min_lat, max_lat, min_lng, max_lng). Longitudes are None when the
+            box spans every meridian (near the poles or for very large radii).
+        """
+        delta_lat = radius_km / KM_PER_DEGREE
+        min_lat = max(-90.0, latitude - delta_lat)
+        max_lat = min(90.0, latitude + delta_lat)
+
+        if min_lat <= -90.0 or max_lat >= 90.0:
+            return min_lat, max_lat, None, None
+
+        # Widest part of the circle is at the latitude closest to a pole
+        widest_lat = max(abs(min_lat), abs(max_lat))
+        cos_lat = math.cos(math.radians(widest_lat))
+        delta_lng = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 0 else 360.0
+        if delta_lng >= 180.0:
+            return min_lat, max_lat, None, None
+
+        return min_lat, max_lat, longitude - delta_lng, longitude + delta_lng
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[int, float, float, Dict]]:
+        """
+        Return candidate points inside the bounding box of the search circle
+
+        Returns:
+            List of (key, latitude, longitude, payload) tuples. Callers must
+            still apply an exact distance check.
+        """
+        min_lat, max_lat, min_lng, max_lng = self.bounding_box(latitude, longitude, radius_km)
+
+        with self._lock:
+            if min_lng is None:
+                columns = None
+                wraps = False
+            else:
+                first = int(math.floor((min_lng + 180.0) / self.cell_size_deg))
+                last = int(math.floor((max_lng + 180.0) / self.cell_size_deg))
+                columns = {c % self.columns for c in range(first, min(last, first + self.columns - 1) + 1)}
+                wraps = min_lng < -180.0 or max_lng > 180.0
+            first_row, last_row = self._row(min_lat), self._row(max_lat)
+
+            cell_count = (last_row - first_row + 1) * (len(columns) if columns is not None else self.columns)
+            if cell_count <= len(self._cells):
+                cells = [
+                    (row, column)
+                    for row in range(first_row, last_row + 1)
+                    for column in (columns if columns is not None else range(self.columns))
+                ]
+            else:
+                # Sparse index: scanning occupied cells is cheaper than probing empty ones
+                cells = [
+                    cell for cell in self._cells
+                    if first_row <= cell[0] <= last_row and (columns is None or cell[1] in columns)
+                ]
+
+            candidates = []
+            for cell in cells:
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for key, (lat, lng) in bucket.items():
+                    if lat < min_lat or lat > max_lat:
+                        continue
+                    if min_lng is not None and not wraps and (lng < min_lng or lng > max_lng):
+                        continue
+                    candidates.append((key, lat, lng, self._points[key][2]))
+            return candidates
@@ -0,0 +1,340 @@
+"""
+Storage Upload
+Streams uploaded files to Supabase Storage without holding them in memory
+"""
+
+import asyncio
+import base64
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Sequence
+from urllib.parse import quote, urljoin
+
+from app.metrics import Histogram
+from app.supabase_client import SUPABASE_KEY, SUPABASE_URL
+
+# Optional httpx (installed with supabase) for streaming requests
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+TUS_VERSION = "1.0.0"
+# Supabase's resumable endpoint requires 6 MB chunks (except the last)
+TUS_CHUNK_BYTES = 6 * 1024 * 1024
+UPLOAD_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class StorageUploadError(Exception):
+    """Storage rejected the upload or it could not be completed"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def _file_size(upload) -> int:
+    """Size of an UploadFile (its spooled file is seekable)"""
+    if upload.size is not None:
+        return upload.size
+    await upload.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    await upload.seek(0)
+    return size
+
+
+class StorageUploader:
+    """
+    Uploads ``UploadFile`` objects to Supabase Storage by streaming them.
+
+    Starlette spools multipart uploads to a temporary file, so the request
+    body is already on disk; this reads it back in chunks and sends each
+    piece as it is read, so about ``stream_chunk_bytes`` per file is in
+    memory. Files of ``resumable_threshold_bytes`` or more use the TUS
+    resumable endpoint in 6 MB requests; a failed request is retried from
+    the offset the server reports, so a dropped connection resends at most
+    one chunk instead of the whole video.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        resumable_threshold_bytes: int = 20 * 1024 * 1024,
+        stream_chunk_bytes: int = 1024 * 1024,
+        max_retries: int = 3,
+        timeout_seconds: float = 120.0,
+        client: Optional["httpx.AsyncClient"] = None
+    ):
+        self.storage_url = base_url.rstrip("/") + "/storage/v1"
+        self.api_key = api_key
+        self.resumable_threshold_bytes = resumable_threshold_bytes
+        self.stream_chunk_bytes = stream_chunk_bytes
+        self.chunk_bytes = TUS_CHUNK_BYTES
+        self.max_retries = max_retries
+        self.client = client or httpx.AsyncClient(timeout=httpx.Timeout(timeout_seconds, connect=10.0))
+        self.latency = Histogram(UPLOAD_LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+        self._counters = {"uploads": 0, "resumable": 0, "bytes": 0, "chunk_retries": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls) -> "StorageUploader":
+        return cls(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            resumable_threshold_bytes=int(os.getenv("STORAGE_RESUMABLE_THRESHOLD_BYTES", str(20 * 1024 * 1024))),
+            stream_chunk_bytes=int(os.getenv("STORAGE_STREAM_CHUNK_BYTES", str(1024 * 1024))),
+            max_retries=int(os.getenv("STORAGE_UPLOAD_RETRIES", "3")),
+            timeout_seconds=float(os.getenv("STORAGE_UPLOAD_TIMEOUT_SECONDS", "120"))
+        )
+
+    def _headers(self, **extra: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}", "apikey": self.api_key, **extra}
+
+    async def upload(self, bucket: str, path: str, upload, content_type: str) -> int:
+        """
+        Stream ``upload`` to ``bucket``/``path``
+
+        Returns:
+            The number of bytes uploaded
+
+        Raises:
+            StorageUploadError: Storage rejected the upload or retries ran out
+        """
+        started = time.perf_counter()
+        size = await _file_size(upload)
+        resumable = size >= self.resumable_threshold_bytes
+        try:
+            if resumable:
+                await self._upload_resumable(bucket, path, upload, size, content_type)
+            else:
+                await self._upload_stream(bucket, path, upload, size, content_type)
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+        self._count("uploads")
+        self._count("bytes", size)
+        if resumable:
+            self._count("resumable")
+        return size
+
+    async def _read_range(self, upload, offset: int, length: int) -> AsyncIterator[bytes]:
+        """
+        ``length`` bytes of the upload from ``offset``, in ``stream_chunk_bytes`` pieces
+
+        Request bodies are always generators: httpx keeps a sent request in a
+        reference cycle until the garbage collector runs, and an exhausted
+        generator no longer references its data.
+        """
+        await upload.seek(offset)
+        remaining = length
+        while remaining > 0:
+            piece = await upload.read(min(self.stream_chunk_bytes, remaining))
+            if not piece:
+                return
+            remaining -= len(piece)
+            yield piece
+
+    # ==================== Single request ====================
+
+    async def _upload_stream(self, bucket: str, path: str, upload, size: int, content_type: str) -> None:
+        response = await self.client.post(
+            self.object_url(bucket, path),
+            content=self._read_range(upload, 0, size),
+            headers=self._headers(**{
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "x-upsert": "false",
+            })
+        )
+        if response.status_code >= 400:
+            raise StorageUploadError(f"Storage upload failed: {response.text}", response.status_code)
+
+    # ==================== Resumable (TUS) ====================
+
+    async def _upload_resumable(self, bucket: str, path: str, upload, size: int, content_type: str) -> None:
+        metadata = ",".join(
+            f"{key} {base64.b64encode(value.encode()).decode()}"
+            for key, value in (("bucketName", bucket), ("objectName", path), ("contentType", content_type))
+        )
+        created = await self.client.post(
+            f"{self.storage_url}/upload/resumable",
+            headers=self._headers(**{
+                "Tus-Resumable": TUS_VERSION,
+                "Upload-Length": str(size),
+                "Upload-Metadata": metadata,
+                "x-upsert": "false",
+            })
+        )
+        if created.status_code not in (200, 201) or "location" not in created.headers:
+            raise StorageUploadError(f"Could not start resumable upload: {created.text}", created.status_code)
+        location = urljoin(f"{self.storage_url}/upload/resumable", created.headers["location"])
+
+        offset = 0
+        failures = 0
+        while offset < size:
+            length = min(self.chunk_bytes, size - offset)
+            try:
+                response = await self.client.patch(
+                    location,
+                    content=self._read_range(upload, offset, length),
+                    headers=self._headers(**{
+                        "Tus-Resumable": TUS_VERSION,
+                        "Upload-Offset": str(offset),
+                        "Content-Length": str(length),
+                        "Content-Type": "application/offset+octet-stream",
+                    })
+                )
+                if response.status_code == 204:
+                    offset = int(response.headers.get("upload-offset", offset + length))
+                    failures = 0
+                    continue
+                if response.status_code != 409 and response.status_code not in RETRYABLE_STATUSES:
+                    raise StorageUploadError(f"Resumable upload failed: {response.text}", response.status_code)
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = type(e).__name__
+
+            # Resume from wherever the server got to
+            failures += 1
+            if failures > self.max_retries:
+                raise StorageUploadError(f"Resumable upload failed at byte {offset} ({error})")
+            self._count("chunk_retries")
+            delay = random.uniform(0, min(10.0, 0.5 * (2 ** failures)))
+            print(f"[STORAGE_UPLOAD] Chunk at {offset} of {path} failed ({error}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            offset = await self._server_offset(location, offset)
+
+    async def _server_offset(self, location: str, fallback: int) -> int:
+        try:
+            response = await self.client.head(location, headers=self._headers(**{"Tus-Resumable": TUS_VERSION}))
+            if response.status_code == 200 and "upload-offset" in response.headers:
+                return int(response.headers["upload-offset"])
+        except httpx.TransportError:
+            pass
+        return fallback
+
+    # ==================== Derived files and downloads ====================
+
+    def object_url(self, bucket: str, path: str) -> str:
+        """Authenticated URL of an object (works for private buckets with the API key headers)"""
+        return f"{self.storage_url}/object/{quote(bucket)}/{quote(path)}"
+
+    def public_url(self, bucket: str, path: str) -> str:
+        """Same URL as ``storage.from_(bucket).get_public_url(path)``"""
+        return f"{self.storage_url}/object/public/{quote(bucket)}/{quote(path)}"
+
+    async def signed_url(self, bucket: str, path: str, expires_in: int = 300) -> str:
+        """
+        Time-limited URL that reads one object without the API key
+
+        Use this (not the key) when another program, such as ffmpeg, has to
+        fetch the object itself.
+        """
+        response = await self.client.post(
+            f"{self.storage_url}/object/sign/{quote(bucket)}/{quote(path)}",
+            json={"expiresIn": expires_in},
+            headers=self._headers()
+        )
+        if response.status_code >= 400:
+            raise StorageUploadError(f"Could not sign storage URL: {response.text}", response.status_code)
+        # signedURL is relative to /storage/v1
+        return self.storage_url + response.json()["signedURL"]
+
+    async def remove(self, bucket: str, paths: Sequence[str]) -> int:
+        """
+        Delete objects from ``bucket`` (missing paths are ignored)
+
+        Returns:
+            The number of objects deleted
+        """
+        if not paths:
+            return 0
+        response = await self.client.request(
+            "DELETE",
+            f"{self.storage_url}/object/{quote(bucket)}",
+            json={"prefixes": list(paths)},
+            headers=self._headers()
+        )
+        if response.status_code >= 400:
+            raise StorageUploadError(f"Storage delete failed: {response.text}", response.status_code)
+        return len(response.json() or [])
+
+    async def upload_bytes(self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool = False) -> int:
+        """Upload a small generated file (thumbnails and the like)"""
+        response = await self.client.post(
+            self.object_url(bucket, path),
+            content=data,
+            headers=self._headers(**{"Content-Type": content_type, "x-upsert": "true" if upsert else "false"})
+        )
+        if response.status_code >= 400:
+            raise StorageUploadError(f"Storage upload failed: {response.text}", response.status_code)
+        self._count("uploads")
+        self._count("bytes", len(data))
+        return len(data)
+
+    async def download(self, bucket: str, path: str, destination: BinaryIO, max_bytes: int) -> int:
+        """
+        Stream an object into ``destination``
+
+        Raises:
+            StorageUploadError: The object is missing or larger than ``max_bytes``
+        """
+        total = 0
+        async with self.client.stream("GET", self.object_url(bucket, path), headers=self._headers()) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise StorageUploadError(f"Storage download failed: {response.text}", response.status_code)
+            async for piece in response.aiter_bytes(self.stream_chunk_bytes):
+                total += len(piece)
+                if total > max_bytes:
+                    raise StorageUploadError(f"Object is larger than {max_bytes} bytes")
+                destination.write(piece)
+        destination.seek(0)
+        return total
+
+    # ==================== Metrics ====================
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["latency_seconds"] = self.latency.snapshot()
+        return counters
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+# Global uploader instance (lazy initialization)
+_storage_uploader: Optional[StorageUploader] = None
+
+
+def get_storage_uploader() -> Optional[StorageUploader]:
+    """
+    Get or create the global uploader
+
+    Returns:
+        The uploader, or None if Supabase is not configured or httpx is missing
+    """
+    global _storage_uploader
+    if _storage_uploader is None and HTTPX_AVAILABLE and SUPABASE_URL and SUPABASE_KEY:
+        _storage_uploader = StorageUploader.from_env()
+    return _storage_uploader
+
+
+async def close_storage_uploader() -> None:
+    global _storage_uploader
+    if _storage_uploader is not None:
+        await _storage_uploader.close()
+        _storage_uploader = None
@@ -0,0 +1,252 @@
+"""
+Text Extraction
+Resume text extraction (PDF, DOCX, plain text) in a process pool, off the event loop
+"""
+
+import asyncio
+import io
+import math
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import PyPDF2
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ExtractionLimitError(ValueError):
+    """The file exceeds the configured extraction limits"""
+
+
+class ExtractionCrashedError(RuntimeError):
+    """A worker process died while extracting the file (even after one retry)"""
+
+
+# ==================== Worker Functions (run in pool processes) ====================
+
+def pdf_page_count(content: bytes) -> int:
+    return len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+
+
+def extract_pdf_pages(content: bytes, start: int, end: int, max_chars: int) -> Tuple[List[str], int]:
+    """
+    Text of pages [start, end) of a PDF
+
+    Returns:
+        (page texts, characters extracted). Stops early once ``max_chars`` is reached.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    pages: List[str] = []
+    total = 0
+    for number in range(start, min(end, len(reader.pages))):
+        page_text = reader.pages[number].extract_text() or ""
+        pages.append(page_text)
+        total += len(page_text)
+        if total >= max_chars:
+            break
+    return pages, total
+
+
+def extract_docx(content: bytes, max_chars: int) -> Tuple[str, int]:
+    """
+    Paragraph text of a DOCX, streamed from word/document.xml
+
+    Reads the XML incrementally instead of building the python-docx object
+    model, includes paragraphs inside tables, and stops at ``max_chars``.
+    Tabs and breaks count only inside runs (``w:tab`` also defines tab
+    stops in paragraph properties).
+
+    Returns:
+        (text, paragraph count)
+    """
+    paragraphs: List[str] = []
+    total = 0
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        with archive.open("word/document.xml") as document:
+            runs: List[str] = []
+            run_depth = 0
+            for event, element in ElementTree.iterparse(document, events=("start", "end")):
+                tag = element.tag
+                if tag == f"{_WORD_NAMESPACE}r":
+                    run_depth += 1 if event == "start" else -1
+                    continue
+                if event == "start":
+                    continue
+                if tag == f"{_WORD_NAMESPACE}t":
+                    runs.append(element.text or "")
+                elif tag == f"{_WORD_NAMESPACE}tab" and run_depth:
+                    runs.append("\t")
+                elif tag in (f"{_WORD_NAMESPACE}br", f"{_WORD_NAMESPACE}cr") and run_depth:
+                    runs.append("\n")
+                elif tag == f"{_WORD_NAMESPACE}p":
+                    paragraph = "".join(runs)
+                    runs = []
+                    paragraphs.append(paragraph)
+                    total += len(paragraph) + 1
+                    element.clear()
+                    if total >= max_chars:
+                        break
+    return "\n".join(paragraphs), len(paragraphs)
+
+
+# ==================== Extractor ====================
+
+class TextExtractor:
+    """
+    Extracts resume text without blocking the event loop.
+
+    Parsing runs in a process pool (PDF parsing is CPU-bound pure Python, so
+    threads would contend on the GIL). PDFs with at least
+    ``parallel_min_pages`` pages are split into page ranges extracted in
+    parallel by several pool processes; page texts are collected in lists
+    and joined once. Files over ``max_bytes`` are rejected, and extraction
+    stops after ``max_pages`` pages or ``max_chars`` characters. If a worker
+    dies (OOM kill, a crash on a hostile file) the pool is replaced and the
+    call retried once, so one bad file cannot disable extraction.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_pages: int = 50,
+        max_chars: int = 200000,
+        parallel_min_pages: int = 8,
+        start_method: Optional[str] = None
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.parallel_min_pages = parallel_min_pages
+        # "spawn" and "forkserver" re-run the launching script in every worker
+        # (start.py would start a second server), so fork where the OS allows it
+        available = multiprocessing.get_all_start_methods()
+        self.start_method = start_method or ("fork" if "fork" in available else "spawn")
+        self._executor: Optional[Executor] = None
+        self._counters = {"files": 0, "pages": 0, "parallel": 0, "truncated": 0, "rejected": 0, "pool_restarts": 0}
+
+    @classmethod
+    def from_env(cls) -> "TextExtractor":
+        return cls(
+            max_workers=int(os.getenv("TEXT_EXTRACTION_WORKERS", "2")),
+            max_bytes=int(os.getenv("TEXT_EXTRACTION_MAX_BYTES", str(10 * 1024 * 1024))),
+            max_pages=int(os.getenv("TEXT_EXTRACTION_MAX_PAGES", "50")),
+            max_chars=int(os.getenv("TEXT_EXTRACTION_MAX_CHARS", "200000")),
+            parallel_min_pages=int(os.getenv("TEXT_EXTRACTION_PARALLEL_MIN_PAGES", "8")),
+            start_method=os.getenv("TEXT_EXTRACTION_START_METHOD") or None
+        )
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method)
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """
+        Create the worker processes now (call at startup)
+
+        With fork, all workers are created on the first submission; doing
+        that before the app is busy keeps request-time latency flat and
+        forks a process that is not yet running request threads.
+        """
+        self._pool().submit(int).result()
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._pool()
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+        raise ExtractionCrashedError("Text extraction failed: the worker process crashed on this file")
+
+    def _replace_pool(self, broken: Executor) -> None:
+        """Drop a pool whose worker died; the next call starts a fresh one"""
+        # Calls that were running on the same pool all fail together; replace it once
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._counters["pool_restarts"] += 1
+        print("[TEXT_EXTRACTION] A worker process died; restarting the extraction pool")
+
+    async def extract(self, content: bytes, filename: str) -> str:
+        """
+        Extract the text of an uploaded file
+
+        Raises:
+            ExtractionLimitError: The file is larger than ``max_bytes``
+        """
+        if len(content) > self.max_bytes:
+            self._counters["rejected"] += 1
+            raise ExtractionLimitError(
+                f"File is too large ({len(content)} bytes); the limit is {self.max_bytes} bytes"
+            )
+        self._counters["files"] += 1
+        extension = filename.lower().split(".")[-1] if "." in filename else ""
+        print(f"[TEXT_EXTRACTION] Extracting text from {filename} ({len(content)} bytes)")
+
+        if extension == "pdf":
+            text = await self._extract_pdf(content)
+        elif extension in ("doc", "docx"):
+            text, paragraphs = await self._call(extract_docx, content, self.max_chars)
+            print(f"[TEXT_EXTRACTION] DOCX has {paragraphs} paragraphs")
+        else:
+            # Plain text (and unknown types) decode directly - cheap enough inline
+            text = content.decode("utf-8", errors="ignore")
+
+        if len(text) > self.max_chars:
+            self._counters["truncated"] += 1
+            text = text[:self.max_chars]
+        print(f"[TEXT_EXTRACTION] Extracted {len(text)} characters")
+        if not text.strip():
+            print(f"[TEXT_EXTRACTION] WARNING: No text extracted from {filename}!")
+        return text
+
+    async def _extract_pdf(self, content: bytes) -> str:
+        page_count = await self._call(pdf_page_count, content)
+        pages = min(page_count, self.max_pages)
+        if page_count > self.max_pages:
+            self._counters["truncated"] += 1
+            print(f"[TEXT_EXTRACTION] PDF has {page_count} pages; extracting the first {self.max_pages}")
+        else:
+            print(f"[TEXT_EXTRACTION] PDF has {page_count} pages")
+
+        if pages < self.parallel_min_pages or self.max_workers == 1:
+            ranges = [(0, pages)]
+        else:
+            self._counters["parallel"] += 1
+            step = math.ceil(pages / self.max_workers)
+            ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+
+        # Ranges are joined in page order; a range stops early only at the character cap
+        results = await asyncio.gather(*(
+            self._call(extract_pdf_pages, content, start, end, self.max_chars) for start, end in ranges
+        ))
+        page_texts: List[str] = []
+        total = 0
+        for texts, characters in results:
+            page_texts.extend(texts)
+            total += characters
+            if total >= self.max_chars:
+                break
+        self._counters["pages"] += len(page_texts)
+        return "\n".join(page_texts) + "\n"
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, "workers": self.max_workers}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,125 @@
+"""
+Token Budget
+Local token counting and input trimming so prompts stay within a token budget
+"""
+
+import json
+import math
+import threading
+from typing import Any, Dict, Iterable, List
+
+# Optional tiktoken for exact counts - falls back to a character estimate
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Average characters per token for English text with the GPT tokenizers
+CHARS_PER_TOKEN = 4
+# Framing tokens added per chat message (role, separators) and per request
+MESSAGE_OVERHEAD_TOKENS = 4
+REQUEST_OVERHEAD_TOKENS = 3
+TRIM_MARKER = "\n[... truncated ...]"
+
+
+def compact_json(data: Any) -> str:
+    """JSON without indentation or spaces after separators (indent=2 roughly doubles the tokens)"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune_empty(data: Any, drop_keys: Iterable[str] = ()) -> Any:
+    """Copy of ``data`` without null/empty values and without ``drop_keys`` (at any depth)"""
+    drop = set(drop_keys)
+    if isinstance(data, dict):
+        pruned = {key: prune_empty(value, drop) for key, value in data.items() if key not in drop}
+        return {key: value for key, value in pruned.items() if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        return [item for item in (prune_empty(value, drop) for value in data) if item not in (None, "", [], {})]
+    return data
+
+
+class TokenBudget:
+    """
+    Counts tokens locally and trims variable prompt input to a budget.
+
+    Uses the model's tiktoken encoding when tiktoken is installed, otherwise
+    estimates ``CHARS_PER_TOKEN`` characters per token (slightly
+    conservative for English). Only the variable part of a prompt is ever
+    trimmed; the static instructions are left byte-identical so the
+    upstream prompt prefix cache keeps matching.
+    """
+
+    def __init__(self, model: str, input_tokens: int = 12000):
+        self.model = model
+        self.input_tokens = input_tokens
+        self._encoding = self._load_encoding(model)
+        self._lock = threading.Lock()
+        self._counters = {"trimmed_inputs": 0, "trimmed_tokens": 0}
+
+    @staticmethod
+    def _load_encoding(model: str):
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # The encoding files are downloaded on first use; offline hosts estimate instead
+            print(f"[TOKEN_BUDGET] tiktoken encoding unavailable ({e}); estimating token counts")
+            return None
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens of a chat request"""
+        return REQUEST_OVERHEAD_TOKENS + sum(
+            MESSAGE_OVERHEAD_TOKENS + self.count(message.get("content") or "") for message in messages
+        )
+
+    def fit(self, text: str, max_tokens: int) -> str:
+        """
+        ``text`` cut to at most ``max_tokens`` tokens
+
+        Cuts at the last line break before the limit when there is one in
+        the final quarter, and appends a truncation marker.
+        """
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+        limit = max(0, max_tokens - self.count(TRIM_MARKER))
+        if self._encoding is not None:
+            trimmed = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:limit])
+        else:
+            trimmed = text[:limit * CHARS_PER_TOKEN]
+        line_end = trimmed.rfind("\n")
+        if line_end > len(trimmed) * 3 // 4:
+            trimmed = trimmed[:line_end]
+        with self._lock:
+            self._counters["trimmed_inputs"] += 1
+            self._counters["trimmed_tokens"] += tokens - self.count(trimmed)
+        return trimmed + TRIM_MARKER
+
+    def fit_input(self, text: str, *static_parts: str) -> str:
+        """``text`` trimmed so it plus the static prompt parts fit the input budget"""
+        # Chat framing for a system + user message pair counts against the budget too
+        static_tokens = REQUEST_OVERHEAD_TOKENS + 2 * MESSAGE_OVERHEAD_TOKENS + sum(self.count(part) for part in static_parts)
+        return self.fit(text, max(0, self.input_tokens - static_tokens))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["input_tokens"] = self.input_tokens
+        counters["exact"] = self.exact
+        return counters
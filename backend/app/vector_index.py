@@ -0,0 +1,199 @@
+"""
+Vector Index
+In-process approximate nearest-neighbour index over float16 embeddings
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Rows converted to float32 at a time during scans (bounds temporary memory)
+_SCAN_BLOCK = 8192
+
+
+class VectorIndex:
+    """
+    Inverted-file (IVF) index with cosine similarity.
+
+    Vectors are stored as float16. Below ``exact_limit`` vectors every query
+    is an exact scan. Above it, k-means partitions the vectors into about
+    sqrt(n) lists and a query scans only the ``probes`` lists whose centroids
+    are closest. Vectors added after the last training are kept in a small
+    side list that is always scanned, and the index retrains once that list
+    grows past ``retrain_fraction`` of the trained size.
+    """
+
+    def __init__(self, dimensions: int, exact_limit: int = 20000, probes: int = 8, retrain_fraction: float = 0.2):
+        self.dimensions = dimensions
+        self.exact_limit = exact_limit
+        self.probes = probes
+        self.retrain_fraction = retrain_fraction
+
+        self._vectors = np.zeros((0, dimensions), dtype=np.float16)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._slot_by_id: Dict[int, int] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._untrained: Set[int] = set()
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    # ==================== Writes ====================
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        vectors = np.zeros((capacity, self.dimensions), dtype=np.float16)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._ids, self._alive = vectors, ids, alive
+
+    def upsert(self, key: int, vector: np.ndarray) -> None:
+        """Insert or replace a vector (should already be L2-normalized)"""
+        with self._lock:
+            self._discard(key)
+            self._grow(self._size + 1)
+            slot = self._size
+            self._vectors[slot] = vector
+            self._ids[slot] = key
+            self._alive[slot] = True
+            self._size += 1
+            self._slot_by_id[key] = slot
+            self._untrained.add(slot)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: int) -> None:
+        slot = self._slot_by_id.pop(key, None)
+        if slot is not None:
+            # Tombstone; the slot is reclaimed at the next retrain
+            self._alive[slot] = False
+            self._untrained.discard(slot)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = np.zeros((0, self.dimensions), dtype=np.float16)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._alive = np.zeros(0, dtype=bool)
+            self._size = 0
+            self._slot_by_id = {}
+            self._centroids = None
+            self._lists = []
+            self._untrained = set()
+            self._trained_size = 0
+
+    def get(self, key: int) -> Optional[np.ndarray]:
+        with self._lock:
+            slot = self._slot_by_id.get(key)
+            return None if slot is None else self._vectors[slot].astype(np.float32)
+
+    # ==================== Training ====================
+
+    def _compact(self) -> None:
+        """Drop tombstoned slots"""
+        live = np.flatnonzero(self._alive[:self._size])
+        self._vectors = self._vectors[live].copy()
+        self._ids = self._ids[live].copy()
+        self._alive = np.ones(len(live), dtype=bool)
+        self._size = len(live)
+        self._slot_by_id = {int(key): slot for slot, key in enumerate(self._ids)}
+
+    def _train(self, iterations: int = 8, sample_size: int = 50000, seed: int = 0) -> None:
+        self._compact()
+        count = self._size
+        clusters = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        sample = self._vectors[rng.choice(count, size=min(sample_size, count), replace=False)].astype(np.float32)
+        centroids = sample[rng.choice(len(sample), size=clusters, replace=False)]
+
+        # Spherical k-means: assign by cosine, re-center and re-normalize
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        assignment = np.concatenate([
+            np.argmax(self._vectors[start:start + _SCAN_BLOCK].astype(np.float32) @ centroids.T, axis=1)
+            for start in range(0, count, _SCAN_BLOCK)
+        ]) if count else np.zeros(0, dtype=np.int64)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(clusters + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(clusters)]
+        self._centroids = centroids
+        self._untrained = set()
+        self._trained_size = count
+
+    def _maybe_train(self) -> None:
+        live = len(self._slot_by_id)
+        if live < self.exact_limit:
+            return
+        if self._centroids is None or len(self._untrained) > self.retrain_fraction * max(1, self._trained_size):
+            self._train()
+
+    # ==================== Search ====================
+
+    def _scores(self, slots: np.ndarray, query: np.ndarray) -> np.ndarray:
+        return np.concatenate([
+            self._vectors[slots[start:start + _SCAN_BLOCK]].astype(np.float32) @ query
+            for start in range(0, len(slots), _SCAN_BLOCK)
+        ]) if len(slots) else np.zeros(0, dtype=np.float32)
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        if self._centroids is None or len(self._slot_by_id) < self.exact_limit:
+            return np.flatnonzero(self._alive[:self._size])
+        nearest = np.argsort(-(self._centroids @ query))[:self.probes]
+        slots = np.concatenate([self._lists[i] for i in nearest] + [np.fromiter(self._untrained, dtype=np.int64)])
+        return slots[self._alive[slots]]
+
+    def search(self, query: np.ndarray, limit: int = 10, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        Nearest neighbours of ``query`` by cosine similarity
+
+        Returns:
+            List of (key, similarity), best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        query = query / norm
+        excluded = set(exclude)
+
+        with self._lock:
+            self._maybe_train()
+            slots = self._candidates(query)
+            scores = self._scores(slots, query)
+            ids = self._ids[slots]
+
+        wanted = min(len(scores), limit + len(excluded))
+        if not wanted:
+            return []
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = [(int(ids[i]), float(scores[i])) for i in top if int(ids[i]) not in excluded]
+        return results[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "vectors": len(self._slot_by_id),
+                "lists": len(self._lists),
+                "untrained": len(self._untrained),
+            }
@@ -0,0 +1,163 @@
+"""
+Async database benchmark
+Compares the job listing query served through the sync SessionLocal (what the
+routes used before) with the AsyncSession path, under concurrent requests
+
+Each request runs the /api/jobs query through an in-process FastAPI app. With
+SQLite, --query-latency-ms adds a per-statement delay that stands in for the
+network round trip to a hosted Postgres; a real Postgres URL has its own.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_db --requests 400 --concurrency 50 --query-latency-ms 5
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_async_db
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to a temporary SQLite file")
+    parser.add_argument("--jobs", type=int, default=2000, help="Jobs to seed when the table is empty")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20, help="Page size per request")
+    parser.add_argument("--query-latency-ms", type=float, default=5.0)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_async_db.db"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+from app import database  # noqa: E402
+from app.models import BusinessProfile, Job  # noqa: E402
+
+
+def seed() -> None:
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        if db.query(Job.id).first() is None:
+            business = BusinessProfile(name="Benchmark Business")
+            db.add(business)
+            db.flush()
+            db.add_all([
+                Job(
+                    business_profile_id=business.id,
+                    title=f"Job {i}",
+                    description="Synthetic benchmark job",
+                    status="published",
+                    is_active=True
+                )
+                for i in range(args.jobs)
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def add_latency(sync_engine) -> None:
+    """
+    Delay every SQLite statement inside the thread that executes it
+
+    Uses sqlite3's trace callback rather than an engine event: engine events
+    for the async engine run on the event loop thread, while the statement
+    itself runs in aiosqlite's worker thread.
+    """
+    delay = args.query_latency_ms / 1000
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # aiosqlite adapter -> aiosqlite.Connection -> sqlite3.Connection
+        raw = getattr(getattr(dbapi_connection, "_connection", None), "_conn", dbapi_connection)
+        raw.set_trace_callback(lambda statement: time.sleep(delay))
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_jobs(db=Depends(database.get_db)):
+        # The pre-port pattern: an async route on a blocking session
+        jobs = db.query(Job).filter(Job.is_active == True).order_by(Job.created_at.desc()).limit(args.limit).all()  # noqa: E712
+        return {"count": len(jobs)}
+
+    @app.get("/async")
+    async def async_jobs(db=Depends(database.get_async_db)):
+        query = select(Job).where(Job.is_active == True).order_by(Job.created_at.desc()).limit(args.limit)  # noqa: E712
+        jobs = (await db.execute(query)).scalars().all()
+        return {"count": len(jobs)}
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str):
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    lag = {"max": 0.0}
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        # How late the event loop wakes a 10 ms timer while requests run
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag["max"] = max(lag["max"], time.perf_counter() - started - 0.01)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    monitor = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    latencies.sort()
+    return {
+        "throughput": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "loop_lag_ms": lag["max"] * 1000,
+    }
+
+
+async def main() -> None:
+    seed()
+    if args.query_latency_ms > 0 and database.engine.url.get_backend_name() == "sqlite":
+        add_latency(database.engine)
+        add_latency(database.async_engine.sync_engine)
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/sync")
+        await client.get("/async")
+        results = {path: await run(client, f"/{path}") for path in ("sync", "async")}
+    await database.dispose_async_engine()
+
+    print(f"database:    {database.engine.url.get_backend_name()}, {args.query_latency_ms} ms per statement")
+    print(f"requests:    {args.requests} at concurrency {args.concurrency}")
+    for path, result in results.items():
+        print(
+            f"{path:>6}: {result['throughput']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+            f"p95 {result['p95_ms']:7.1f} ms  max loop lag {result['loop_lag_ms']:7.1f} ms"
+        )
+    print(f"speedup:     {results['async']['throughput'] / results['sync']['throughput']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Search benchmark
+Compares ranked full-text search (text_search: FTS5 on SQLite, tsvector on
+PostgreSQL) with the previous leading-wildcard ILIKE filters on the jobs table
+
+ILIKE sorted by created_at can stop after the newest ``limit`` matches, so it
+is only competitive for terms that match most rows; rare, absent and
+multi-word terms force it to scan the table. Ranked search always scores
+every match (that is what ranks them) but only visits matching rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --jobs 50000
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_search
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Defaults to a temporary SQLite file")
+    parser.add_argument("--jobs", type=int, default=50_000, help="Jobs to seed when the table is empty")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_search.db"
+
+from sqlalchemy import or_, select  # noqa: E402
+
+from app import database, search  # noqa: E402
+from app.models import BusinessProfile, Job  # noqa: E402
+from app.pagination import created_at_keys, keyset_page  # noqa: E402
+
+TITLES = ["Software Engineer", "Data Analyst", "Registered Nurse", "Electrician", "Sales Manager",
+          "Chef", "Accountant", "Graphic Designer", "Warehouse Operator", "Teacher"]
+SKILLS = ("python react kubernetes excel payroll forklift hospitality welding marketing budgeting "
+          "scheduling compliance logistics analytics teaching nursing retail cooking plumbing carpentry").split()
+# Skills follow a Zipf-like distribution, so queries range from very common to rare
+SKILL_WEIGHTS = [1 / (rank + 1) ** 2 for rank in range(len(SKILLS))]
+FILLER = "team role experience work customers support daily duties fast paced environment opportunity".split()
+# Common, rare, absent and multi-word queries
+QUERIES = ["engineer", "python", "welding", "carpentry", "blockchain", "forklift compliance", "data analytics reporting"]
+
+
+def seed() -> None:
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        if db.query(Job.id).first() is not None:
+            return
+        rng = random.Random(args.seed)
+        business = BusinessProfile(name="Benchmark Business")
+        db.add(business)
+        db.flush()
+        for start in range(0, args.jobs, 5000):
+            db.add_all([
+                Job(
+                    business_profile_id=business.id,
+                    title=rng.choice(TITLES),
+                    description=" ".join(rng.choices(FILLER, k=50) + rng.choices(SKILLS, SKILL_WEIGHTS, k=3)),
+                    requirements=" ".join(rng.choices(SKILLS, SKILL_WEIGHTS, k=2)),
+                    status="published",
+                    is_active=True
+                )
+                for _ in range(min(5000, args.jobs - start))
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def ilike_query(term: str):
+    """The pre-search implementation of get_public_jobs' keyword filter"""
+    stmt = select(Job).where(Job.is_active == True, or_(  # noqa: E712
+        Job.title.ilike(f"%{term}%"),
+        Job.description.ilike(f"%{term}%")
+    ))
+    return keyset_page(stmt, created_at_keys(Job), None, args.limit, 0)
+
+
+def ranked_query(term: str):
+    stmt, keys, _ = search.text_search(select(Job).where(Job.is_active == True), "job", term)  # noqa: E712
+    return keyset_page(stmt, keys, None, args.limit, 0)
+
+
+def time_query(db, stmt) -> float:
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        db.execute(stmt).all()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    seed()
+    print(f"database: {database.engine.url.get_backend_name()}, search backend: {search.search_backend or 'ILIKE only'}")
+    db = database.SessionLocal()
+    try:
+        print(f"jobs:     {db.query(Job.id).count()}")
+        print(f"{'query':<26}{'matches':>8}{'ILIKE ms':>10}{'ranked ms':>11}{'speedup':>9}")
+        for term in QUERIES:
+            matches = db.execute(search.text_search(
+                select(Job.id).where(Job.is_active == True), "job", term  # noqa: E712
+            )[0]).all()
+            ilike_ms = time_query(db, ilike_query(term))
+            ranked_ms = time_query(db, ranked_query(term))
+            print(f"{term:<26}{len(matches):>8}{ilike_ms:>10.2f}{ranked_ms:>11.2f}{ilike_ms / ranked_ms:>8.2f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
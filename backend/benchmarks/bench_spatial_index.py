@@ -0,0 +1,88 @@
+"""
+Spatial index benchmark
+Compares the grid-indexed nearby search with the previous full scan (geopy.geodesic per row)
+
+Usage (from backend/):
+    python -m benchmarks.bench_spatial_index --profiles 100000 --radius 25
+"""
+
+import argparse
+import random
+import time
+
+from geopy.distance import geodesic
+
+from app.mapping_service import MappingService
+from app.spatial_index import SpatialIndex
+
+# Rough bounding box of mainland Australia, where the synthetic profiles are placed
+LAT_RANGE = (-38.0, -12.0)
+LNG_RANGE = (115.0, 153.0)
+
+
+def synthetic_profiles(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        {"id": i, "name": f"Business {i}", "latitude": rng.uniform(*LAT_RANGE), "longitude": rng.uniform(*LNG_RANGE)}
+        for i in range(count)
+    ]
+
+
+def full_scan(profiles, latitude: float, longitude: float, radius_km: float):
+    """The pre-index implementation: exact distance to every row"""
+    results = []
+    for profile in profiles:
+        distance = geodesic((latitude, longitude), (profile["latitude"], profile["longitude"])).kilometers
+        if distance <= radius_km:
+            results.append({**profile, "distance_km": round(distance, 2)})
+    return results
+
+
+def indexed(index: SpatialIndex, latitude: float, longitude: float, radius_km: float):
+    candidates = index.query_radius(latitude, longitude, radius_km)
+    return MappingService._within_radius(latitude, longitude, radius_km, candidates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--radius", type=float, default=25.0, help="Search radius in km")
+    parser.add_argument("--queries", type=int, default=200, help="Indexed queries to time")
+    parser.add_argument("--scan-queries", type=int, default=3, help="Full-scan queries to time (slow)")
+    parser.add_argument("--cell-degrees", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    profiles = synthetic_profiles(args.profiles, args.seed)
+    rng = random.Random(args.seed + 1)
+    centers = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(max(args.queries, args.scan_queries))]
+
+    started = time.perf_counter()
+    index = SpatialIndex(args.cell_degrees)
+    for profile in profiles:
+        index.upsert(profile["id"], profile["latitude"], profile["longitude"], profile)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for latitude, longitude in centers[:args.queries]:
+        indexed(index, latitude, longitude, args.radius)
+    indexed_ms = (time.perf_counter() - started) * 1000 / args.queries
+
+    started = time.perf_counter()
+    mismatches = 0
+    for latitude, longitude in centers[:args.scan_queries]:
+        expected = {row["id"] for row in full_scan(profiles, latitude, longitude, args.radius)}
+        if expected != {row["id"] for row in indexed(index, latitude, longitude, args.radius)}:
+            mismatches += 1
+    scan_ms = (time.perf_counter() - started) * 1000 / max(1, args.scan_queries)
+
+    print(f"profiles:          {args.profiles}")
+    print(f"index build:       {build_seconds:.2f} s")
+    print(f"indexed query:     {indexed_ms:.2f} ms (mean of {args.queries})")
+    print(f"full scan query:   {scan_ms:.0f} ms (mean of {args.scan_queries})")
+    print(f"speedup:           {scan_ms / indexed_ms:.0f}x")
+    print(f"result mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Text extraction benchmark
+Compares the process-pool TextExtractor with the previous inline PyPDF2
+extraction (string concatenation and a print per page, on the event loop)
+over a corpus of synthetic multi-page resume PDFs
+
+For each PDF size it reports the extraction time and the longest event loop
+stall seen while the extraction ran, then the throughput of concurrent
+uploads. Parallel page ranges only pay off with more than one CPU core.
+
+Usage (from backend/):
+    python -m benchmarks.bench_text_extraction
+    python -m benchmarks.bench_text_extraction --pages 1,4,40 --workers 4 --out /tmp/resume_corpus
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import time
+from typing import List
+
+import PyPDF2
+
+from app.text_extraction import TextExtractor
+
+FIRST_NAMES = ["Alex", "Priya", "Sam", "Jordan", "Mei", "Liam", "Aisha", "Noah"]
+COMPANIES = ["Canva", "Atlassian", "Telstra", "Westpac", "Woolworths", "CSIRO", "Qantas", "BHP"]
+TITLES = ["Software Engineer", "Registered Nurse", "Data Analyst", "Project Manager", "Electrician", "Chef"]
+WORDS = ("delivered managed designed improved reduced customers platform team budget safety compliance "
+         "reporting stakeholders migration training rostering analytics quality automation").split()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="1,2,4,12,40", help="Comma-separated page counts of the corpus PDFs")
+    parser.add_argument("--lines", type=int, default=45, help="Text lines per page")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="TextExtractor processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous uploads in the throughput run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per PDF")
+    parser.add_argument("--out", help="Also write the corpus PDFs to this directory")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+# ==================== Corpus ====================
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def resume_lines(rng: random.Random, pages: int, lines_per_page: int) -> List[List[str]]:
+    """Resume-like text, one list of lines per page"""
+    lines = [f"{rng.choice(FIRST_NAMES)} Example - {rng.choice(TITLES)}", "Experience"]
+    while len(lines) < pages * lines_per_page:
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2005, 2024)} - Present)")
+        for _ in range(rng.randint(2, 5)):
+            lines.append("- " + " ".join(rng.choices(WORDS, k=rng.randint(6, 12))).capitalize())
+    return [lines[page * lines_per_page:(page + 1) * lines_per_page] for page in range(pages)]
+
+
+def build_pdf(page_lines: List[List[str]]) -> bytes:
+    """A minimal text-only PDF (Helvetica, one content stream per page)"""
+    page_count = len(page_lines)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    kids = " ".join(f"{4 + 2 * page} 0 R" for page in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page, lines in enumerate(page_lines):
+        commands = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        commands.extend(f"({_escape(line)}) Tj T*" for line in lines)
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * page} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    output.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+# ==================== Extraction paths ====================
+
+def legacy_extract(content: bytes) -> str:
+    """The pre-pool AIService._extract_from_pdf, logging included"""
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    text = ""
+    print(f"[AI_SERVICE] PDF has {len(reader.pages)} pages")
+    for i, page in enumerate(reader.pages):
+        page_text = page.extract_text()
+        text += page_text + "\n"
+        print(f"[AI_SERVICE] Page {i+1}: extracted {len(page_text)} characters")
+    return text
+
+
+async def legacy_extract_async(content: bytes, filename: str) -> str:
+    # The old extractor ran inline in the upload coroutine
+    return legacy_extract(content)
+
+
+async def timed(extract, content: bytes, filename: str):
+    """(seconds, longest event loop stall in seconds, text)"""
+    stalls = [0.0]
+    running = True
+
+    async def ticker():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last - 0.001)
+            last = now
+
+    probe = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    text = await extract(content, filename)
+    elapsed = time.perf_counter() - started
+    running = False
+    await probe
+    return elapsed, stalls[0], text
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    page_counts = [int(pages) for pages in args.pages.split(",")]
+    corpus = [(pages, build_pdf(resume_lines(rng, pages, args.lines))) for pages in page_counts]
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for pages, content in corpus:
+            with open(os.path.join(args.out, f"resume_{pages:03d}_pages.pdf"), "wb") as pdf:
+                pdf.write(content)
+        print(f"corpus written to {args.out}")
+
+    extractor = TextExtractor(max_workers=args.workers, max_pages=max(page_counts), max_chars=10 ** 9)
+    extractor.start()
+    print(f"cpus: {os.cpu_count()}, extractor processes: {extractor.max_workers}")
+    print(f"{'pages':>5}{'KB':>7}{'inline ms':>11}{'pool ms':>9}{'inline stall ms':>17}{'pool stall ms':>15}")
+    try:
+        for pages, content in corpus:
+            filename = f"resume_{pages}.pdf"
+            results = {}
+            for name, extract in (("inline", legacy_extract_async), ("pool", extractor.extract)):
+                runs = []
+                for _ in range(args.repeat):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        runs.append(await timed(extract, content, filename))
+                results[name] = runs
+            assert results["inline"][0][2] == results["pool"][0][2], f"{pages}-page output differs"
+            inline_ms, pool_ms = (statistics.median(r[0] for r in results[n]) * 1000 for n in ("inline", "pool"))
+            inline_stall, pool_stall = (max(r[1] for r in results[n]) * 1000 for n in ("inline", "pool"))
+            print(f"{pages:>5}{len(content) / 1024:>7.0f}{inline_ms:>11.1f}{pool_ms:>9.1f}"
+                  f"{inline_stall:>17.1f}{pool_stall:>15.1f}")
+
+        # Concurrent uploads of the whole corpus, as a burst of resume imports would produce
+        uploads = [corpus[number % len(corpus)][1] for number in range(args.concurrency)]
+        print(f"\n{len(uploads)} concurrent uploads ({sum(len(c) for c in uploads) // 1024} KB)")
+        for name, extract in (("inline", legacy_extract_async), ("pool", extractor.extract)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                await asyncio.gather(*(extract(content, "resume.pdf") for content in uploads))
+                elapsed = time.perf_counter() - started
+            print(f"{name:<8}{elapsed * 1000:>9.1f} ms  {len(uploads) / elapsed:>7.1f} files/s")
+    finally:
+        extractor.shutdown()
+
+
+def main() -> None:
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,20 @@ Creerlio Platform - Main Backend Entry Point
 FastAPI application with AI resume parsing, business profiles, and mapping features
 """
 
+import asyncio
 import json
 import time
 import os
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Request, Body, Query
 from pydantic import ValidationError  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
 import uvicorn
 from typing import List, Optional
 from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import defer, joinedload
 
 
 
@@ -23,6 +26,7 @@ from app.models import (
     Location,
     TalentProfile,
     ResumeData,
+    ResumeParseJob,
     User,
     Job,
     Application,
@@ -46,9 +50,27 @@ except ImportError:
     PDF_GENERATOR_AVAILABLE = False
     PDFGenerator = None
 from app.mapping_service import MappingService
+from app.geocode_queue import GeocodeQueue, address_snapshot, compose_address
+from app.skill_index import SkillIndex, ids_filter
+from app.matching import MatchingEngine
+from app.embedding_service import EMBEDDED_MODELS, EmbeddingService
+from app.resume_bulk import ResumeBulkImporter, batch_progress
+from app.resume_jobs import ResumeJobQueue, describe_job
+from app.text_extraction import ExtractionLimitError
 from industry_constants import INDUSTRY_SET
-from app.database import get_db, init_db
+from app.pagination import (
+    keyset_page,
+    split_page,
+    created_at_keys,
+    created_at_values,
+    count_estimate_statement,
+    total_fields,
+)
+from app.search import text_search
+from app.database import get_db, get_async_db, init_db, SessionLocal, get_pool_metrics, dispose_async_engine
 from app.supabase_client import get_supabase, get_supabase_client
+from app.storage_upload import close_storage_uploader, get_storage_uploader
+from app.media_derivatives import PIL_AVAILABLE, MediaDerivativeService, derivative_paths, preview_urls
 from app.auth import (
     UserRegister, UserLogin, UserResponse, Token,
     create_user, authenticate_user, create_access_token,
@@ -112,6 +134,99 @@ if MappingService:
 else:
     print("⚠ MappingService not available (import failed)")
 
+geocode_queue = None
+if mapping_service and SessionLocal:
+    geocode_queue = GeocodeQueue(
+        mapping_service,
+        SessionLocal,
+        batch_size=int(os.getenv("GEOCODE_QUEUE_BATCH_SIZE", "50")),
+        flush_interval=float(os.getenv("GEOCODE_QUEUE_FLUSH_SECONDS", "2.0"))
+    )
+    print("✓ GeocodeQueue initialized")
+
+# Inverted skill index for /api/talent/search (synced from the database on demand)
+skill_index = SkillIndex(
+    fuzzy_cutoff=float(os.getenv("SKILL_FUZZY_CUTOFF", "0.8"))
+)
+
+# Job <-> talent scoring over in-memory feature tables (rebuilt from the database when stale)
+matching_engine = MatchingEngine()
+
+embedding_service = None
+if SessionLocal:
+    try:
+        embedding_service = EmbeddingService.from_env(SessionLocal)
+        print(f"✓ EmbeddingService initialized ({embedding_service.embedder.model_id})")
+    except Exception as e:
+        print(f"⚠ Warning: EmbeddingService initialization failed: {e}")
+        embedding_service = None
+
+
+# Background resume parsing (jobs table; extra worker processes: python -m app.resume_jobs)
+resume_jobs = None
+if ai_service and SessionLocal:
+    resume_jobs = ResumeJobQueue(
+        ai_service,
+        SessionLocal,
+        workers=int(os.getenv("RESUME_JOB_WORKERS", "2")),
+        poll_interval=float(os.getenv("RESUME_JOB_POLL_SECONDS", "2")),
+        lease_seconds=float(os.getenv("RESUME_JOB_LEASE_SECONDS", "600")),
+        retry_delay=float(os.getenv("RESUME_JOB_RETRY_SECONDS", "30")),
+        on_resume_saved=lambda resume_id: embedding_service and embedding_service.enqueue("resume", resume_id)
+    )
+    print(f"✓ ResumeJobQueue initialized ({resume_jobs.workers} in-process workers)")
+
+# Bulk resume imports (zip archives / multi-file uploads) feed the job queue
+resume_bulk = None
+if resume_jobs:
+    resume_bulk = ResumeBulkImporter(
+        SessionLocal,
+        file_hash=ai_service.parse_cache.file_hash,
+        max_bytes=ai_service.text_extractor.max_bytes,
+        max_files=int(os.getenv("RESUME_BULK_MAX_FILES", "500")),
+        insert_batch_size=int(os.getenv("RESUME_BULK_INSERT_BATCH", "50")),
+        max_attempts=int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "2"))
+    )
+    print("✓ ResumeBulkImporter initialized")
+
+# Thumbnails, resized variants and video posters for Talent Bank media
+media_derivatives = None
+if not PIL_AVAILABLE:
+    print("⚠ MediaDerivativeService not available (Pillow is not installed)")
+elif SessionLocal and get_storage_uploader():
+    media_derivatives = MediaDerivativeService.from_env(SessionLocal, get_storage_uploader())
+    posters = "on" if media_derivatives.ffmpeg_path else "off, ffmpeg not found"
+    print(f"✓ MediaDerivativeService initialized (video posters {posters})")
+
+
+def queue_embedding(entity: str, row):
+    """Schedule (re-)embedding of a freshly written row"""
+    if embedding_service:
+        embedding_service.enqueue(entity, row.id)
+
+
+def queue_embedding_check(entity: str, row_id):
+    """Re-check a row changed outside the ORM (e.g. through Supabase) so its embedding follows its visibility"""
+    if embedding_service and row_id is not None and str(row_id).isdigit():
+        embedding_service.enqueue(entity, int(row_id))
+
+
+def queue_geocode(entity: str, row, previous_address: Optional[tuple] = None):
+    """
+    Schedule background geocoding for a freshly written row.
+
+    New rows are queued when they have no coordinates; updated rows are
+    queued when any address field changed (pass the pre-update snapshot).
+    """
+    if not geocode_queue:
+        return
+    if previous_address is None:
+        if (row.latitude is not None and row.longitude is not None) or not compose_address(row):
+            return
+    elif address_snapshot(row) == previous_address:
+        return
+    geocode_queue.enqueue_row(entity, row)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -129,11 +244,50 @@ async def lifespan(app: FastAPI):
         import traceback
         traceback.print_exc()
     
+    if geocode_queue:
+        await geocode_queue.start()
+        print("✓ Geocode queue worker started")
+    
+    if embedding_service:
+        await embedding_service.start()
+        print("✓ Embedding worker started")
+    
+    if ai_service:
+        try:
+            ai_service.text_extractor.start()
+            print(f"✓ Text extraction pool started ({ai_service.text_extractor.max_workers} processes)")
+        except Exception as e:
+            print(f"⚠ Warning: Text extraction pool failed to start: {e}")
+    
+    if resume_jobs:
+        await resume_jobs.start()
+        print("✓ Resume job workers started")
+    
+    if media_derivatives:
+        await media_derivatives.start()
+        print("✓ Media derivative workers started")
+    
     print("=" * 50)
     print("Application startup complete - ready to accept requests")
     print("=" * 50)
     yield
     
+    if geocode_queue:
+        await geocode_queue.stop()
+    if embedding_service:
+        await embedding_service.stop()
+    if resume_jobs:
+        await resume_jobs.stop()
+    if media_derivatives:
+        await media_derivatives.stop()
+    if mapping_service:
+        mapping_service.async_geocoder.shutdown()
+    if ai_service:
+        ai_service.text_extractor.shutdown()
+        if ai_service.openai_client:
+            await ai_service.openai_client.close()
+    await close_storage_uploader()
+    await dispose_async_engine()
     print("Application shutdown")
 
 
@@ -207,6 +361,39 @@ async def health_check():
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Operational metrics (connection pool, geocoding) - no database access required"""
+    metrics = {
+        "timestamp": datetime.now().isoformat(),
+        "database": get_pool_metrics(),
+    }
+    if mapping_service:
+        metrics["geocode_cache"] = mapping_service.geocode_cache.stats()
+        metrics["geocoder"] = mapping_service.async_geocoder.stats()
+    if geocode_queue:
+        metrics["geocode_queue"] = geocode_queue.stats()
+    if ai_service:
+        metrics["resume_parse_cache"] = ai_service.parse_cache.stats()
+        metrics["text_extraction"] = ai_service.text_extractor.stats()
+        metrics["token_budget"] = ai_service.token_budget.stats()
+        if ai_service.openai_client:
+            metrics["ai"] = ai_service.openai_client.stats()
+    metrics["skill_index"] = skill_index.stats()
+    metrics["matching"] = matching_engine.stats()
+    if embedding_service:
+        metrics["embeddings"] = embedding_service.stats()
+    if resume_jobs:
+        metrics["resume_jobs"] = resume_jobs.stats()
+    if resume_bulk:
+        metrics["resume_bulk"] = resume_bulk.stats()
+    if get_storage_uploader():
+        metrics["storage_uploads"] = get_storage_uploader().stats()
+    if media_derivatives:
+        metrics["media_derivatives"] = media_derivatives.stats()
+    return metrics
+
+
 @app.post("/api/auth/register")
 async def register(request: Request, db=Depends(get_db) if get_db else None):
     """Register a new user - Password completely removed during construction"""
@@ -382,16 +569,37 @@ async def upload_resume(file: UploadFile = File(...), db=Depends(get_db)):
         db.add(resume_data)
         db.commit()
         db.refresh(resume_data)
+        queue_embedding("resume", resume_data)
         
         return {
             "success": True,
             "resume_id": resume_data.id,
             "data": parsed_data
         }
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+RESUME_EXTENSIONS = [".pdf", ".doc", ".docx", ".txt", ".rtf"]
+
+
+def format_experiences(experiences) -> List[dict]:
+    """Parsed work experience entries in the shape the portfolio editor selects from"""
+    return [
+        {
+            "company": exp.get("company", ""),
+            "title": exp.get("title", ""),
+            "start_date": exp.get("start_date", ""),
+            "end_date": exp.get("end_date", ""),
+            "description": exp.get("description", ""),
+            "achievements": exp.get("achievements", [])
+        }
+        for exp in experiences or []
+    ]
+
+
 @app.post("/api/resume/parse")
 async def parse_resume_file(
     file: UploadFile = File(...),
@@ -409,7 +617,7 @@ async def parse_resume_file(
         # Check if file is a resume format
         filename = file.filename or "file"
         extension = os.path.splitext(filename)[1].lower()
-        if extension not in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
+        if extension not in RESUME_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported file format: {extension}. Please upload a PDF, DOC, DOCX, TXT, or RTF file."
@@ -450,17 +658,8 @@ async def parse_resume_file(
                     print(f"[RESUME PARSE] First 500 chars of extracted text: {raw_text[:500]}")
         
         # Format experiences for frontend selection
-        formatted_experiences = []
-        for i, exp in enumerate(experiences):
-            formatted_exp = {
-                "company": exp.get("company", ""),
-                "title": exp.get("title", ""),
-                "start_date": exp.get("start_date", ""),
-                "end_date": exp.get("end_date", ""),
-                "description": exp.get("description", ""),
-                "achievements": exp.get("achievements", [])
-            }
-            formatted_experiences.append(formatted_exp)
+        formatted_experiences = format_experiences(experiences)
+        for i, formatted_exp in enumerate(formatted_experiences):
             print(f"[RESUME PARSE] Experience {i+1}: {formatted_exp.get('title')} at {formatted_exp.get('company')}")
         
         return {
@@ -471,6 +670,8 @@ async def parse_resume_file(
         }
     except HTTPException:
         raise
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
@@ -479,6 +680,116 @@ async def parse_resume_file(
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
 
+@app.post("/api/resume/jobs", status_code=202)
+async def submit_resume_job(
+    file: UploadFile = File(...),
+    store: bool = Query(True, description="Save a resume record from the parsed result"),
+    user_id: Optional[str] = Query(None, description="Optional user ID the job belongs to"),
+    db=Depends(get_async_db)
+):
+    """
+    Queue a resume for background parsing and return immediately.
+    
+    Poll /api/resume/jobs/{job_id} for progress and the parsed result.
+    """
+    if not ai_service or not resume_jobs:
+        raise HTTPException(status_code=503, detail="AI service is not available")
+    
+    filename = file.filename or "file"
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in RESUME_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format: {extension}. Please upload a PDF, DOC, DOCX, TXT, or RTF file."
+        )
+    file_content = await file.read()
+    if not file_content:
+        raise HTTPException(status_code=400, detail="File is empty")
+    max_bytes = ai_service.text_extractor.max_bytes
+    if len(file_content) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File is too large; the limit is {max_bytes} bytes")
+    
+    job = ResumeParseJob(
+        filename=filename,
+        file_size=len(file_content),
+        file_hash=ai_service.parse_cache.file_hash(file_content),
+        file_content=file_content,
+        store_resume=store,
+        user_id=user_id,
+        max_attempts=int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "2"))
+    )
+    db.add(job)
+    await db.commit()
+    resume_jobs.notify()
+    print(f"[RESUME JOBS] Queued job {job.id} for {filename} ({len(file_content)} bytes)")
+    
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/resume/jobs/{job.id}"
+    }
+
+
+@app.get("/api/resume/jobs/{job_id}")
+async def get_resume_job(job_id: int, db=Depends(get_async_db)):
+    """Progress of a background resume parsing job, with the parsed result once it succeeds"""
+    job = await db.get(ResumeParseJob, job_id, options=[defer(ResumeParseJob.file_content)])
+    if not job:
+        raise HTTPException(status_code=404, detail="Resume job not found")
+    
+    summary = describe_job(job)
+    if job.status == "succeeded" and job.result:
+        summary["experiences"] = format_experiences(job.result.get("experience"))
+    return {"success": True, "job": summary}
+
+
+@app.post("/api/resume/bulk", status_code=202)
+async def submit_resume_bulk(
+    files: List[UploadFile] = File(..., description="Resumes and/or .zip archives of resumes"),
+    store: bool = Query(True, description="Save a resume record from each parsed result"),
+    user_id: Optional[str] = Query(None, description="Optional user ID the import belongs to"),
+):
+    """
+    Queue a bulk resume import (zip archives and/or several files) for background parsing.
+    
+    Duplicate files (same content) are parsed once. Poll /api/resume/bulk/{batch_id}
+    for progress.
+    """
+    if not resume_bulk:
+        raise HTTPException(status_code=503, detail="AI service is not available")
+    
+    loop = asyncio.get_running_loop()
+    # Uploads are spooled to disk by the multipart parser; entries are read one at a time
+    batch = await asyncio.to_thread(
+        resume_bulk.ingest,
+        [(upload.filename, upload.file) for upload in files],
+        extensions=RESUME_EXTENSIONS,
+        user_id=user_id,
+        store_resume=store,
+        on_queued=lambda: loop.call_soon_threadsafe(resume_jobs.notify)
+    )
+    return {
+        "success": True,
+        "batch_id": batch["id"],
+        "batch": batch,
+        "status_url": f"/api/resume/bulk/{batch['id']}"
+    }
+
+
+@app.get("/api/resume/bulk/{batch_id}")
+async def get_resume_bulk(
+    batch_id: int,
+    include_files: bool = Query(False, description="Include the per-file status"),
+    db=Depends(get_async_db)
+):
+    """Progress of a bulk resume import"""
+    batch = await db.run_sync(lambda session: batch_progress(session, batch_id, include_files))
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Resume import not found")
+    return {"success": True, "batch": batch}
+
+
 @app.get("/api/resume/{resume_id}")
 async def get_resume(resume_id: int, db=Depends(get_db)):
     """Get parsed resume data"""
@@ -489,10 +800,21 @@ async def get_resume(resume_id: int, db=Depends(get_db)):
 
 
 @app.get("/api/resume")
-async def list_resumes(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    """List all parsed resumes"""
-    resumes = db.query(ResumeData).offset(skip).limit(limit).all()
-    return {"resumes": resumes, "count": len(resumes)}
+async def list_resumes(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db=Depends(get_db)
+):
+    """List parsed resumes, newest first"""
+    query = select(ResumeData)
+    page_query = keyset_page(query, created_at_keys(ResumeData), cursor, limit, skip)
+    resumes, next_cursor = split_page(db.execute(page_query).scalars().all(), limit, created_at_values)
+    response = {"resumes": resumes, "count": len(resumes), "next_cursor": next_cursor}
+    if include_total:
+        response.update(total_fields(db.execute(count_estimate_statement(query)).scalar_one()))
+    return response
 
 
 # ==================== AI Text Polishing ====================
@@ -522,6 +844,54 @@ async def polish_text(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format one server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/ai/polish-text/stream")
+async def polish_text_stream(request: Request):
+    """
+    Polish text, streaming the result as server-sent events
+
+    Sends ``data: {"delta": ...}`` as output is generated, then an ``event: done``
+    with the full polished text (or an ``event: error``). The upstream
+    completion is cancelled as soon as the client disconnects.
+    """
+    if not ai_service or not ai_service.openai_client:
+        raise HTTPException(status_code=503, detail="AI service is not available")
+
+    body = await request.json()
+    text = body.get("text", "")
+    if not text or not isinstance(text, str):
+        raise HTTPException(status_code=400, detail="Text is required and must be a string")
+
+    async def events():
+        deltas = ai_service.polish_text_stream(text)
+        chunks = []
+        try:
+            async for delta in deltas:
+                if await request.is_disconnected():
+                    print("[AI] Client disconnected; cancelling polish-text stream")
+                    return
+                chunks.append(delta)
+                yield _sse_event({"delta": delta})
+            yield _sse_event({"polished_text": "".join(chunks).strip()}, event="done")
+        except Exception as e:
+            print(f"[AI] Error streaming polished text: {e}")
+            yield _sse_event({"detail": str(e)}, event="error")
+        finally:
+            # Closes the upstream response if generation is still running
+            await deltas.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ==================== Business Profiles ====================
 
 @app.post("/api/business")
@@ -532,6 +902,9 @@ async def create_business(business_data: dict, db=Depends(get_db)):
         db.add(business)
         db.commit()
         db.refresh(business)
+        if mapping_service:
+            mapping_service.index_business_profile(business)
+        queue_geocode("business", business)
         return {"success": True, "business": business}
     except Exception as e:
         db.rollback()
@@ -618,6 +991,7 @@ async def update_my_business_profile(
                 raise HTTPException(status_code=400, detail="Invalid industry selection")
 
     # Update allowed fields only
+    previous_address = address_snapshot(business)
     allowed_fields = ["name", "description", "industry", "website", "address", "city", "state", "country", "location", "phone"]
     for field in allowed_fields:
         if field in profile_data:
@@ -625,6 +999,9 @@ async def update_my_business_profile(
     
     db.commit()
     db.refresh(business)
+    if mapping_service:
+        mapping_service.index_business_profile(business)
+    queue_geocode("business", business, previous_address)
     
     return {"success": True, "business": business}
 
@@ -635,22 +1012,24 @@ async def search_businesses(
     location: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db=Depends(get_async_db)
 ):
-    """Search businesses by name, description, or location"""
-    businesses = db.query(BusinessProfile)
-    
-    if query:
-        businesses = businesses.filter(
-            (BusinessProfile.name.ilike(f"%{query}%")) |
-            (BusinessProfile.description.ilike(f"%{query}%"))
-        )
+    """Search businesses by name, description, or location (ranked by relevance when a query is given)"""
+    businesses = select(BusinessProfile)
     
     if location:
-        businesses = businesses.filter(BusinessProfile.location.ilike(f"%{location}%"))
+        businesses = businesses.where(BusinessProfile.location.ilike(f"%{location}%"))
     
-    results = businesses.offset(skip).limit(limit).all()
-    return {"businesses": results, "count": len(results)}
+    businesses, sort_keys, sort_values = text_search(businesses, "business", query)
+    page_query = keyset_page(businesses, sort_keys, cursor, limit, skip)
+    rows, next_cursor = split_page((await db.execute(page_query)).all(), limit, sort_values)
+    results = [row[0] for row in rows]
+    response = {"businesses": results, "count": len(results), "next_cursor": next_cursor}
+    if include_total:
+        response.update(total_fields((await db.execute(count_estimate_statement(businesses))).scalar_one()))
+    return response
 
 
 # NOTE: /api/business/{business_id} routes removed to prevent conflict with /api/business/me
@@ -733,6 +1112,9 @@ async def create_job(job_data: dict, db=Depends(get_db)):
         db.add(job)
         db.commit()
         db.refresh(job)
+        matching_engine.invalidate("job")
+        queue_geocode("job", job)
+        queue_embedding("job", job)
         return {"success": True, "job": job}
     except HTTPException:
         raise
@@ -748,30 +1130,36 @@ async def get_jobs(
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db=Depends(get_async_db)
 ):
     """Get jobs with optional filtering"""
-    query = db.query(Job)
+    query = select(Job)
     
     # Filter by business user (get business_profile_id from user)
     if business_user_id:
-        user = db.query(User).filter(User.id == business_user_id).first()
+        user = await db.get(User, business_user_id)
         if user and user.business_profile_id:
-            query = query.filter(Job.business_profile_id == user.business_profile_id)
+            query = query.where(Job.business_profile_id == user.business_profile_id)
     
     # Filter by business profile
     if business_profile_id:
-        query = query.filter(Job.business_profile_id == business_profile_id)
+        query = query.where(Job.business_profile_id == business_profile_id)
     
     # Filter by status
     if status:
-        query = query.filter(Job.status == status)
+        query = query.where(Job.status == status)
     
     # Only show active jobs
-    query = query.filter(Job.is_active == True)
+    query = query.where(Job.is_active == True)
     
-    jobs = query.offset(skip).limit(limit).all()
-    return {"jobs": jobs, "count": len(jobs)}
+    page_query = keyset_page(query, created_at_keys(Job), cursor, limit, skip)
+    jobs, next_cursor = split_page((await db.execute(page_query)).scalars().all(), limit, created_at_values)
+    response = {"jobs": jobs, "count": len(jobs), "next_cursor": next_cursor}
+    if include_total:
+        response.update(total_fields((await db.execute(count_estimate_statement(query))).scalar_one()))
+    return response
 
 
 @app.get("/api/jobs/public")
@@ -780,31 +1168,32 @@ async def get_public_jobs(
     keyword: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db=Depends(get_async_db)
 ):
-    """Get published jobs (public endpoint)"""
+    """Get published jobs (public endpoint), ranked by relevance when a keyword is given"""
     
-    query = db.query(Job).filter(
+    query = select(Job).where(
         Job.status == "published",
         Job.is_active == True
     )
     
-    if keyword:
-        query = query.filter(
-            (Job.title.ilike(f"%{keyword}%")) |
-            (Job.description.ilike(f"%{keyword}%"))
-        )
-    
     if location:
-        query = query.filter(
+        query = query.where(
             (Job.location.ilike(f"%{location}%")) |
             (Job.city.ilike(f"%{location}%")) |
             (Job.country.ilike(f"%{location}%"))
         )
     
-    jobs = query.offset(skip).limit(limit).all()
-    
-    return {"jobs": jobs, "count": len(jobs)}
+    query, sort_keys, sort_values = text_search(query, "job", keyword)
+    page_query = keyset_page(query, sort_keys, cursor, limit, skip)
+    rows, next_cursor = split_page((await db.execute(page_query)).all(), limit, sort_values)
+    jobs = [row[0] for row in rows]
+    response = {"jobs": jobs, "count": len(jobs), "next_cursor": next_cursor}
+    if include_total:
+        response.update(total_fields((await db.execute(count_estimate_statement(query))).scalar_one()))
+    return response
 
 
 @app.post("/api/init-profiles")
@@ -917,6 +1306,21 @@ async def get_job(job_id: int, db=Depends(get_db)):
     return job
 
 
+@app.get("/api/jobs/{job_id}/matches")
+async def get_job_matches(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    db=Depends(get_async_db)
+):
+    """Best-matching talent for a job, scored on skills, experience and distance"""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    result = await matching_engine.match_talent(db, job, limit=limit, min_score=min_score)
+    return {"job_id": job_id, **result, "count": len(result["matches"])}
+
+
 # ==================== Applications ====================
 
 @app.post("/api/applications")
@@ -1015,15 +1419,17 @@ async def get_my_applications(
     if not user.talent_profile_id:
         return {"applications": [], "count": 0}
     
-    # Get applications
-    applications = db.query(Application).filter(
+    # Get applications with their jobs in a single joined query
+    applications = db.query(Application).options(
+        joinedload(Application.job).load_only(Job.title, Job.location, Job.city)
+    ).filter(
         Application.talent_profile_id == user.talent_profile_id
     ).order_by(Application.created_at.desc()).all()
     
     # Include job details
     result = []
     for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
+        job = app.job
         result.append({
             "id": app.id,
             "job_id": app.job_id,
@@ -1067,15 +1473,18 @@ async def get_job_applications(
     elif not user.business_profile_id or user.business_profile_id != job.business_profile_id:
         raise HTTPException(status_code=403, detail="You don't have permission to view applications for this job")
     
-    # Get applications
-    applications = db.query(Application).filter(
+    # Get applications with their talent profiles in a single joined query
+    # (only the columns we return - profiles carry large JSON fields)
+    applications = db.query(Application).options(
+        joinedload(Application.talent_profile).load_only(TalentProfile.name, TalentProfile.email, TalentProfile.title)
+    ).filter(
         Application.job_id == job_id
     ).order_by(Application.created_at.desc()).all()
     
     # Include talent profile details
     result = []
     for app in applications:
-        talent = db.query(TalentProfile).filter(TalentProfile.id == app.talent_profile_id).first()
+        talent = app.talent_profile
         result.append({
             "id": app.id,
             "talent_profile_id": app.talent_profile_id,
@@ -1101,21 +1510,18 @@ async def create_talent(talent_data: dict, db=Depends(get_db)):
         db.add(talent)
         db.commit()
         db.refresh(talent)
+        if mapping_service:
+            mapping_service.index_talent_profile(talent)
+        skill_index.index_talent(talent)
+        matching_engine.invalidate("talent")
+        queue_geocode("talent", talent)
+        queue_embedding("talent", talent)
         return {"success": True, "talent": talent}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/talent/{talent_id}")
-async def get_talent(talent_id: int, db=Depends(get_db)):
-    """Get talent profile by ID"""
-    talent = db.query(TalentProfile).filter(TalentProfile.id == talent_id).first()
-    if not talent:
-        raise HTTPException(status_code=404, detail="Talent not found")
-    return talent
-
-
 @app.get("/api/talent/me")
 async def get_my_talent_profile(
     email: str = Query(..., description="User email address"),
@@ -1168,6 +1574,7 @@ async def update_my_talent_profile(
         user.talent_profile_id = talent.id
     
     # Update allowed fields only
+    previous_address = address_snapshot(talent)
     allowed_fields = ["name", "title", "bio", "skills", "location", "city", "state", "country", "phone"]
     for field in allowed_fields:
         if field in profile_data:
@@ -1175,6 +1582,12 @@ async def update_my_talent_profile(
     
     db.commit()
     db.refresh(talent)
+    if mapping_service:
+        mapping_service.index_talent_profile(talent)
+    skill_index.index_talent(talent)
+    matching_engine.invalidate("talent")
+    queue_geocode("talent", talent, previous_address)
+    queue_embedding("talent", talent)
     return {"success": True, "talent": talent}
 
 
@@ -1182,30 +1595,112 @@ async def update_my_talent_profile(
 async def search_talent(
     query: Optional[str] = None,
     skills: Optional[str] = None,
+    skills_mode: str = Query("all", pattern="^(all|any)$", description="Match all or any of the skills"),
+    fuzzy: bool = Query(False, description="Also match close spellings of skill names"),
     location: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db=Depends(get_async_db)
 ):
-    """Search talent by skills, location, or keywords"""
-    talents = db.query(TalentProfile)
-    
-    if query:
-        talents = talents.filter(
-            (TalentProfile.name.ilike(f"%{query}%")) |
-            (TalentProfile.bio.ilike(f"%{query}%"))
-        )
+    """Search talent by skills, location, or keywords (ranked by relevance when a query is given)"""
+    talents = select(TalentProfile)
     
     if skills:
-        skill_list = [s.strip() for s in skills.split(",")]
-        for skill in skill_list:
-            talents = talents.filter(TalentProfile.skills.contains([skill]))
+        skill_list = [s.strip() for s in skills.split(",") if s.strip()]
+        await skill_index.sync(db)
+        talent_ids = skill_index.match(skill_list, mode=skills_mode, fuzzy=fuzzy)
+        talents = talents.where(ids_filter(TalentProfile.id, talent_ids, db.bind.dialect.name))
     
     if location:
-        talents = talents.filter(TalentProfile.location.ilike(f"%{location}%"))
+        talents = talents.where(TalentProfile.location.ilike(f"%{location}%"))
     
-    results = talents.offset(skip).limit(limit).all()
-    return {"talents": results, "count": len(results)}
+    talents, sort_keys, sort_values = text_search(talents, "talent", query)
+    page_query = keyset_page(talents, sort_keys, cursor, limit, skip)
+    rows, next_cursor = split_page((await db.execute(page_query)).all(), limit, sort_values)
+    results = [row[0] for row in rows]
+    response = {"talents": results, "count": len(results), "next_cursor": next_cursor}
+    if include_total:
+        response.update(total_fields((await db.execute(count_estimate_statement(talents))).scalar_one()))
+    return response
+
+
+@app.get("/api/talent/{talent_id}")
+async def get_talent(talent_id: int, db=Depends(get_db)):
+    """Get talent profile by ID"""
+    talent = db.query(TalentProfile).filter(TalentProfile.id == talent_id).first()
+    if not talent:
+        raise HTTPException(status_code=404, detail="Talent not found")
+    return talent
+
+
+@app.get("/api/talent/{talent_id}/recommended-jobs")
+async def get_recommended_jobs(
+    talent_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    db=Depends(get_async_db)
+):
+    """Published jobs that best match a talent profile"""
+    talent = await db.get(TalentProfile, talent_id)
+    if not talent:
+        raise HTTPException(status_code=404, detail="Talent not found")
+    result = await matching_engine.recommend_jobs(db, talent, limit=limit, min_score=min_score)
+    return {"talent_id": talent_id, **result, "count": len(result["jobs"])}
+
+
+# ==================== Semantic Search ====================
+
+@app.get("/api/search/semantic")
+async def semantic_search(
+    q: str = Query(..., min_length=1, description="Free-text query"),
+    entity: str = Query("job", pattern="^(job|talent|resume)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_async_db)
+):
+    """Jobs, talent profiles or resumes closest in meaning to a free-text query"""
+    if not embedding_service:
+        raise HTTPException(status_code=503, detail="Embedding service is not available")
+    vector = await embedding_service.embed_query(q)
+    results = await embedding_service.search(db, entity, vector, limit=limit)
+    return {"query": q, "entity": entity, "results": results, "count": len(results)}
+
+
+async def find_similar(db, source: str, source_id: int, target: str, limit: int):
+    """Rows of ``target`` whose embeddings are closest to a ``source`` row"""
+    if not embedding_service:
+        raise HTTPException(status_code=503, detail="Embedding service is not available")
+    model = EMBEDDED_MODELS[source][0]
+    row = await db.get(model, source_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"{source.capitalize()} not found")
+    vector = await embedding_service.vector_for(source, source_id, row)
+    exclude = (source_id,) if source == target else ()
+    results = await embedding_service.search(db, target, vector, limit=limit, exclude=exclude)
+    return {f"{source}_id": source_id, "target": target, "results": results, "count": len(results)}
+
+
+@app.get("/api/jobs/{job_id}/similar")
+async def get_similar_to_job(
+    job_id: int,
+    target: str = Query("talent", pattern="^(job|talent|resume)$", description="What to find: candidates, resumes or jobs"),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_async_db)
+):
+    """Candidates (or resumes, or other jobs) semantically similar to a job"""
+    return await find_similar(db, "job", job_id, target, limit)
+
+
+@app.get("/api/talent/{talent_id}/similar")
+async def get_similar_to_talent(
+    talent_id: int,
+    target: str = Query("talent", pattern="^(job|talent)$", description="What to find: similar candidates or jobs"),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_async_db)
+):
+    """Talent profiles (or jobs) semantically similar to a talent profile"""
+    return await find_similar(db, "talent", talent_id, target, limit)
 
 
 # ==================== Talent Bank ====================
@@ -1216,11 +1711,18 @@ async def list_talent_bank_items(
     item_type: Optional[str] = Query(
         None, description="Optional item type filter (e.g. document, experience, education)"
     ),
+    preview: bool = Query(
+        False, description="Return lightweight previews (thumbnail/preview URLs, no metadata) for galleries"
+    ),
     db=Depends(get_db),
 ):
     """
     List talent bank items for the current user.
 
+    With ``preview=true`` each item only carries its id, type, title and the
+    URLs of its generated thumbnail and preview (medium image or video
+    poster), so dashboards don't download the original media.
+
     NOTE: Authentication is simplified for Phase 1 - user is resolved by email.
     In Supabase, RLS additionally enforces that users only see their own items.
     """
@@ -1237,6 +1739,21 @@ async def list_talent_bank_items(
         query = query.filter(TalentBankItem.item_type == item_type)
 
     items = query.order_by(TalentBankItem.created_at.desc()).all()
+    if preview:
+        return {
+            "items": [
+                {
+                    "id": item.id,
+                    "item_type": item.item_type,
+                    "title": item.title,
+                    "file_type": item.file_type,
+                    **preview_urls(item.extra_metadata),
+                    "derivatives_status": (item.extra_metadata or {}).get("derivatives_status"),
+                }
+                for item in items
+            ],
+            "count": len(items),
+        }
     return {
         "items": [
             TalentBankItemResponse(
@@ -1319,7 +1836,10 @@ async def upload_talent_bank_files(
     Files are stored in Supabase Storage bucket:
       talent-bank/{user_id}/<timestamp>_<filename>
 
-    Each uploaded file creates a corresponding TalentBankItem record.
+    Each uploaded file creates a corresponding TalentBankItem record. Files
+    upload concurrently (TALENT_BANK_UPLOAD_CONCURRENCY at a time) and all
+    records are saved in one transaction; ``results`` reports success or
+    the error per file. If saving fails, the uploaded objects are removed.
     """
     user = get_user_by_email(db, email)
     if not user:
@@ -1335,80 +1855,158 @@ async def upload_talent_bank_files(
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
 
-    created_items: List[TalentBankItemResponse] = []
+    uploader = get_storage_uploader()
+    if uploader is None:
+        raise HTTPException(status_code=503, detail="Storage uploads are not available (httpx is not installed)")
+
     bucket_name = "talent-bank"
+    storage = supabase.storage.from_(bucket_name)
+    # Bounded so in-flight upload memory per request stays at about
+    # concurrency x STORAGE_STREAM_CHUNK_BYTES
+    semaphore = asyncio.Semaphore(int(os.getenv("TALENT_BANK_UPLOAD_CONCURRENCY", "4")))
+    base_timestamp = int(time.time() * 1000)
 
-    for file in files:
-        try:
-            content = await file.read()
-            if not content:
-                continue
-
-            # Basic type detection
-            content_type = file.content_type or "application/octet-stream"
-            filename = file.filename or "file"
-            extension = os.path.splitext(filename)[1].lower()
-
-            if content_type.startswith("image/"):
-                item_type = "image"
-            elif content_type.startswith("video/"):
-                item_type = "video"
-            elif extension in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
-                item_type = "document"
-            else:
-                item_type = "file"
+    async def upload_one(index: int, file: UploadFile) -> dict:
+        filename = file.filename or "file"
+        if file.size == 0:
+            return {"filename": filename, "success": False, "error": "File is empty"}
 
-            # Storage path: talent-bank/{user_id}/<ts>_<filename>
-            timestamp = int(time.time() * 1000)
-            path = f"{user.id}/{timestamp}_{filename}"
+        # Basic type detection
+        content_type = file.content_type or "application/octet-stream"
+        extension = os.path.splitext(filename)[1].lower()
+
+        if content_type.startswith("image/"):
+            item_type = "image"
+        elif content_type.startswith("video/"):
+            item_type = "video"
+        elif extension in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
+            item_type = "document"
+        else:
+            item_type = "file"
 
-            # Upload to Supabase Storage
-            storage = supabase.storage.from_(bucket_name)
-            upload_res = storage.upload(path, content)
-            if getattr(upload_res, "error", None):
-                raise Exception(str(upload_res.error))
+        # Storage path: talent-bank/{user_id}/<ts>_<filename> (ts offset per file so
+        # same-named files in one request do not collide)
+        path = f"{user.id}/{base_timestamp + index}_{filename}"
+
+        try:
+            async with semaphore:
+                # Stream to Supabase Storage (resumable for large files); never read into memory whole
+                file_size = await uploader.upload(bucket_name, path, file, content_type)
+        except Exception as e:
+            print(f"[TALENT_BANK] Upload of {filename} failed: {e}")
+            return {"filename": filename, "success": False, "error": str(e)}
 
+        item = TalentBankItem(
+            user_id=user.id,
+            item_type=item_type,
+            title=filename,
+            description=None,
             # Public URL (if bucket is public) – adjust as needed
-            public_url = storage.get_public_url(path)
-
-            item = TalentBankItem(
-                user_id=user.id,
-                item_type=item_type,
-                title=filename,
-                description=None,
-                file_url=public_url,
-                file_path=path,
-                file_type=content_type,
-                file_size=len(content),
-                extra_metadata={"originalName": filename},
-                is_active=True,
-            )
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-            created_items.append(
-                TalentBankItemResponse(
-                    id=item.id,
-                    user_id=item.user_id,
-                    item_type=item.item_type,
-                    title=item.title,
-                    description=item.description,
-                    file_url=item.file_url,
-                    file_path=item.file_path,
-                    file_type=item.file_type,
-                    file_size=item.file_size,
-                    metadata=getattr(item, "extra_metadata", None),
-                    is_active=item.is_active,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at,
+            file_url=storage.get_public_url(path),
+            file_path=path,
+            file_type=content_type,
+            file_size=file_size,
+            extra_metadata={"originalName": filename},
+            is_active=True,
+        )
+        if media_derivatives and media_derivatives.supports(item_type, content_type):
+            item.extra_metadata["derivatives_status"] = "pending"
+        return {"filename": filename, "success": True, "item": item}
+
+    results = await asyncio.gather(*(upload_one(index, file) for index, file in enumerate(files)))
+    uploaded = [result for result in results if result["success"]]
+    items = [result.pop("item") for result in uploaded]
+
+    # One transaction for every uploaded file
+    created_items: List[TalentBankItemResponse] = []
+    if items:
+        try:
+            db.add_all(items)
+            db.flush()
+            for result, item in zip(uploaded, items):
+                result["item_id"] = item.id
+                created_items.append(
+                    TalentBankItemResponse(
+                        id=item.id,
+                        user_id=item.user_id,
+                        item_type=item.item_type,
+                        title=item.title,
+                        description=item.description,
+                        file_url=item.file_url,
+                        file_path=item.file_path,
+                        file_type=item.file_type,
+                        file_size=item.file_size,
+                        metadata=getattr(item, "extra_metadata", None),
+                        is_active=item.is_active,
+                        created_at=item.created_at,
+                        updated_at=item.updated_at,
+                    )
                 )
-            )
+            db.commit()
         except Exception as e:
             db.rollback()
-            
-            raise HTTPException(status_code=500, detail=f"Failed to upload file '{file.filename}': {str(e)}")
+            # Don't leave orphaned objects in storage for rows that were never saved
+            paths = [item.file_path for item in items]
+            try:
+                await asyncio.to_thread(storage.remove, paths)
+            except Exception as cleanup_error:
+                print(f"[TALENT_BANK] Failed to remove {len(paths)} uploaded files after rollback: {cleanup_error}")
+            raise HTTPException(status_code=500, detail=f"Failed to save talent bank items: {str(e)}")
+
+    if media_derivatives:
+        for item in items:
+            if media_derivatives.supports(item.item_type, item.file_type):
+                media_derivatives.enqueue(item.id)
+
+    failed = [result for result in results if not result["success"]]
+    if failed and not uploaded:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to upload files: " + "; ".join(f"'{result['filename']}': {result['error']}" for result in failed)
+        )
 
-    return {"items": created_items, "count": len(created_items)}
+    return {"items": created_items, "count": len(created_items), "results": results, "failed": len(failed)}
+
+
+@app.delete("/api/talent-bank/items/{item_id}")
+async def delete_talent_bank_item(
+    item_id: int,
+    email: str = Query(..., description="User email address"),
+    db=Depends(get_db),
+):
+    """
+    Delete a talent bank item with its file and generated derivatives.
+
+    The row is deleted first; storage objects that cannot be removed are
+    logged rather than failing the request.
+    """
+    user = get_user_by_email(db, email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    item = db.query(TalentBankItem).filter(
+        TalentBankItem.id == item_id,
+        TalentBankItem.user_id == user.id
+    ).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Talent bank item not found")
+
+    paths = derivative_paths(item.id, item.item_type, item.file_type, item.file_path, item.extra_metadata)
+    if item.file_path and not item.file_path.startswith(("http://", "https://")):
+        paths.insert(0, item.file_path)
+    db.delete(item)
+    db.commit()
+
+    removed = 0
+    uploader = get_storage_uploader()
+    if paths and uploader is None:
+        print(f"[TALENT_BANK] Storage not configured; {len(paths)} objects of item {item_id} were not removed")
+    elif paths:
+        try:
+            removed = await uploader.remove("talent-bank", paths)
+        except Exception as e:
+            print(f"[TALENT_BANK] Failed to remove storage objects of item {item_id}: {e}")
+    return {"deleted": item_id, "files_removed": removed}
 
 
 # ==================== Mapping & Routes ====================
@@ -1428,6 +2026,32 @@ async def geocode_address(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/mapping/geocode/batch")
+async def geocode_addresses_batch(request: dict):
+    """
+    Geocode a list of addresses.
+
+    Results are streamed as newline-delimited JSON in completion order, one
+    line per input address with its index and a per-item status.
+    """
+    if not mapping_service:
+        raise HTTPException(status_code=503, detail="Mapping service is not available")
+    addresses = request.get("addresses")
+    if not isinstance(addresses, list) or not addresses:
+        raise HTTPException(status_code=400, detail="addresses must be a non-empty list")
+    if not all(isinstance(address, str) and address.strip() for address in addresses):
+        raise HTTPException(status_code=400, detail="Every address must be a non-empty string")
+    max_items = int(os.getenv("GEOCODE_BATCH_MAX_ITEMS", "1000"))
+    if len(addresses) > max_items:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {max_items} addresses")
+    
+    async def stream_results():
+        async for item in mapping_service.geocode_many(addresses):
+            yield json.dumps(item, default=str) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @app.post("/api/mapping/route")
 async def calculate_route(request: dict):
     """Calculate route between two locations"""
@@ -1464,6 +2088,26 @@ async def get_businesses_on_map(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/mapping/geocode/cache-stats")
+async def get_geocode_cache_stats():
+    """Geocode cache hit/miss counters and geocoder backend activity"""
+    if not mapping_service:
+        raise HTTPException(status_code=503, detail="Mapping service is not available")
+    return {
+        "success": True,
+        "stats": mapping_service.geocode_cache.stats(),
+        "geocoder": mapping_service.async_geocoder.stats()
+    }
+
+
+@app.get("/api/mapping/geocode/queue")
+async def get_geocode_queue_stats():
+    """Geocode-on-write queue depth, lag and throughput"""
+    if not geocode_queue:
+        raise HTTPException(status_code=503, detail="Geocode queue is not available")
+    return {"success": True, "stats": geocode_queue.stats()}
+
+
 # ==================== PDF Generation ====================
 
 @app.post("/api/pdf/resume/{resume_id}")
@@ -1604,6 +2248,7 @@ async def delete_account(request: Request):
             supabase_admin.table('talent_profiles').delete().eq('user_id', user_id).execute()
         except Exception as e:
             deletion_errors.append(f"talent_profiles: {str(e)}")
+        queue_embedding_check("talent", talent_profile_id)
         
         try:
             # Delete business profile
@@ -1981,6 +2626,7 @@ async def activate_talent(talent_id: str, request: Request):
         is_active = body.get("is_active", True)
         
         result = supabase_admin.table('talent_profiles').update({"is_active": is_active}).eq('id', talent_id).execute()
+        queue_embedding_check("talent", talent_id)
         
         return {"success": True, "data": result.data}
     except HTTPException:
@@ -2081,6 +2727,8 @@ async def delete_user_admin(user_id: str, request: Request):
         except Exception as e:
             deletion_errors.append(f"business_profiles: {str(e)}")
         
+        queue_embedding_check("talent", talent_profile_id)
+        
         # Delete auth user
         try:
             supabase_admin.auth.admin.delete_user(user_id)
@@ -0,0 +1,65 @@
+"""
+Shared fixtures for the backend tests
+
+The app runs against a temporary SQLite database; DATABASE_URL has to be set
+before app.database is first imported.
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import database  # noqa: E402
+from app.models import Base  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    database.init_db()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    # Not entered as a context manager: the lifespan (background services) is not started
+    return TestClient(main.app)
+
+
+@contextmanager
+def count_statements():
+    """Collects the SQL statements executed on the sync engine inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
@@ -0,0 +1,83 @@
+"""
+Applications endpoints: related jobs and talent profiles load without one query per row
+"""
+
+from conftest import count_statements
+
+from app.models import Application, BusinessProfile, Job, TalentProfile, User
+
+
+def make_user(db, email, user_type, **profile_ids):
+    user = User(email=email, username=email, hashed_password="x", user_type=user_type, **profile_ids)
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_job(db, business, title="Engineer"):
+    job = Job(business_profile_id=business.id, title=title, city="Sydney")
+    db.add(job)
+    db.flush()
+    return job
+
+
+def make_talent(db, name):
+    talent = TalentProfile(name=name, email=f"{name}@example.com", title="Developer")
+    db.add(talent)
+    db.flush()
+    return talent
+
+
+def test_job_applications_query_count_does_not_grow_with_applicants(client, db):
+    business = BusinessProfile(name="Acme")
+    db.add(business)
+    db.flush()
+    make_user(db, "owner@example.com", "business", business_profile_id=business.id)
+
+    counts = {}
+    for applicants in (3, 40):
+        job = make_job(db, business, title=f"Job for {applicants}")
+        for i in range(applicants):
+            db.add(Application(job_id=job.id, talent_profile_id=make_talent(db, f"t{applicants}-{i}").id))
+        job_id = job.id
+        db.commit()
+
+        with count_statements() as statements:
+            response = client.get(f"/api/applications/job/{job_id}", params={"email": "owner@example.com"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == applicants
+        assert {row["talent_name"] for row in body["applications"]} == {f"t{applicants}-{i}" for i in range(applicants)}
+        counts[applicants] = len(statements)
+
+    assert counts[3] == counts[40]
+    # user, job, applications joined with their talent profiles
+    assert counts[40] <= 3
+
+
+def test_my_applications_query_count_does_not_grow_with_applications(client, db):
+    business = BusinessProfile(name="Acme")
+    db.add(business)
+    db.flush()
+
+    counts = {}
+    for applications in (3, 40):
+        talent = make_talent(db, f"applicant{applications}")
+        email = f"applicant{applications}@example.com"
+        make_user(db, email, "talent", talent_profile_id=talent.id)
+        for i in range(applications):
+            job = make_job(db, business, title=f"Job {applications}-{i}")
+            db.add(Application(job_id=job.id, talent_profile_id=talent.id))
+        db.commit()
+
+        with count_statements() as statements:
+            response = client.get("/api/applications/me", params={"email": email})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == applications
+        assert all(row["job_title"] and row["job_location"] == "Sydney" for row in body["applications"])
+        counts[applications] = len(statements)
+
+    assert counts[3] == counts[40]
+    # user, applications joined with their jobs
+    assert counts[40] <= 2
@@ -0,0 +1,63 @@
+"""
+distances_km accuracy against geopy's geodesic (Karney) on WGS-84
+"""
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+from app.geo_distance import distance_km, distances_km
+
+# Error bounds documented in the distances_km docstring
+REGIONAL_KM, REGIONAL_RELATIVE = 10_000, 2e-6
+GLOBAL_KM, GLOBAL_RELATIVE = 19_900, 1e-4
+ANTIPODAL_RELATIVE = 2e-3
+
+
+@pytest.fixture(scope="module")
+def random_pairs():
+    """(computed, geodesic) distances for seeded random origin/destination pairs"""
+    rng = np.random.default_rng(7)
+    computed, expected = [], []
+    for _ in range(100):
+        origin = (rng.uniform(-89, 89), rng.uniform(-180, 180))
+        latitudes, longitudes = rng.uniform(-89, 89, 20), rng.uniform(-180, 180, 20)
+        computed.extend(distances_km(origin[0], origin[1], latitudes, longitudes))
+        expected.extend(geodesic(origin, point).km for point in zip(latitudes, longitudes))
+    return np.array(computed), np.array(expected)
+
+
+def test_random_pairs_within_documented_bounds(random_pairs):
+    computed, expected = random_pairs
+    relative = np.abs(computed - expected) / expected
+
+    regional = expected < REGIONAL_KM
+    global_ = expected < GLOBAL_KM
+    assert regional.sum() > 500 and global_.sum() > 1900
+    assert relative[regional].max() < REGIONAL_RELATIVE
+    assert relative[global_].max() < GLOBAL_RELATIVE
+
+
+def test_zero_and_very_short_distances():
+    assert distance_km(-33.8688, 151.2093, -33.8688, 151.2093) == 0.0
+    # ~15 m and ~1 m apart in Sydney: within a millimetre
+    for lat2, lng2 in ((-33.8689, 151.2094), (-33.86880, 151.20931)):
+        expected = geodesic((-33.8688, 151.2093), (lat2, lng2)).km
+        assert distance_km(-33.8688, 151.2093, lat2, lng2) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("origin, destination", [
+    ((0, 0), (0, 180)),
+    ((0, 0), (0.5, 179.5)),
+    ((10, 20), (-10, -160)),
+    ((-33.87, 151.21), (33.87, -28.79)),
+])
+def test_near_antipodal_pairs_within_documented_bound(origin, destination):
+    expected = geodesic(origin, destination).km
+    assert distance_km(*origin, *destination) == pytest.approx(expected, rel=ANTIPODAL_RELATIVE)
+
+
+def test_vectorized_matches_scalar():
+    latitudes, longitudes = [-37.81, -27.47, 51.5, 0.0], [144.96, 153.03, -0.13, 0.0]
+    vectorized = distances_km(-33.87, 151.21, latitudes, longitudes)
+    assert list(vectorized) == [distance_km(-33.87, 151.21, lat, lng) for lat, lng in zip(latitudes, longitudes)]
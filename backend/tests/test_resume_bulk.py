@@ -0,0 +1,38 @@
+"""
+Bulk resume import deduplication
+"""
+
+import hashlib
+import io
+
+from app import database
+from app.resume_bulk import ResumeBulkImporter
+
+
+def make_importer():
+    return ResumeBulkImporter(
+        session_factory=database.SessionLocal,
+        file_hash=lambda content: hashlib.sha256(content).hexdigest(),
+        max_bytes=1024 * 1024
+    )
+
+
+def outcome(summary):
+    return summary["queued"], summary["duplicates"]
+
+
+def test_same_content_is_deduplicated_per_user(db):
+    importer = make_importer()
+    upload = lambda: [("resume.txt", io.BytesIO(b"Alex Chen - Software Engineer"))]
+
+    first = importer.ingest(upload(), [".txt"], user_id="user-a")
+    again = importer.ingest(upload(), [".txt"], user_id="user-a")
+    other_user = importer.ingest(upload(), [".txt"], user_id="user-b")
+    anonymous = importer.ingest(upload(), [".txt"])
+
+    assert outcome(first) == (1, 0)
+    assert outcome(again) == (0, 1)
+    # Another user's job (and its resume) is not visible to this user
+    assert outcome(other_user) == (1, 0)
+    assert outcome(anonymous) == (1, 0)
+    assert outcome(importer.ingest(upload(), [".txt"])) == (0, 1)
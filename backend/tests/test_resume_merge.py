@@ -0,0 +1,111 @@
+"""
+merge_parsed_resumes against per-chunk parse results of multi-page sample resumes
+"""
+
+import json
+import os
+
+import pytest
+
+from app.resume_merge import merge_parsed_resumes, normalize_date
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_chunks(name):
+    with open(os.path.join(FIXTURES, f"chunked_resume_{name}.json"), encoding="utf-8") as fixture:
+        return json.load(fixture)["chunks"]
+
+
+@pytest.fixture
+def engineer():
+    return merge_parsed_resumes(load_chunks("engineer"))
+
+
+@pytest.fixture
+def nurse():
+    return merge_parsed_resumes(load_chunks("nurse"))
+
+
+# ==================== Entry deduplication ====================
+
+def test_overlapping_experience_entries_are_merged(engineer):
+    roles = [(entry["company"], entry["title"], normalize_date(entry["start_date"])) for entry in engineer["experience"]]
+    assert roles == [
+        ("Canva Pty Ltd", "Senior Software Engineer", "2020-02"),
+        ("Atlassian", "Software Engineer", "2016-03"),
+        ("Atlassian", "Software Engineer", "2012-06"),
+    ]
+
+
+def test_merged_experience_keeps_fuller_description_and_unions_achievements(engineer):
+    canva = engineer["experience"][0]
+    assert canva["description"].endswith("serving 20M users.")
+    assert canva["achievements"] == ["Cut invoice latency by 60%", "Hired and mentored six engineers"]
+    # Gaps in the first copy are filled from the repeat, never overwritten
+    assert engineer["experience"][1]["end_date"] == "January 2020"
+
+
+def test_same_role_with_different_start_date_stays_separate(engineer):
+    atlassian = [entry for entry in engineer["experience"] if entry["company"] == "Atlassian"]
+    assert len(atlassian) == 2
+    assert atlassian[1]["description"].startswith("Graduate rotation")
+
+
+def test_overlapping_education_entries_are_merged(engineer, nurse):
+    assert [(entry["institution"], entry["degree"]) for entry in engineer["education"]] == [
+        ("University of Sydney", "Bachelor of Computer Science"),
+        ("UNSW", "Master of IT"),
+    ]
+    sydney = engineer["education"][0]
+    assert (sydney["end_date"], sydney["field"], sydney["gpa"]) == ("2011", "Distributed Systems", "6.5")
+
+    assert len(nurse["education"]) == 1
+    assert nurse["education"][0]["end_date"] == "2018"
+    assert nurse["education"][0]["gpa"] == "Distinction"
+
+
+def test_experience_repeated_across_chunks_is_merged_once(nurse):
+    assert len(nurse["experience"]) == 1
+    role = nurse["experience"][0]
+    assert role["end_date"] == "Current"
+    assert role["achievements"] == ["Triage lead for night shifts"]
+
+
+# ==================== Scalar conflicts ====================
+
+def test_scalar_conflicts_keep_first_non_empty_value(engineer):
+    assert engineer["name"] == "Alex Chen"
+    assert engineer["email"] == "alex.chen@example.com"
+    assert engineer["summary"].startswith("Backend engineer")
+    # Empty strings in later chunks never erase an earlier value
+    assert engineer["phone"] == "+61 400 000 000"
+    # Fields only a later chunk found are still filled
+    assert engineer["linkedin"] == "linkedin.com/in/alexchen"
+    assert engineer["github"] is None
+
+
+def test_empty_and_null_scalars_fall_through_to_later_chunks(nurse):
+    assert nurse["name"] == "Priya Patel"
+    assert nurse["email"] == "priya.patel@example.com"
+    assert nurse["summary"] == "Emergency nurse focused on triage and patient education."
+
+
+# ==================== Skills and extras ====================
+
+def test_skills_are_unioned_per_category_case_insensitively(engineer, nurse):
+    assert engineer["skills"] == {
+        "technical": ["Python", "PostgreSQL", "Kafka", "Terraform"],
+        "soft": ["Mentoring", "Public speaking"],
+    }
+    assert nurse["skills"] == ["Triage", "Patient assessment", "IV cannulation"]
+
+
+def test_extra_fields_are_kept(nurse):
+    assert nurse["volunteering"] == [{"organisation": "Red Cross", "role": "First aid volunteer"}]
+
+
+def test_merge_is_deterministic():
+    chunks = load_chunks("engineer")
+    assert merge_parsed_resumes(chunks) == merge_parsed_resumes(json.loads(json.dumps(chunks)))
+    assert merge_parsed_resumes(chunks[:1]) != merge_parsed_resumes(chunks)
@@ -0,0 +1,61 @@
+"""
+SkillIndex sync: single-flight rebuilds built off the event loop
+"""
+
+import asyncio
+
+from sqlalchemy import event
+
+from app import database
+from app.models import TalentProfile
+from app.skill_index import SkillIndex
+
+
+def add_talent(db, name, skills):
+    talent = TalentProfile(name=name, email=f"{name}@example.com", skills=skills)
+    db.add(talent)
+    db.commit()
+    return talent.id
+
+
+def test_concurrent_syncs_share_one_rebuild(db):
+    python_dev = add_talent(db, "a", ["Python", "SQL"])
+    add_talent(db, "b", ["React"])
+    both = add_talent(db, "c", [{"name": " python "}, "react"])
+    index = SkillIndex()
+    full_scans = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM talent_profiles" in statement and "WHERE" not in statement:
+            full_scans.append(statement)
+
+    async def sync_from_many_requests():
+        sessions = [database.AsyncSessionLocal() for _ in range(5)]
+        try:
+            await asyncio.gather(*(index.sync(session) for session in sessions))
+        finally:
+            for session in sessions:
+                await session.close()
+
+    sync_engine = database.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        asyncio.run(sync_from_many_requests())
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert len(full_scans) == 1
+    assert index.match(["python"]) == [python_dev, both]
+    assert index.match(["python", "react"]) == [both]
+
+    # A forced rebuild swaps in a fresh index that includes new rows
+    late = add_talent(db, "d", ["Python"])
+    index.last_rebuilt_at -= index.rebuild_seconds
+
+    async def resync():
+        async with database.AsyncSessionLocal() as session:
+            await index.sync(session)
+
+    asyncio.run(resync())
+    assert index.match(["python"]) == [python_dev, both, late]
+    assert index.stats()["profiles"] == 4
@@ -0,0 +1,197 @@
+"""
+StorageUploader against a fake Supabase Storage served through httpx.MockTransport
+"""
+
+import asyncio
+import os
+import tempfile
+
+import httpx
+import pytest
+from starlette.datastructures import UploadFile
+
+from app import storage_upload
+from app.storage_upload import StorageUploader, StorageUploadError
+
+BASE_URL = "https://project.supabase.co"
+UPLOAD_PATH = "/storage/v1/upload/resumable/upload-1"
+
+
+class RecordingUpload(UploadFile):
+    """UploadFile that records the size of every read"""
+
+    def __init__(self, data: bytes):
+        spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+        spooled.write(data)
+        spooled.seek(0)
+        super().__init__(file=spooled, filename="video.mp4", size=len(data))
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        piece = await super().read(size)
+        self.reads.append(len(piece))
+        return piece
+
+
+class FakeStorage:
+    """
+    Minimal Storage object and TUS endpoints
+
+    ``fail_patches`` maps the number of a PATCH request (1-based) to a failure:
+    the server keeps the first half of that chunk, then answers 503
+    ("status") or drops the connection ("transport").
+    """
+
+    def __init__(self, fail_patches=None):
+        self.objects = {}
+        self.requests = []
+        self.fail_patches = fail_patches or {}
+        self.upload = None
+        self.patches = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path, request.headers.get("upload-offset")))
+        assert request.headers["authorization"] == "Bearer service-key"
+        body = await request.aread()
+
+        if request.method == "POST" and request.url.path.startswith("/storage/v1/object/"):
+            assert int(request.headers["content-length"]) == len(body)
+            self.objects[request.url.path.split("/object/", 1)[1]] = body
+            return httpx.Response(200, json={"Key": request.url.path})
+
+        if request.method == "POST" and request.url.path == "/storage/v1/upload/resumable":
+            self.upload = {"length": int(request.headers["upload-length"]), "data": b""}
+            return httpx.Response(201, headers={"Location": UPLOAD_PATH})
+
+        assert request.url.path == UPLOAD_PATH
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Upload-Offset": str(len(self.upload["data"]))})
+
+        assert request.method == "PATCH"
+        self.patches += 1
+        if int(request.headers["upload-offset"]) != len(self.upload["data"]):
+            return httpx.Response(409)
+        failure = self.fail_patches.get(self.patches)
+        if failure:
+            self.upload["data"] += body[:len(body) // 2]
+            if failure == "transport":
+                raise httpx.ReadError("connection reset", request=request)
+            return httpx.Response(503, text="upstream unavailable")
+        self.upload["data"] += body
+        return httpx.Response(204, headers={"Upload-Offset": str(len(self.upload["data"]))})
+
+
+def make_uploader(storage: FakeStorage, **options) -> StorageUploader:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(storage.handler))
+    return StorageUploader(BASE_URL, "service-key", client=client, **options)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(storage_upload.random, "uniform", lambda low, high: 0)
+
+
+def test_small_file_streams_in_one_request():
+    data = os.urandom(5000)
+    storage = FakeStorage()
+    uploader = make_uploader(storage, stream_chunk_bytes=1024)
+
+    upload = RecordingUpload(data)
+
+    size = asyncio.run(uploader.upload("talent-bank", "7/cv.pdf", upload, "application/pdf"))
+
+    assert size == len(data)
+    assert storage.objects == {"talent-bank/7/cv.pdf": data}
+    assert [(method, path) for method, path, _ in storage.requests] == [
+        ("POST", "/storage/v1/object/talent-bank/7/cv.pdf")
+    ]
+    # The body is read (and sent) in stream_chunk_bytes pieces, never as one buffer
+    assert upload.reads == [1024, 1024, 1024, 1024, 904]
+    stats = uploader.stats()
+    assert (stats["uploads"], stats["resumable"], stats["bytes"]) == (1, 0, len(data))
+
+
+def test_rejected_single_upload_raises():
+    async def handler(request):
+        return httpx.Response(400, text="Duplicate")
+
+    uploader = StorageUploader(BASE_URL, "service-key", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    with pytest.raises(StorageUploadError) as raised:
+        asyncio.run(uploader.upload("talent-bank", "7/cv.pdf", RecordingUpload(b"%PDF"), "application/pdf"))
+    assert raised.value.status_code == 400
+    assert uploader.stats()["failures"] == 1
+
+
+def test_large_file_uses_resumable_chunks():
+    data = os.urandom(2500)
+    storage = FakeStorage()
+    uploader = make_uploader(storage, resumable_threshold_bytes=1000, stream_chunk_bytes=512)
+    uploader.chunk_bytes = 1000
+    upload = RecordingUpload(data)
+
+    asyncio.run(uploader.upload("talent-bank", "7/video.mp4", upload, "video/mp4"))
+
+    assert storage.upload["data"] == data
+    assert storage.requests == [
+        ("POST", "/storage/v1/upload/resumable", None),
+        ("PATCH", UPLOAD_PATH, "0"),
+        ("PATCH", UPLOAD_PATH, "1000"),
+        ("PATCH", UPLOAD_PATH, "2000"),
+    ]
+    assert upload.reads == [512, 488, 512, 488, 500]
+    assert uploader.stats()["resumable"] == 1
+
+
+@pytest.mark.parametrize("failure", ["status", "transport"])
+def test_resumable_upload_resumes_after_failed_patch(failure):
+    data = os.urandom(2500)
+    storage = FakeStorage(fail_patches={2: failure})
+    uploader = make_uploader(storage, resumable_threshold_bytes=1000)
+    uploader.chunk_bytes = 1000
+
+    asyncio.run(uploader.upload("talent-bank", "7/video.mp4", RecordingUpload(data), "video/mp4"))
+
+    assert storage.upload["data"] == data
+    # The server kept half of the failed chunk; the upload continues from there
+    assert storage.requests == [
+        ("POST", "/storage/v1/upload/resumable", None),
+        ("PATCH", UPLOAD_PATH, "0"),
+        ("PATCH", UPLOAD_PATH, "1000"),
+        ("HEAD", UPLOAD_PATH, None),
+        ("PATCH", UPLOAD_PATH, "1500"),
+    ]
+    stats = uploader.stats()
+    assert (stats["chunk_retries"], stats["failures"], stats["uploads"]) == (1, 0, 1)
+
+
+def test_resumable_upload_gives_up_after_max_retries():
+    storage = FakeStorage(fail_patches={attempt: "status" for attempt in range(1, 10)})
+    uploader = make_uploader(storage, resumable_threshold_bytes=1000, max_retries=2)
+    uploader.chunk_bytes = 1000
+
+    with pytest.raises(StorageUploadError):
+        asyncio.run(uploader.upload("talent-bank", "7/video.mp4", RecordingUpload(os.urandom(2500)), "video/mp4"))
+    assert [method for method, _, _ in storage.requests].count("PATCH") == 3
+    assert uploader.stats()["failures"] == 1
+
+
+def test_signed_url_and_remove():
+    seen = []
+
+    async def handler(request):
+        seen.append((request.method, request.url.path, await request.aread()))
+        if request.url.path.startswith("/storage/v1/object/sign/"):
+            return httpx.Response(200, json={"signedURL": "/object/sign/talent-bank/7/video.mp4?token=abc"})
+        return httpx.Response(200, json=[{"name": "7/video.mp4"}])
+
+    uploader = StorageUploader(BASE_URL, "service-key", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    url = asyncio.run(uploader.signed_url("talent-bank", "7/video.mp4", expires_in=60))
+    removed = asyncio.run(uploader.remove("talent-bank", ["7/video.mp4", "7/derivatives/3/poster.webp"]))
+
+    assert url == f"{BASE_URL}/storage/v1/object/sign/talent-bank/7/video.mp4?token=abc"
+    assert removed == 1
+    assert seen == [
+        ("POST", "/storage/v1/object/sign/talent-bank/7/video.mp4", b'{"expiresIn":60}'),
+        ("DELETE", "/storage/v1/object/talent-bank", b'{"prefixes":["7/video.mp4","7/derivatives/3/poster.webp"]}'),
+    ]
@@ -0,0 +1,117 @@
+"""
+Talent Bank item deletion removes the file and its generated derivatives
+"""
+
+import main
+from app.models import TalentBankItem, User
+
+
+class FakeUploader:
+    def __init__(self):
+        self.removed = []
+
+    async def remove(self, bucket, paths):
+        self.removed.append((bucket, list(paths)))
+        return len(paths)
+
+
+def test_delete_item_removes_original_and_derivatives(client, db, monkeypatch):
+    user = User(email="talent@example.com", username="talent", hashed_password="x", user_type="talent")
+    db.add(user)
+    db.flush()
+    item = TalentBankItem(
+        user_id=user.id,
+        item_type="video",
+        title="Intro",
+        file_path=f"{user.id}/1700000000000_intro.mp4",
+        extra_metadata={"derivatives": {"thumbnail": {"path": f"{user.id}/derivatives/old/thumbnail.webp"}}},
+        is_active=True,
+    )
+    db.add(item)
+    db.commit()
+    item_id, user_id = item.id, user.id
+    uploader = FakeUploader()
+    monkeypatch.setattr(main, "get_storage_uploader", lambda: uploader)
+
+    response = client.delete(f"/api/talent-bank/items/{item_id}", params={"email": "talent@example.com"})
+
+    assert response.status_code == 200
+    directory = f"{user_id}/derivatives/{item_id}"
+    assert uploader.removed == [("talent-bank", [
+        f"{user_id}/1700000000000_intro.mp4",
+        f"{directory}/medium.webp",
+        f"{directory}/poster.webp",
+        f"{directory}/thumbnail.webp",
+        f"{user_id}/derivatives/old/thumbnail.webp",
+    ])]
+    db.expire_all()
+    assert db.get(TalentBankItem, item_id) is None
+
+
+def test_delete_item_of_another_user_is_not_found(client, db, monkeypatch):
+    owner = User(email="owner@example.com", username="owner", hashed_password="x", user_type="talent")
+    other = User(email="other@example.com", username="other", hashed_password="x", user_type="talent")
+    db.add_all([owner, other])
+    db.flush()
+    item = TalentBankItem(user_id=owner.id, item_type="image", title="Photo", file_path=f"{owner.id}/photo.jpg")
+    db.add(item)
+    db.commit()
+    item_id = item.id
+    uploader = FakeUploader()
+    monkeypatch.setattr(main, "get_storage_uploader", lambda: uploader)
+
+    response = client.delete(f"/api/talent-bank/items/{item_id}", params={"email": "other@example.com"})
+
+    assert response.status_code == 404
+    assert uploader.removed == []
+    db.expire_all()
+    assert db.get(TalentBankItem, item_id) is not None
+
+
+def test_delete_dashboard_upload_removes_its_derivatives(client, db, monkeypatch):
+    # Dashboard uploads use the category as item_type; the MIME type marks them as media
+    user = User(email="dash@example.com", username="dash", hashed_password="x", user_type="talent")
+    db.add(user)
+    db.flush()
+    item = TalentBankItem(user_id=user.id, item_type="document", title="Photo", file_path=f"{user.id}/photo.png",
+                          file_type="image/png", is_active=True)
+    db.add(item)
+    db.commit()
+    item_id, user_id = item.id, user.id
+    uploader = FakeUploader()
+    monkeypatch.setattr(main, "get_storage_uploader", lambda: uploader)
+
+    response = client.delete(f"/api/talent-bank/items/{item_id}", params={"email": "dash@example.com"})
+
+    assert response.status_code == 200
+    assert uploader.removed[0][1][:2] == [f"{user_id}/photo.png", f"{user_id}/derivatives/{item_id}/medium.webp"]
+
+
+def test_scan_queues_media_inserted_outside_the_api(db):
+    from app import database
+    from app.media_derivatives import MediaDerivativeService
+
+    user = User(email="scan@example.com", username="scan", hashed_password="x", user_type="talent")
+    db.add(user)
+    db.flush()
+
+    def add(item_type, file_type, metadata=None):
+        item = TalentBankItem(user_id=user.id, item_type=item_type, title="f", file_path=f"{user.id}/f",
+                              file_type=file_type, extra_metadata=metadata, is_active=True)
+        db.add(item)
+        db.commit()
+        return item.id
+
+    photo = add("document", "image/jpeg")
+    add("document", "application/pdf")
+    add("image", "image/png", {"derivatives_status": "ready"})
+    service = MediaDerivativeService(database.SessionLocal, uploader=None, ffmpeg_path="")
+
+    ids, watermark = service._unprocessed_ids()
+    assert ids == [photo]
+
+    # Later scans only read rows inserted since the previous one
+    video = add("credential", "video/mp4")
+    service.ffmpeg_path = "/usr/bin/ffmpeg"
+    assert service._unprocessed_ids(watermark) == ([video], video)
+    assert service._unprocessed_ids(video) == ([], video)
@@ -0,0 +1,48 @@
+"""
+Resume text extraction: DOCX parsing and recovery from crashed pool workers
+"""
+
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+
+from app.text_extraction import ExtractionCrashedError, TextExtractor, extract_docx
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def make_docx(body: str) -> bytes:
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        archive.writestr("word/document.xml", f"<w:document {W}><w:body>{body}</w:body></w:document>")
+    return output.getvalue()
+
+
+def test_docx_tab_stops_are_not_text():
+    content = make_docx(
+        "<w:p><w:pPr><w:tabs><w:tab w:val=\"left\" w:pos=\"720\"/><w:tab w:val=\"right\" w:pos=\"9000\"/></w:tabs></w:pPr>"
+        "<w:r><w:t>Engineer</w:t></w:r><w:r><w:tab/><w:t>2020</w:t><w:br/><w:t>Sydney</w:t></w:r></w:p>"
+        "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    )
+
+    assert extract_docx(content, 1000) == ("Engineer\t2020\nSydney\nPython", 2)
+
+
+def test_extraction_recovers_after_a_worker_dies():
+    extractor = TextExtractor(max_workers=1)
+    content = make_docx("<w:p><w:r><w:t>Alex Chen</w:t></w:r></w:p>")
+
+    async def scenario():
+        # A worker killed mid-call (OOM kill, segfault) breaks the pool; that call fails
+        with pytest.raises(ExtractionCrashedError):
+            await extractor._call(os._exit, 1)
+        return await extractor.extract(content, "resume.docx")
+
+    try:
+        assert asyncio.run(scenario()) == "Alex Chen"
+        assert extractor.stats()["pool_restarts"] == 2
+    finally:
+        extractor.shutdown()
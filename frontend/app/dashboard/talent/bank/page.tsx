@@ -515,1245 +515,33 @@ export default function TalentBankPage() {
     return !!path && /^https?:\/\//i.test(path)
   }
 
-  async function uploadVideoUrl() {
-    if (!videoUrlInput.trim()) {
-      setRecErr('Please enter a video URL.')
-      return
-    }
-
-    const url = videoUrlInput.trim()
-
-    // Validate URL format
-    try {
-      new URL(url)
-    } catch {
-      setRecErr('Please enter a valid URL.')
-      return
-    }
-
-    setRecErr(null)
-    setIsUploading(true)
-
-    const uid = userId ?? (await ensureSession())
-    setUserId(uid)
-    if (!uid) {
-      setIsUploading(false)
-      return
-    }
-
-    try {
-      const { data: sessionData } = await supabase.auth.getSession()
-      const sessionEmail = sessionData?.session?.user?.email ?? (authEmail || null)
-
-      // Insert as a video item (external URL)
-      const insertPayload = {
-        user_id: uid,
-        item_type: 'video',
-        title: 'Video URL',
-        description: url,
-        file_path: url,
-        file_type: 'video/url',
-        file_size: 0,
-        metadata: {
-          url,
-          source: 'url-import',
-          file_kind: 'video',
-          isExternal: true,
-        },
-        is_public: false,
-      }
-
-      let { error: insertError } = await supabase.from('talent_bank_items').insert(insertPayload as any)
-      if ((insertError as any)?.code === '23503') {
-        await ensureUserRow(uid, sessionEmail)
-        const retry = await supabase.from('talent_bank_items').insert(insertPayload as any)
-        insertError = retry.error
-      }
-
-      if (insertError) {
-        setRecErr(`Failed to save video URL: ${insertError.message}`)
-        return
-      }
-
-      setVideoUrlInput('')
-      setRecOpen(false)
-      await refreshItems(uid)
-    } catch (err: any) {
-      setRecErr(err?.message || 'Failed to save video URL.')
-    } finally {
-      setIsUploading(false)
-    }
-  }
-
-  async function uploadRecordedVideo() {
-    setRecErr(null)
+  async function deleteItem(item: TalentBankItem) {
     const uid = userId ?? (await ensureSession())
     setUserId(uid)
     if (!uid) return
 
-    const blob = new Blob(recChunksRef.current, { type: recMime })
-    if (!blob.size) {
-      setRecErr('No recording captured yet.')
-      // #region agent log
-      agentDbg('TB_REC_4', 'upload blocked (empty blob)', { chunkCount: recChunksRef.current.length, mime: recMime })
-      // #endregion agent log
-      return
-    }
-    if (blob.size > MAX_UPLOAD_BYTES) {
-      const sizeMb = Math.round((blob.size / (1024 * 1024)) * 10) / 10
-      const limitMb = Math.round((MAX_UPLOAD_BYTES / (1024 * 1024)) * 10) / 10
-      setRecErr(`Recording is ${sizeMb}MB, which exceeds the current upload limit (~${limitMb}MB). Please record a shorter video.`)
-      // #region agent log
-      agentDbg('TB_REC_4', 'upload blocked (too large)', { bytes: blob.size, limit: MAX_UPLOAD_BYTES })
-      // #endregion agent log
-      return
-    }
-
-    const ext = recMime.includes('mp4') ? 'mp4' : 'webm'
-    const file = new File([blob], `intro-video-${new Date().toISOString().slice(0, 19).replace(/[:T]/g, '-')}.${ext}`, { type: recMime })
-
-    setIsUploading(true)
-    try {
-      // #region agent log
-      agentDbg('TB_REC_4', 'upload start', { fileType: file.type, fileSize: file.size })
-      // #endregion agent log
-      await uploadSingleFile(file, { source: 'recording', categoryOverride: 'document' })
-      clearRecording()
-      setRecOpen(false)
-    } finally {
-      setIsUploading(false)
-    }
-  }
-
-  async function uploadSingleFile(file: File, opts?: { source?: string; categoryOverride?: 'document' | 'education' | 'credential' }) {
-    const uid = userId ?? (await ensureSession())
-    setUserId(uid)
-    if (!uid) return
     const { data: sessionData } = await supabase.auth.getSession()
     const sessionEmail = sessionData?.session?.user?.email ?? (authEmail || null)
-    const category = opts?.categoryOverride ?? saveCategory
-
-    if (file.size > MAX_UPLOAD_BYTES) {
-      const sizeMb = Math.round((file.size / (1024 * 1024)) * 10) / 10
-      const limitMb = Math.round((MAX_UPLOAD_BYTES / (1024 * 1024)) * 10) / 10
-      setUploadError(`"${file.name}" is ${sizeMb}MB, which exceeds this app's current upload limit (~${limitMb}MB).`)
-      // #region agent log
-      agentDbg('TB_REC_5', 'uploadSingleFile blocked (too large)', { source: opts?.source ?? 'file', bytes: file.size })
-      // #endregion agent log
-      return
-    }
-
-    // Check if file is a resume (PDF, DOC, DOCX, TXT, RTF)
-    const extension = file.name.toLowerCase().split('.').pop() || ''
-    const isResume = ['pdf', 'doc', 'docx', 'txt', 'rtf'].includes(extension)
-
-    const path = `${uid}/${crypto.randomUUID()}-${file.name}`
-    const { error: storageError } = await supabase.storage.from(BUCKET).upload(path, file, { upsert: false, contentType: file.type })
-    await log('storage upload', 'TB_STORAGE_UPLOAD', {
-      hasError: !!storageError,
-      errorMessage: (storageError as any)?.message ?? null,
-      fileSize: file.size,
-      fileType: file.type,
-      source: opts?.source ?? 'file',
-      isResume,
-    })
-    // #region agent log
-    agentDbg('TB_REC_5', 'storage upload result', { hasError: !!storageError, source: opts?.source ?? 'file', isResume })
-    // #endregion agent log
-    if (storageError) {
-      const msg = (storageError as any)?.message ?? 'Upload failed'
-      setUploadError(`Upload failed: ${msg}`)
-      return
-    }
-
-    const insertPayload = {
-      user_id: uid,
-      item_type: category,
-      title: file.name,
-      description: category === 'education'
-        ? 'Education document/certificate'
-        : category === 'credential'
-          ? 'Credential / licence / accreditation'
-          : null,
-      file_path: path,
-      file_type: file.type,
-      file_size: file.size,
-      metadata: {
-        file_kind: file.type.startsWith('image') ? 'image' : file.type.startsWith('video') ? 'video' : 'document',
-        category,
-        source: opts?.source ?? 'file',
-        isResume,
-      },
-      is_public: false,
-    }
-
-    let { error: insertError } = await supabase.from('talent_bank_items').insert(insertPayload as any)
-    await log('db insert', 'TB_DB_INSERT', {
-      hasError: !!insertError,
-      errorCode: (insertError as any)?.code ?? null,
-      errorMessage: (insertError as any)?.message ?? null,
-      errorDetails: (insertError as any)?.details ?? null,
-      errorHint: (insertError as any)?.hint ?? null,
-      source: opts?.source ?? 'file',
-    })
-    // #region agent log
-    agentDbg('TB_REC_6', 'db insert result', { hasError: !!insertError, code: (insertError as any)?.code ?? null, source: opts?.source ?? 'file' })
-    // #endregion agent log
-
-    if ((insertError as any)?.code === '23503') {
-      await ensureUserRow(uid, sessionEmail)
-      const retry = await supabase.from('talent_bank_items').insert(insertPayload as any)
-      insertError = retry.error
-      await log('db insert retry', 'TB_DB_INSERT_RETRY', {
-        hasError: !!insertError,
-        errorCode: (insertError as any)?.code ?? null,
-        errorMessage: (insertError as any)?.message ?? null,
-        errorDetails: (insertError as any)?.details ?? null,
-        source: opts?.source ?? 'file',
-      })
-    }
-
-    if (insertError) {
-      await supabase.storage.from(BUCKET).remove([path])
-      return
-    }
-
-    // If it's a resume, trigger parsing
-    if (isResume && category === 'document') {
-      await parseResumeAndShowModal(file, path, uid)
-    }
-
-    await refreshItems(uid)
-  }
-
-  function isResumeFile(filename: string): boolean {
-    if (!filename) return false
-    const lowerName = filename.toLowerCase()
-    const extension = lowerName.split('.').pop() || ''
-    // Check both extension and common resume keywords in filename
-    const isResumeExtension = ['pdf', 'doc', 'docx', 'txt', 'rtf'].includes(extension)
-    const hasResumeKeyword = lowerName.includes('resume') || lowerName.includes('cv') || lowerName.includes('curriculum')
-    return isResumeExtension || hasResumeKeyword
-  }
-
-  async function parseResumeFromItem(item: TalentBankItem) {
-    if (!item.file_path || !userId) {
-      console.error('Cannot parse resume: missing file_path or userId', { file_path: item.file_path, userId })
-      setUploadError('Cannot parse resume: Please ensure you are signed in and the file exists.')
-      return
-    }
-    
-    console.log('Starting resume parse for:', item.title, item.file_path)
-    setResumeParseModal(prev => ({ ...prev, parsing: true, open: true, filename: item.title, filePath: item.file_path || undefined }))
-    
-    try {
-      // Create a short-lived signed URL and parse via Next.js route (Node runtime)
-      const { data: urlData, error: urlErr } = await supabase.storage
-        .from(BUCKET)
-        .createSignedUrl(item.file_path, 60 * 10)
-
-      const signedUrl = urlData?.signedUrl ?? null
-      if (urlErr || !signedUrl) throw new Error('Failed to create signed URL for parsing')
-
-      const response = await fetch('/api/resume/parse', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ url: signedUrl, fileType: item.file_type || 'application/pdf' }),
-      })
-      
-      if (!response.ok) {
-        const error = await response.json().catch(() => ({}))
-        console.error('[Resume Parse] API not ok', { status: response.status, meta: error?.meta ?? null, error })
-        throw new Error(error?.error || error?.detail || 'Failed to parse resume')
-      }
-      
-      const data = await response.json().catch(() => ({}))
-      try {
-        console.log('[Resume Parse] meta', JSON.stringify(data?.meta ?? null))
-      } catch {
-        console.log('[Resume Parse] meta', data?.meta ?? null)
-      }
-      if (data?.meta && data.meta.openaiConfigured === false) {
-        console.warn('[Resume Parse] OpenAI not configured (OPENAI_API_KEY missing or not loaded).')
-      }
-      if (data?.meta?.openaiError) {
-        console.warn('[Resume Parse] OpenAI error:', data.meta.openaiError)
-      }
-      const parsed = data?.parsed
-      const exp = Array.isArray(parsed?.experience) ? parsed.experience : []
-      const experiences = exp.map((e: any) => ({
-        company: String(e?.company ?? 'Company'),
-        title: String(e?.title ?? 'Role'),
-        start_date: String(e?.startDate ?? ''),
-        end_date: String(e?.endDate ?? ''),
-        description: String(e?.description ?? ''),
-        achievements: Array.isArray(e?.achievements) ? e.achievements.map((a: any) => String(a)).filter(Boolean) : [],
-      }))
-      const skills = Array.isArray(parsed?.skills) ? parsed.skills.map((s: any) => String(s)).filter(Boolean) : []
-      const education = Array.isArray(parsed?.education) ? parsed.education : []
-      const credentials = Array.isArray(parsed?.credentials) ? parsed.credentials : []
-      const socialLinks = Array.isArray(parsed?.socialLinks) ? parsed.socialLinks : []
-      const referees = Array.isArray(parsed?.referees) ? parsed.referees : []
-
-      if (experiences.length > 0) {
-        setResumeParseModal(prev => ({
-          ...prev,
-          parsing: false,
-          tab: 'experience',
-          experiences,
-          skills,
-          education,
-          credentials,
-          socialLinks,
-          referees,
-          selectedExperienceIndices: new Set(experiences.map((_: any, i: number) => i)),
-          selectedSkillIndices: new Set(skills.map((_: any, i: number) => i)),
-          selectedEducationIndices: new Set(education.map((_: any, i: number) => i)),
-          selectedCredentialIndices: new Set(credentials.map((_: any, i: number) => i)),
-          selectedSocialIndices: new Set(socialLinks.map((_: any, i: number) => i)),
-          selectedRefereeIndices: new Set(referees.map((_: any, i: number) => i)),
-        }))
-      } else {
-        setResumeParseModal(prev => ({
-          ...prev,
-          parsing: false,
-          tab: 'experience',
-          experiences: [],
-          skills,
-          education,
-          credentials,
-          socialLinks,
-          referees,
-          selectedExperienceIndices: new Set(),
-          selectedSkillIndices: new Set(skills.map((_: any, i: number) => i)),
-          selectedEducationIndices: new Set(education.map((_: any, i: number) => i)),
-          selectedCredentialIndices: new Set(credentials.map((_: any, i: number) => i)),
-          selectedSocialIndices: new Set(socialLinks.map((_: any, i: number) => i)),
-          selectedRefereeIndices: new Set(referees.map((_: any, i: number) => i)),
-        }))
-        setUploadError('No job experiences found in resume. You can still add experiences manually.')
-      }
-    } catch (error: any) {
-      console.error('Resume parsing error:', error)
-      setResumeParseModal(prev => ({ ...prev, parsing: false }))
-      setUploadError(`Failed to parse resume: ${error.message || 'Unknown error'}`)
-    }
-  }
+    if (!sessionEmail) return
 
-  async function parseResumeAndShowModal(file: File, filePath: string, uid: string) {
-    setResumeParseModal(prev => ({ ...prev, parsing: true, open: true, filename: file.name, filePath }))
-    
+    // The backend deletes the row, the stored file and its generated thumbnails/posters
+    const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000'
+    let deleteError: string | null = null
     try {
-      // Parse using the stored file via a signed URL (avoid uploading raw file to server)
-      const { data: urlData, error: urlErr } = await supabase.storage.from(BUCKET).createSignedUrl(filePath, 60 * 10)
-      const signedUrl = urlData?.signedUrl ?? null
-      if (urlErr || !signedUrl) throw new Error('Failed to create signed URL for parsing')
-
-      const response = await fetch('/api/resume/parse', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ url: signedUrl, fileType: file.type || 'application/pdf' }),
-      })
-      
-      if (!response.ok) {
-        const error = await response.json().catch(() => ({}))
-        console.error('[Resume Parse] API not ok', { status: response.status, meta: error?.meta ?? null, error })
-        throw new Error(error?.error || error?.detail || 'Failed to parse resume')
-      }
-      
-      const data = await response.json().catch(() => ({}))
-      try {
-        console.log('[Resume Parse] meta', JSON.stringify(data?.meta ?? null))
-      } catch {
-        console.log('[Resume Parse] meta', data?.meta ?? null)
-      }
-      if (data?.meta && data.meta.openaiConfigured === false) {
-        console.warn('[Resume Parse] OpenAI not configured (OPENAI_API_KEY missing or not loaded).')
-      }
-      if (data?.meta?.openaiError) {
-        console.warn('[Resume Parse] OpenAI error:', data.meta.openaiError)
-      }
-      const parsed = data?.parsed
-      const exp = Array.isArray(parsed?.experience) ? parsed.experience : []
-      const experiences = exp.map((e: any) => ({
-        company: String(e?.company ?? 'Company'),
-        title: String(e?.title ?? 'Role'),
-        start_date: String(e?.startDate ?? ''),
-        end_date: String(e?.endDate ?? ''),
-        description: String(e?.description ?? ''),
-        achievements: Array.isArray(e?.achievements) ? e.achievements.map((a: any) => String(a)).filter(Boolean) : [],
-      }))
-      const skills = Array.isArray(parsed?.skills) ? parsed.skills.map((s: any) => String(s)).filter(Boolean) : []
-      const education = Array.isArray(parsed?.education) ? parsed.education : []
-      const credentials = Array.isArray(parsed?.credentials) ? parsed.credentials : []
-      const socialLinks = Array.isArray(parsed?.socialLinks) ? parsed.socialLinks : []
-      const referees = Array.isArray(parsed?.referees) ? parsed.referees : []
-
-      if (experiences.length > 0) {
-        setResumeParseModal(prev => ({
-          ...prev,
-          parsing: false,
-          tab: 'experience',
-          experiences,
-          skills,
-          education,
-          credentials,
-          socialLinks,
-          referees,
-          selectedExperienceIndices: new Set(experiences.map((_: any, i: number) => i)),
-          selectedSkillIndices: new Set(skills.map((_: any, i: number) => i)),
-          selectedEducationIndices: new Set(education.map((_: any, i: number) => i)),
-          selectedCredentialIndices: new Set(credentials.map((_: any, i: number) => i)),
-          selectedSocialIndices: new Set(socialLinks.map((_: any, i: number) => i)),
-          selectedRefereeIndices: new Set(referees.map((_: any, i: number) => i)),
-        }))
-      } else {
-        setResumeParseModal(prev => ({
-          ...prev,
-          parsing: false,
-          tab: 'experience',
-          experiences: [],
-          skills,
-          education,
-          credentials,
-          socialLinks,
-          referees,
-          selectedExperienceIndices: new Set(),
-          selectedSkillIndices: new Set(skills.map((_: any, i: number) => i)),
-          selectedEducationIndices: new Set(education.map((_: any, i: number) => i)),
-          selectedCredentialIndices: new Set(credentials.map((_: any, i: number) => i)),
-          selectedSocialIndices: new Set(socialLinks.map((_: any, i: number) => i)),
-          selectedRefereeIndices: new Set(referees.map((_: any, i: number) => i)),
-        }))
-        setUploadError('No job experiences found in resume. You can still add experiences manually.')
-      }
-    } catch (error: any) {
-      console.error('Resume parsing error:', error)
-      setResumeParseModal(prev => ({ ...prev, parsing: false }))
-      setUploadError(`Failed to parse resume: ${error.message || 'Unknown error'}`)
-    }
-  }
-
-  async function addSelectedExperiencesToPortfolio() {
-    const {
-      selectedExperienceIndices,
-      selectedSkillIndices,
-      selectedEducationIndices,
-      selectedCredentialIndices,
-      selectedRefereeIndices,
-      selectedSocialIndices,
-      experiences,
-      skills,
-      education,
-      credentials,
-      socialLinks,
-      referees,
-      filePath,
-    } = resumeParseModal
-    if (!userId) return
-    const totalSelected =
-      selectedExperienceIndices.size +
-      selectedSkillIndices.size +
-      selectedEducationIndices.size +
-      selectedCredentialIndices.size +
-      selectedRefereeIndices.size +
-      selectedSocialIndices.size
-    if (totalSelected === 0) return
-
-    try {
-      const selectedExperiences = Array.from(selectedExperienceIndices).map((i) => experiences[i]).filter(Boolean)
-      const selectedSkills = Array.from(selectedSkillIndices).map((i) => skills[i]).filter(Boolean)
-      const selectedEducation = Array.from(selectedEducationIndices).map((i) => education[i]).filter(Boolean)
-      const selectedCredentials = Array.from(selectedCredentialIndices).map((i) => credentials[i]).filter(Boolean)
-      const selectedReferees = Array.from(selectedRefereeIndices).map((i) => referees[i]).filter(Boolean)
-      const selectedSocialLinks = Array.from(selectedSocialIndices).map((i) => socialLinks[i]).filter(Boolean)
-
-      // Ensure portfolio record exists (skills/referees live in portfolio metadata)
-      const ensurePortfolio = async () => {
-        const existing = await supabase
-          .from('talent_bank_items')
-          .select('id,metadata')
-          .eq('user_id', userId)
-          .eq('item_type', 'portfolio')
-          .order('created_at', { ascending: false })
-          .limit(1)
-        if (!existing.error && existing.data?.[0]?.id) {
-          return { id: existing.data[0].id as any, meta: (existing.data[0] as any)?.metadata ?? {} }
-        }
-        const ins = await supabase
-          .from('talent_bank_items')
-          .insert({
-            user_id: userId,
-            item_type: 'portfolio',
-            title: 'Portfolio',
-            metadata: { portfolioSelections: [], skills: [], referees: [], socialLinks: [] },
-            is_public: false,
-          } as any)
-          .select('id,metadata')
-        return { id: (ins.data as any)?.[0]?.id ?? null, meta: (ins.data as any)?.[0]?.metadata ?? {} }
-      }
-      const portfolioRow = await ensurePortfolio()
-      
-      for (const exp of selectedExperiences) {
-        const metadata = {
-          company: exp.company || '',
-          title: exp.title || '',
-          startDate: exp.start_date || '',
-          endDate: exp.end_date || '',
-          description: exp.description || '',
-          achievements: Array.isArray(exp.achievements) ? exp.achievements : [],
-          sourceResume: filePath || null,
-        }
-        
-        const title = `${exp.title || 'Position'} at ${exp.company || 'Company'}`
-        
-        const { error } = await supabase.from('talent_bank_items').insert({
-          user_id: userId,
-          item_type: 'experience',
-          title,
-          description: exp.description || '',
-          metadata,
-          is_public: false,
-        } as any)
-        
-        if (error) {
-          console.error('Error creating experience entry:', error)
-        }
-      }
-
-      for (const edu of selectedEducation) {
-        const title = `${edu.institution || 'Institution'} — ${edu.degree || edu.course || 'Education'}`
-        const metadata = {
-          institution: edu.institution || '',
-          degree: edu.degree || '',
-          course: edu.course || '',
-          field: edu.field || '',
-          year: edu.year || '',
-          notes: edu.notes || '',
-          sourceResume: filePath || null,
-        }
-        const { error } = await supabase.from('talent_bank_items').insert({
-          user_id: userId,
-          item_type: 'education',
-          title,
-          metadata,
-          is_public: false,
-        } as any)
-        if (error) console.error('Error creating education entry:', error)
-      }
-
-      for (const c of selectedCredentials) {
-        const title = `${c.name || 'Credential'}${c.issuer ? ` — ${c.issuer}` : ''}`
-        const metadata = { ...c, sourceResume: filePath || null }
-        const { error } = await supabase.from('talent_bank_items').insert({
-          user_id: userId,
-          item_type: 'credential',
-          title,
-          metadata,
-          is_public: false,
-        } as any)
-        if (error) console.error('Error creating credential entry:', error)
-      }
-
-      for (const s of selectedSocialLinks) {
-        const platform = String((s as any)?.platform ?? '').trim() || 'Social'
-        const url = String((s as any)?.url ?? '').trim()
-        if (!url) continue
-        const title = platform
-        const metadata = { platform, url, sourceResume: filePath || null }
-        const { error } = await supabase.from('talent_bank_items').insert({
-          user_id: userId,
-          item_type: 'social',
-          title,
-          metadata,
-          is_public: false,
-        } as any)
-        if (error) console.error('Error creating social entry:', error)
-      }
-
-      // Merge skills/referees/social into portfolio metadata (dedupe lightly)
-      if (portfolioRow?.id) {
-        const prevMeta = (portfolioRow.meta && typeof portfolioRow.meta === 'object') ? portfolioRow.meta : {}
-        const prevSkills: string[] = Array.isArray(prevMeta.skills) ? prevMeta.skills : []
-        const mergedSkills = [...prevSkills]
-        for (const s of selectedSkills) {
-          const v = String(s || '').trim()
-          if (!v) continue
-          if (!mergedSkills.some((x) => (x || '').toLowerCase() === v.toLowerCase())) mergedSkills.push(v)
-        }
-
-        const prevSocial: any[] = Array.isArray(prevMeta.socialLinks) ? prevMeta.socialLinks : []
-        const mergedSocial = [...prevSocial]
-        for (const s of selectedSocialLinks) {
-          const platform = String((s as any)?.platform ?? '').trim()
-          const url = String((s as any)?.url ?? '').trim()
-          if (!platform || !url) continue
-          const exists = mergedSocial.some((x: any) => {
-            const xp = String(x?.platform ?? '').trim().toLowerCase()
-            const xu = String(x?.url ?? '').trim().toLowerCase()
-            return xp === platform.toLowerCase() && xu === url.toLowerCase()
-          })
-          if (!exists) mergedSocial.push({ platform, url })
-        }
-
-        const prevRefs: any[] = Array.isArray(prevMeta.referees) ? prevMeta.referees : []
-        const mergedRefs = [...prevRefs]
-        for (const r of selectedReferees) {
-          const name = String((r as any)?.name ?? '').trim()
-          if (!name) continue
-          const email = String((r as any)?.email ?? '').trim().toLowerCase()
-          const phone = String((r as any)?.phone ?? '').trim()
-          const exists = mergedRefs.some((x: any) => {
-            const xn = String(x?.name ?? '').trim().toLowerCase()
-            const xe = String(x?.email ?? '').trim().toLowerCase()
-            const xp = String(x?.phone ?? '').trim()
-            if (email && xe && xe === email) return true
-            if (phone && xp && xp === phone) return true
-            return xn === name.toLowerCase()
-          })
-          if (!exists) mergedRefs.push(r)
-        }
-
-        const nextMeta = {
-          ...prevMeta,
-          skills: mergedSkills,
-          referees: mergedRefs,
-          socialLinks: mergedSocial,
-          resumeParsedAt: Date.now(),
-        }
-        await supabase.from('talent_bank_items').update({ metadata: nextMeta }).eq('id', portfolioRow.id).eq('user_id', userId)
-      }
-      
-      setResumeParseModal({
-        open: false,
-        filename: '',
-        tab: 'experience',
-        experiences: [],
-        skills: [],
-        education: [],
-        credentials: [],
-        socialLinks: [],
-        referees: [],
-        selectedExperienceIndices: new Set(),
-        selectedSkillIndices: new Set(),
-        selectedEducationIndices: new Set(),
-        selectedCredentialIndices: new Set(),
-        selectedRefereeIndices: new Set(),
-        selectedSocialIndices: new Set(),
-        parsing: false,
-      })
-      await refreshItems(userId)
-    } catch (error: any) {
-      console.error('Error adding experiences:', error)
-      setUploadError(`Failed to add experiences: ${error.message || 'Unknown error'}`)
-    }
-  }
-
-  async function log(message: string, hypothesisId: string, data: any) {
-    fetch('/api/debug/log', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        sessionId: 'debug-session',
-        runId: 'run-talent-bank',
-        hypothesisId,
-        location: 'dashboard/talent/bank/page.tsx',
-        message,
-        data,
-        timestamp: Date.now(),
-      }),
-    }).catch(() => {})
-  }
-
-  async function ensureSession(): Promise<string | null> {
-    setAuthRequired(false)
-    setAuthError(null)
-
-    // Prefer session (fast) over getUser() which may require network.
-    const { data: sessionData, error: sessionError } = await supabase.auth.getSession()
-    const sessionUserId = sessionData?.session?.user?.id ?? null
-    const sessionEmail = sessionData?.session?.user?.email ?? null
-    // #region agent log
-    fetch('http://127.0.0.1:7243/ingest/6182f207-3db2-4ea3-b5df-968f1e2a56cc',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'dashboard/talent/bank/page.tsx:ensureSession:session',message:'Session check',data:{hasSession:!!sessionData?.session,hasUser:!!sessionUserId,userId:sessionUserId,userIdType:typeof sessionUserId,email:sessionEmail,hasError:!!sessionError,errorName:(sessionError as any)?.name??null},timestamp:Date.now(),sessionId:'debug-session',runId:'run1',hypothesisId:'H3'})}).catch(()=>{});
-    // #endregion
-    await log('auth.getSession()', 'TB_SESSION', {
-      hasSession: !!sessionData?.session,
-      hasUser: !!sessionUserId,
-      hasError: !!sessionError,
-      errorName: (sessionError as any)?.name ?? null,
-    })
-    if (sessionUserId) {
-      // #region agent log
-      fetch('http://127.0.0.1:7243/ingest/6182f207-3db2-4ea3-b5df-968f1e2a56cc',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'dashboard/talent/bank/page.tsx:ensureSession:return',message:'Returning user ID',data:{userId:sessionUserId,userIdType:typeof sessionUserId,isEmail:sessionUserId?.includes?.('@')??false},timestamp:Date.now(),sessionId:'debug-session',runId:'run1',hypothesisId:'H3'})}).catch(()=>{});
-      // #endregion
-      return sessionUserId
-    }
-
-    // Auto-create an anonymous session so the user can save/review/delete without a manual login flow.
-    const { data: anonData, error: anonError } = await supabase.auth.signInAnonymously()
-    const anonUserId = anonData?.user?.id ?? null
-    await log('auth.signInAnonymously()', 'TB_ANON', {
-      hasUser: !!anonUserId,
-      hasError: !!anonError,
-      errorName: (anonError as any)?.name ?? null,
-      errorMessage: (anonError as any)?.message ?? null,
-    })
-
-    if (anonUserId) return anonUserId
-
-    // If anonymous is disabled (common), require user auth via email/password.
-    if ((anonError as any)?.message?.toLowerCase?.().includes('anonymous')) {
-      setAuthRequired(true)
-      setAuthError('Anonymous sign-ins are disabled in Supabase. Please sign in (or create an account) below.')
-      return null
-    }
-
-    setAuthRequired(true)
-    setAuthError((anonError as any)?.message ?? 'Authentication required to use Talent Bank.')
-    return null
-  }
-
-  async function ensureUserRow(uid: string, email?: string | null) {
-    // We observed FK violations on `talent_bank_items.user_id` (23503). That implies a referenced row
-    // (often in public.users/profiles) is missing. Try to create it in a few likely tables.
-    const candidates: Array<{ table: string; row: Record<string, any> }> = [
-      // Based on runtime evidence: public.users has a NOT NULL "role" column.
-      { table: 'users', row: { id: uid, email: email ?? null, role: 'talent' } },
-      { table: 'users', row: { id: uid, email: email ?? null, role: 'user' } },
-      { table: 'profiles', row: { id: uid, email: email ?? null } },
-      { table: 'user_profiles', row: { id: uid, email: email ?? null } },
-      { table: 'profiles', row: { user_id: uid, email: email ?? null } },
-      { table: 'users', row: { user_id: uid, email: email ?? null } },
-    ]
-
-    for (const c of candidates) {
-      const { error } = await supabase.from(c.table).upsert(c.row as any)
-      await log('ensureUserRow', 'TB_ENSURE_USER_ROW', {
-        table: c.table,
-        keys: Object.keys(c.row),
-        hasEmail: 'email' in c.row && !!email,
-        hasError: !!error,
-        errorCode: (error as any)?.code ?? null,
-        errorMessage: (error as any)?.message ?? null,
-        errorDetails: (error as any)?.details ?? null,
-      })
-      if (!error) return true
-    }
-    return false
-  }
-
-  async function ensureSessionAndRefresh() {
-    const uid = await ensureSession()
-    setUserId(uid)
-    await refreshItems(uid)
-  }
-
-  async function refreshItems(uidArg?: string | null) {
-    setIsLoading(true)
-
-    const uid = uidArg ?? userId ?? (await ensureSession())
-    setUserId(uid)
-    // #region agent log
-    fetch('http://127.0.0.1:7243/ingest/6182f207-3db2-4ea3-b5df-968f1e2a56cc',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'dashboard/talent/bank/page.tsx:refreshItems:uid',message:'User ID for query',data:{uid,uidType:typeof uid,uidLength:uid?.length??null,isEmail:uid?.includes?.('@')??false},timestamp:Date.now(),sessionId:'debug-session',runId:'run1',hypothesisId:'H2'})}).catch(()=>{});
-    // #endregion
-    if (!uid) {
-      await log('refreshItems aborted (no user id)', 'TB_LIST', { reason: 'no-session' })
-      setItems([])
-      setIsLoading(false)
-      return
-    }
-
-    // DEFENSIVE: Prevent email from being used as user_id
-    if (uid.includes('@')) {
-      // #region agent log
-      fetch('http://127.0.0.1:7243/ingest/6182f207-3db2-4ea3-b5df-968f1e2a56cc',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'dashboard/talent/bank/page.tsx:refreshItems:email_check',message:'BLOCKED: Email used as user_id',data:{uid},timestamp:Date.now(),sessionId:'debug-session',runId:'run1',hypothesisId:'H2'})}).catch(()=>{});
-      // #endregion
-      await log('refreshItems blocked: email used as user_id', 'TB_LIST', { uid, reason: 'email-instead-of-uuid' })
-      setItems([])
-      setIsLoading(false)
-      setUploadError('Invalid user ID format. Please sign out and sign in again.')
-      return
-    }
-
-    const { data, error } = await supabase
-      .from('talent_bank_items')
-      .select('*')
-      .eq('user_id', uid)
-      .order('created_at', { ascending: false })
-    // #region agent log
-    fetch('http://127.0.0.1:7243/ingest/6182f207-3db2-4ea3-b5df-968f1e2a56cc',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({location:'dashboard/talent/bank/page.tsx:refreshItems:query',message:'Talent bank query result',data:{uid,hasError:!!error,errorCode:(error as any)?.code??null,errorMessage:(error as any)?.message??null,rowCount:Array.isArray(data)?data.length:0},timestamp:Date.now(),sessionId:'debug-session',runId:'run1',hypothesisId:'H2'})}).catch(()=>{});
-    // #endregion
-
-    await log('list talent_bank_items', 'TB_LIST', {
-      hasError: !!error,
-      errorCode: (error as any)?.code ?? null,
-      errorMessage: (error as any)?.message ?? null,
-      rowCount: Array.isArray(data) ? data.length : 0,
-    })
-
-    // #region agent log
-    agentDbg('H2', 'TalentBank list result', {
-      hasError: !!error,
-      rowCount: Array.isArray(data) ? data.length : 0,
-      socialCount: Array.isArray(data) ? data.filter((x: any) => x?.item_type === 'social').length : 0,
-    })
-    // #endregion agent log
-
-    if (!error) setItems(data || [])
-    await loadPortfolioSelections(uid)
-    setIsLoading(false)
-  }
-
-  async function ensurePortfolioRow(uid: string) {
-    // Portfolio metadata is used to persist "Show in Portfolio" selections across pages.
-    const existing = await supabase
-      .from('talent_bank_items')
-      .select('id,item_type,metadata')
-      .eq('user_id', uid)
-      .in('item_type', ['portfolio', 'document'])
-      .eq('title', 'Portfolio')
-      .order('created_at', { ascending: false })
-      .limit(1)
-
-    if (existing.data?.[0]) {
-      setPortfolioRow(existing.data[0] as any)
-      return existing.data[0] as any
-    }
-
-    // Try to create as item_type=portfolio, but fall back if schema rejects it.
-    const attempt = await supabase.from('talent_bank_items').insert({
-      user_id: uid,
-      item_type: 'portfolio',
-      title: 'Portfolio',
-      metadata: { portfolioSelections: [] },
-      is_public: false,
-    } as any)
-
-    await log('ensurePortfolioRow insert', 'TB_PORTFOLIO', {
-      hasError: !!attempt.error,
-      errorCode: (attempt.error as any)?.code ?? null,
-      errorMessage: (attempt.error as any)?.message ?? null,
-    })
-
-    if (!attempt.error) {
-      // Re-query to get the id.
-      const created = await supabase
-        .from('talent_bank_items')
-        .select('id,item_type,metadata')
-        .eq('user_id', uid)
-        .eq('item_type', 'portfolio')
-        .eq('title', 'Portfolio')
-        .order('created_at', { ascending: false })
-        .limit(1)
-      if (created.data?.[0]) {
-        setPortfolioRow(created.data[0] as any)
-        return created.data[0] as any
-      }
-    }
-
-    // Fallback: store portfolio metadata as a "document" row (known item_type) with JSON file_type.
-    const fallback = await supabase.from('talent_bank_items').insert({
-      user_id: uid,
-      item_type: 'document',
-      title: 'Portfolio',
-      file_type: 'application/json',
-      metadata: { portfolioSelections: [] },
-      is_public: false,
-    } as any)
-
-    await log('ensurePortfolioRow insert fallback', 'TB_PORTFOLIO', {
-      hasError: !!fallback.error,
-      errorCode: (fallback.error as any)?.code ?? null,
-      errorMessage: (fallback.error as any)?.message ?? null,
-    })
-
-    const created2 = await supabase
-      .from('talent_bank_items')
-      .select('id,item_type,metadata')
-      .eq('user_id', uid)
-      .eq('title', 'Portfolio')
-      .order('created_at', { ascending: false })
-      .limit(1)
-
-    if (created2.data?.[0]) {
-      setPortfolioRow(created2.data[0] as any)
-      return created2.data[0] as any
-    }
-
-    return null
-  }
-
-  async function loadPortfolioSelections(uid: string) {
-    const row = (portfolioRow && portfolioRow.id) ? portfolioRow : await ensurePortfolioRow(uid)
-    const meta = (row as any)?.metadata ?? {}
-    const selections: number[] = Array.isArray(meta?.portfolioSelections) ? meta.portfolioSelections : []
-    const next: Record<number, boolean> = {}
-    for (const id of selections) next[id] = true
-    setPortfolioSelected(next)
-
-    await log('loadPortfolioSelections', 'TB_PORTFOLIO', {
-      hasRow: !!row?.id,
-      selectionCount: selections.length,
-    })
-  }
-
-  async function toggleInPortfolio(item: TalentBankItem, checked: boolean) {
-    const uid = userId ?? (await ensureSession())
-    setUserId(uid)
-    if (!uid) return
-
-    const row = (portfolioRow && portfolioRow.id) ? portfolioRow : await ensurePortfolioRow(uid)
-    if (!row?.id) {
-      await log('toggleInPortfolio failed (no portfolio row)', 'TB_PORTFOLIO_TOGGLE', { itemId: item.id })
-      return
-    }
-
-    const prevSelections: number[] = Array.isArray((row as any)?.metadata?.portfolioSelections)
-      ? (row as any).metadata.portfolioSelections
-      : []
-    const nextSelections = checked
-      ? Array.from(new Set([...prevSelections, item.id]))
-      : prevSelections.filter((x) => x !== item.id)
-
-    const nextMeta = { ...((row as any).metadata ?? {}), portfolioSelections: nextSelections }
-    const { error } = await supabase
-      .from('talent_bank_items')
-      .update({ metadata: nextMeta })
-      .eq('id', row.id)
-      .eq('user_id', uid)
-
-    await log('toggleInPortfolio update', 'TB_PORTFOLIO_TOGGLE', {
-      hasError: !!error,
-      errorCode: (error as any)?.code ?? null,
-      errorMessage: (error as any)?.message ?? null,
-      itemId: item.id,
-      checked,
-      selectionCount: nextSelections.length,
-    })
-
-    if (!error) {
-      setPortfolioRow({ ...(row as any), metadata: nextMeta })
-      setPortfolioSelected((prev) => ({ ...prev, [item.id]: checked }))
-    }
-  }
-
-  // Load signed URLs on-demand (for images/videos). This avoids the "only first N thumbnails load" issue.
-  async function ensureSignedUrl(path: string) {
-    if (!path) return
-    if (isExternalUrl(path)) return
-    if (thumbUrls[path]) return
-    const { data } = await supabase.storage.from(BUCKET).createSignedUrl(path, 60 * 10)
-    if (data?.signedUrl) {
-      setThumbUrls((prev) => ({ ...prev, [path]: data.signedUrl }))
-    }
-  }
-
-  function fileExt(title: string) {
-    const m = title.toLowerCase().match(/\.([a-z0-9]+)$/)
-    return m?.[1] ?? ''
-  }
-
-  function getSocialUrl(item: TalentBankItem): string {
-    const u = (item.metadata as any)?.url ?? item.description ?? ''
-    return typeof u === 'string' ? u : ''
-  }
-
-  function socialLabel(platform: string) {
-    const p = (platform || '').toLowerCase()
-    if (p.includes('linkedin')) return 'in'
-    if (p.includes('github')) return 'GH'
-    if (p.includes('twitter') || p === 'x' || p.includes('x ')) return 'X'
-    if (p.includes('instagram')) return 'IG'
-    if (p.includes('facebook')) return 'f'
-    if (p.includes('youtube')) return 'YT'
-    if (p.includes('tiktok')) return 'TT'
-    if (p.includes('website')) return 'WWW'
-    return 'SM'
-  }
-
-  function ThumbIcon({ label }: { label: string }) {
-    return (
-      <div className="w-full h-full flex items-center justify-center bg-gradient-to-br from-gray-100 to-gray-200">
-        <div className="rounded-lg border border-gray-300 bg-white px-2 py-1 text-[10px] font-semibold tracking-wide text-gray-600">
-          {label}
-        </div>
-      </div>
-    )
-  }
-
-  async function handleFiles(files: FileList | null) {
-    if (!files?.length) return
-    setIsUploading(true)
-    setUploadError(null)
-
-    const uid = userId ?? (await ensureSession())
-    setUserId(uid)
-    await log('upload start', 'TB_UPLOAD_START', { hasUser: !!uid, fileCount: files.length })
-    if (!uid) {
-      setIsUploading(false)
-      setDragActive(false)
-      return
-    }
-
-    for (const file of Array.from(files)) {
-      await uploadSingleFile(file, { source: 'file' })
-    }
-
-    setIsUploading(false)
-    setDragActive(false)
-    refreshItems(uid)
-  }
-
-  async function signInWithPassword() {
-    setAuthBusy(true)
-    try {
-      await log('auth.signInWithPassword() start', 'TB_PW_SIGNIN', { hasEmail: !!authEmail, hasPassword: !!authPassword })
-      const { data, error } = await supabase.auth.signInWithPassword({
-        email: authEmail.trim(),
-        password: authPassword,
-      })
-
-      await log('auth.signInWithPassword() result', 'TB_PW_SIGNIN', {
-        hasUser: !!data?.user?.id,
-        hasSession: !!data?.session,
-        hasError: !!error,
-        errorMessage: (error as any)?.message ?? null,
-      })
-
-      if (error) {
-        setAuthError((error as any)?.message ?? 'Sign-in failed')
-        return
-      }
-
-      if (data.user?.id) {
-        await ensureUserRow(data.user.id, data.user.email ?? authEmail ?? null)
-      }
-
-      setAuthRequired(false)
-      setAuthError(null)
-      setUserId(data.user?.id ?? null)
-      await refreshItems(data.user?.id ?? null)
-    } finally {
-      setAuthBusy(false)
-    }
-  }
-
-  async function signUpWithPassword() {
-    setAuthBusy(true)
-    try {
-      await log('auth.signUp() start', 'TB_PW_SIGNUP', { hasEmail: !!authEmail, hasPassword: !!authPassword })
-      const { data, error } = await supabase.auth.signUp({
-        email: authEmail.trim(),
-        password: authPassword,
-      })
-
-      await log('auth.signUp() result', 'TB_PW_SIGNUP', {
-        hasUser: !!data?.user?.id,
-        hasSession: !!data?.session,
-        hasError: !!error,
-        errorMessage: (error as any)?.message ?? null,
-      })
-
-      if (error) {
-        setAuthError((error as any)?.message ?? 'Sign-up failed')
-        return
-      }
-
-      // If email confirmations are disabled, you'll get a session immediately. Otherwise user must confirm email first.
-      if (data?.session?.user?.id) {
-        await ensureUserRow(data.session.user.id, data.session.user.email ?? authEmail ?? null)
-        setAuthRequired(false)
-        setAuthError(null)
-        setUserId(data.session.user.id)
-        await refreshItems(data.session.user.id)
-      } else {
-        setAuthError('Account created. Please check your email to confirm, then sign in.')
-      }
-    } finally {
-      setAuthBusy(false)
-    }
-  }
-
-  async function openFile(path: string) {
-    if (isExternalUrl(path)) {
-      window.open(path, '_blank')
-      return
-    }
-    const { data, error } = await supabase.storage
-      .from(BUCKET)
-      .createSignedUrl(path, 60 * 10)
-
-    await log('createSignedUrl', 'TB_SIGNED_URL', {
-      hasError: !!error,
-      errorMessage: (error as any)?.message ?? null,
-      hasUrl: !!data?.signedUrl,
-    })
-
-    if (data?.signedUrl) window.open(data.signedUrl, '_blank')
-  }
-
-  function renderThumb(item: TalentBankItem) {
-    const type = item.item_type
-    const path = item.file_path || ''
-    const isExternal = isExternalUrl(path)
-    const url = isExternal ? path : (path ? thumbUrls[path] : undefined)
-    const isImg = (item.file_type?.startsWith('image') ?? false) || type === 'image'
-    const isVid = (item.file_type?.startsWith('video') ?? false) || type === 'video'
-
-    const base =
-      'w-[20mm] h-[20mm] rounded-lg border border-gray-200 bg-gray-50 overflow-hidden flex items-center justify-center shrink-0'
-
-    const ext = fileExt(item.title)
-    const label =
-      isImg
-        ? 'IMG'
-        : isVid
-          ? 'VID'
-          : type === 'resume'
-            ? 'CV'
-            : type === 'social'
-              ? socialLabel(item.title)
-            : ext
-              ? ext.toUpperCase().slice(0, 4)
-              : type === 'document'
-                ? 'DOC'
-                : type === 'experience'
-                  ? 'EXP'
-                  : type === 'education'
-                    ? 'EDU'
-                    : 'FILE'
-
-    // Image thumbnail
-    if (isImg) {
-      if (!url && path) ensureSignedUrl(path).catch(() => {})
-      if (url) {
-        return (
-          <button
-            type="button"
-            className={base}
-            onClick={() => setPreview({ kind: 'image', url, title: item.title })}
-            title="Click to expand"
-          >
-            {/* eslint-disable-next-line @next/next/no-img-element */}
-            <img src={url} alt={item.title} className="w-full h-full object-cover" />
-          </button>
-        )
-      }
-      return (
-        <div className={base} title="Loading thumbnail…">
-          <ThumbIcon label={label} />
-        </div>
+      const response = await fetch(
+        `${backendUrl}/api/talent-bank/items/${item.id}?email=${encodeURIComponent(sessionEmail)}`,
+        { method: 'DELETE' }
       )
-    }
-
-    // Video thumbnail (use metadata frame if we can get a signed URL)
-    if (isVid) {
-      if (isExternal) {
-        return (
-          <button
-            type="button"
-            className={base}
-            onClick={() => openFile(path)}
-            title="Open video link"
-          >
-            <ThumbIcon label={label} />
-          </button>
-        )
-      }
-      if (!url && path) ensureSignedUrl(path).catch(() => {})
-      if (url) {
-        return (
-          <button
-            type="button"
-            className={base}
-            onClick={() => setPreview({ kind: 'video', url, title: item.title })}
-            title="Click to expand"
-          >
-            <div className="relative w-full h-full">
-              <video
-                className="w-full h-full object-cover"
-                src={url}
-                muted
-                playsInline
-                preload="metadata"
-              />
-              <div className="absolute inset-0 flex items-center justify-center text-white/90 text-xs font-semibold bg-black/30">
-                ▶
-              </div>
-            </div>
-          </button>
-        )
+      if (!response.ok) {
+        deleteError = (await response.json().catch(() => null))?.detail ?? `HTTP ${response.status}`
       }
-      return (
-        <div className={base} title="Video thumbnail unavailable">
-          <ThumbIcon label={label} />
-        </div>
-      )
-    }
-
-    // All non-image/video items: show an icon-thumbnail tile (still a "picture") and make it clickable to open.
-    if (item.file_path) {
-      return (
-        <button
-          type="button"
-          className={base}
-          onClick={() => openFile(item.file_path!)}
-          title="Open file"
-        >
-          <ThumbIcon label={label} />
-        </button>
-      )
-    }
-
-    if (type === 'social') {
-      const u = getSocialUrl(item)
-      return (
-        <button
-          type="button"
-          className={base}
-          onClick={() => {
-            if (u) window.open(u, '_blank')
-          }}
-          title="Open social link"
-        >
-          <ThumbIcon label={label} />
-        </button>
-      )
-    }
-
-    return (
-      <div className={base} aria-label={`${label} thumbnail`}>
-        <ThumbIcon label={label} />
-      </div>
-    )
-  }
-
-  async function deleteItem(item: TalentBankItem) {
-    const uid = userId ?? (await ensureSession())
-    setUserId(uid)
-    if (!uid) return
-
-    // Delete file first (optional) then row. If file is missing, still delete DB row.
-    if (item.file_path && !isExternalUrl(item.file_path)) {
-      const { error: removeError } = await supabase.storage
-        .from(BUCKET)
-        .remove([item.file_path])
-      await log('storage remove', 'TB_DELETE_STORAGE', {
-        hasError: !!removeError,
-        errorMessage: (removeError as any)?.message ?? null,
-      })
+    } catch (err: any) {
+      deleteError = err?.message ?? 'Request failed'
     }
 
-    const { error: deleteError } = await supabase
-      .from('talent_bank_items')
-      .delete()
-      .eq('id', item.id)
-      .eq('user_id', uid)
-
-    await log('db delete', 'TB_DELETE_DB', {
+    await log('api delete', 'TB_DELETE_API', {
       hasError: !!deleteError,
-      errorCode: (deleteError as any)?.code ?? null,
-      errorMessage: (deleteError as any)?.message ?? null,
+      errorMessage: deleteError,
     })
 
     await refreshItems(uid)